@@ -0,0 +1,3 @@
+"""
+Offline benchmark suite for the mhanndalorian_bot request pipeline. Run with ``python -m benchmarks --help``.
+"""
@@ -0,0 +1,99 @@
+"""
+Synthetic PLAYER, GUILD, TWLOGS and registry responses shaped and sized like recorded API responses
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Any
+
+__all__ = ["guild", "player", "registry_records", "twlogs"]
+
+_STATS = (1, 5, 6, 7, 8, 14, 16, 17, 18, 28, 41, 42, 48, 49, 52, 53, 54, 55, 56)
+
+
+def _stat(rng: random.Random) -> dict[str, Any]:
+    return {'stat': {'unitStatId': rng.choice(_STATS), 'statValueDecimal': str(rng.randrange(10_000, 9_000_000))},
+            'statRolls': rng.randrange(1, 6), 'roll': [str(rng.randrange(1_000, 90_000))
+                                                       for _ in range(rng.randrange(1, 6))]}
+
+
+def _unit(rng: random.Random, index: int) -> dict[str, Any]:
+    gear = rng.randrange(1, 14)
+    return {
+        'id': f"{rng.getrandbits(64):016x}",
+        'definitionId': f"UNIT{index:03d}:SEVEN_STAR",
+        'currentRarity': rng.randrange(1, 8),
+        'currentLevel': 85,
+        'currentXp': 8_000_000,
+        'currentTier': gear,
+        'relic': {'currentTier': rng.randrange(2, 12) if gear == 13 else 1},
+        'gp': rng.randrange(5_000, 45_000),
+        'skill': [{'id': f"skill{index}_{n}", 'tier': rng.randrange(1, 9)} for n in range(5)],
+        'equipment': [{'equipmentId': f"{rng.randrange(1, 200):03d}", 'slot': slot} for slot in range(6)],
+        'equippedStatMod': [{
+            'id': f"{rng.getrandbits(64):016x}",
+            'definitionId': f"{rng.randrange(1, 7)}{rng.randrange(1, 9)}{slot}",
+            'level': 15,
+            'tier': rng.randrange(1, 6),
+            'primaryStat': _stat(rng),
+            'secondaryStat': [_stat(rng) for _ in range(4)],
+        } for slot in range(1, 7)],
+    }
+
+
+def player(*, units: int = 280, allycode: str = "123456789", seed: int = 1) -> dict[str, Any]:
+    """Return a PLAYER response with a full late-game roster (~1 MB of JSON at the default size)"""
+    rng = random.Random(seed)
+    return {'events': {
+        'name': f"Player {allycode}",
+        'allyCode': allycode,
+        'playerId': f"P{allycode}",
+        'guildId': "G1",
+        'guildName': "Benchmark Guild",
+        'level': 85,
+        'profileStat': [{'nameKey': "STAT_GALACTIC_POWER_ACQUIRED_NAME", 'value': str(rng.randrange(5, 12) * 10**6)}],
+        'rosterUnit': [_unit(rng, index) for index in range(units)],
+    }}
+
+
+def guild(*, members: int = 50, seed: int = 2) -> dict[str, Any]:
+    """Return a GUILD response for a full guild"""
+    rng = random.Random(seed)
+    return {'events': {'guild': {
+        'profile': {'id': "G1", 'name': "Benchmark Guild", 'memberCount': members,
+                    'guildGalacticPower': str(members * 8_000_000)},
+        'member': [{
+            'playerId': f"P{n:09d}",
+            'playerName': f"Member {n}",
+            'playerLevel': 85,
+            'memberLevel': rng.randrange(2, 5),
+            'galacticPower': str(rng.randrange(3, 12) * 10**6),
+            'lastActivityTime': str(1_700_000_000_000 + rng.randrange(10**8)),
+            'memberContribution': [{'type': kind, 'currentValue': str(rng.randrange(10**5)),
+                                    'lifetimeValue': str(rng.randrange(10**7))} for kind in range(1, 4)],
+        } for n in range(members)],
+    }}}
+
+
+def twlogs(*, entries: int = 1500, seed: int = 3) -> dict[str, Any]:
+    """Return a TWLOGS response covering a full war"""
+    rng = random.Random(seed)
+    return {'code': 0, 'data': [{
+        'id': f"{n:08d}",
+        'timestamp': str(1_700_000_000_000 + n * 60_000),
+        'authorId': f"P{rng.randrange(50):09d}",
+        'authorName': f"Member {rng.randrange(50)}",
+        'data': [{'activity': {'zoneData': {
+            'zoneId': f"tw_jakku01_phase0{rng.randrange(1, 5)}_conflict0{rng.randrange(1, 4)}",
+            'scoreDelta': str(rng.randrange(0, 65)),
+            'activityLogMessage': {'key': "TERRITORY_CHANNEL_ACTIVITY_CONFLICT_DEFEAT",
+                                   'param': [{'paramValue': [f"Member {rng.randrange(50)}"]}]},
+        }}}],
+    } for n in range(entries)]}
+
+
+def registry_records(count: int = 1) -> list[dict[str, Any]]:
+    """Return registry 'find' records"""
+    return [{'allyCode': f"{n + 100_000_000}", 'discordId': f"{n + 10**17}", 'primary': True, 'verified': True}
+            for n in range(count)]
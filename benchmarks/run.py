@@ -0,0 +1,225 @@
+"""
+Offline benchmarks for the request pipeline
+
+Usage
+    python -m benchmarks [--requests N] [--concurrency 1,8,32] [--endpoints player,guild,twlogs]
+                         [--modes sync,threaded,async,batched,sign,signer,registry]
+                         [--latency MS] [--no-memory] [--json PATH]
+
+Every scenario runs against a local MockServer, so results measure the library (signing, serialization, connection
+pooling, decoding) rather than the real API. Compare runs made on the same machine before and after an upgrade.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, NamedTuple, Sequence
+
+from benchmarks.server import MockServer
+from mhanndalorian_bot import API, Registry
+from mhanndalorian_bot.batch import run_batch_async
+from mhanndalorian_bot.signing import Signer
+
+MODES = ("sync", "threaded", "async", "batched", "sign", "signer", "registry")
+ENDPOINTS = ("player", "guild", "twlogs")
+
+_API_KEY = "benchmark_api_key"
+_ALLYCODE = "123456789"
+_DISCORD_ID = "123456789987654321"
+
+
+class Result(NamedTuple):
+    """Outcome of one scenario"""
+
+    mode: str
+    endpoint: str
+    concurrency: int
+    requests: int
+    seconds: float
+    p50_ms: float
+    p99_ms: float
+    peak_kib: float | None
+
+    @property
+    def throughput(self) -> float:
+        """Completed requests per second"""
+        return self.requests / self.seconds if self.seconds else 0.0
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Return the nearest-rank percentile of values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+def _timed(func: Callable[..., Any], latencies: list[float]) -> Callable[..., Any]:
+    def wrap(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        latencies.append(time.perf_counter() - start)
+        return result
+    return wrap
+
+
+def _atimed(func: Callable[..., Any], latencies: list[float]) -> Callable[..., Any]:
+    async def wrap(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        result = await func(*args, **kwargs)
+        latencies.append(time.perf_counter() - start)
+        return result
+    return wrap
+
+
+def _check(results: Any) -> None:
+    """Consume BatchResults without keeping their data alive, raising if any request failed"""
+    errors = [result.error for result in results if result.error is not None]
+    if errors:
+        raise RuntimeError(f"{len(errors)} benchmark requests failed, first error: {errors[0]!r}")
+
+
+async def _acheck(results: Any) -> None:
+    """Async version of _check()"""
+    _check([result async for result in results if result.error is not None])
+
+
+def _scenario(mode: str, endpoint: str, concurrency: int, requests: int, host: str) -> Callable[[list[float]], None]:
+    """Return a callable running one scenario and appending per-request latencies to the given list"""
+    path = endpoint if endpoint != "player" else None
+
+    def fetch_sync(api: API) -> Callable[[Any], Any]:
+        if path is None:
+            return lambda _: api.fetch_player(_ALLYCODE)
+        return lambda _: api.fetch_data(path)
+
+    def fetch_async(api: API) -> Callable[[Any], Any]:
+        if path is None:
+            return lambda _: api.fetch_player_async(_ALLYCODE)
+        return lambda _: api.fetch_data_async(path)
+
+    def run(latencies: list[float]) -> None:
+        if mode in ("sign", "signer"):
+            api = API(_API_KEY, _ALLYCODE, api_host=host)
+            body = api.serializer.dumps({"payload": {"allyCode": _ALLYCODE, "enums": False}})
+            sign = _timed(api.sign if mode == "sign" else Signer(_API_KEY).headers, latencies)
+            for _ in range(requests):
+                sign("POST", f"/api/{endpoint}", body)
+            return
+
+        if mode == "registry":
+            with Registry(_API_KEY, _ALLYCODE, _DISCORD_ID, api_host=host) as registry:
+                fetch = _timed(registry.fetch_player, latencies)
+                for _ in range(requests):
+                    fetch(allycode=_ALLYCODE)
+            return
+
+        if mode == "sync":
+            with API(_API_KEY, _ALLYCODE, api_host=host) as api:
+                fetch = _timed(fetch_sync(api), latencies)
+                for n in range(requests):
+                    fetch(n)
+            return
+
+        if mode == "threaded":
+            with API(_API_KEY, _ALLYCODE, api_host=host) as api:
+                _check(api.fetch_many_threaded(_timed(fetch_sync(api), latencies), range(requests),
+                                               max_workers=concurrency))
+            return
+
+        async def run_async() -> None:
+            async with API(_API_KEY, _ALLYCODE, api_host=host) as api:
+                if mode == "batched":
+                    api.fetch_player_async = _atimed(api.fetch_player_async, latencies)
+                    await _acheck(api.fetch_players_many([_ALLYCODE] * requests, concurrency=concurrency))
+                else:
+                    fetch = _atimed(fetch_async(api), latencies)
+                    await _acheck(run_batch_async(fetch, range(requests), concurrency=concurrency))
+
+        asyncio.run(run_async())
+
+    return run
+
+
+def measure(mode: str, endpoint: str, concurrency: int, requests: int, host: str, *,
+            memory: bool = True) -> Result:
+    """Run a scenario once for timing and, if memory is set, once more under tracemalloc for the peak allocation"""
+    scenario = _scenario(mode, endpoint, concurrency, requests, host)
+    latencies: list[float] = []
+    start = time.perf_counter()
+    scenario(latencies)
+    seconds = time.perf_counter() - start
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            scenario([])
+            peak = tracemalloc.get_traced_memory()[1] / 1024
+        finally:
+            tracemalloc.stop()
+
+    return Result(mode, endpoint, concurrency, requests, seconds, percentile(latencies, 50) * 1000,
+                  percentile(latencies, 99) * 1000, peak)
+
+
+def _plan(modes: Sequence[str], endpoints: Sequence[str], levels: Sequence[int]) -> list[tuple[str, str, int]]:
+    plan = []
+    for mode in modes:
+        if mode in ("sign", "signer", "registry"):
+            plan.append((mode, "database" if mode == "registry" else "player", 1))
+            continue
+        for endpoint in endpoints if mode != "batched" else ("player",):
+            for level in levels if mode != "sync" else (1,):
+                plan.append((mode, endpoint, level))
+    return plan
+
+
+def _csv(value: str) -> list[str]:
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def main(argv: Sequence[str] | None = None) -> list[Result]:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario (default: 200)")
+    parser.add_argument("--concurrency", type=_csv, default=["1", "8", "32"],
+                        help="comma separated concurrency levels (default: 1,8,32)")
+    parser.add_argument("--modes", type=_csv, default=list(MODES), help=f"subset of {','.join(MODES)}")
+    parser.add_argument("--endpoints", type=_csv, default=list(ENDPOINTS), help=f"subset of {','.join(ENDPOINTS)}")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated server latency in ms (default: 0)")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="skip the tracemalloc pass")
+    parser.add_argument("--json", dest="json_path", help="also write the results to this file as JSON")
+    args = parser.parse_args(argv)
+
+    for mode in args.modes:
+        if mode not in MODES:
+            parser.error(f"unknown mode: {mode}")
+    for endpoint in args.endpoints:
+        if endpoint not in ENDPOINTS:
+            parser.error(f"unknown endpoint: {endpoint}")
+    levels = [int(level) for level in args.concurrency]
+
+    results = []
+    with MockServer(latency=args.latency / 1000) as server:
+        sizes = ", ".join(f"{path} {len(body) / 1024:.0f} KiB" for path, body in server.bodies.items())
+        print(f"Mock server {server.url} ({sizes})")
+        print(f"{'mode':<10}{'endpoint':<10}{'conc':>6}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'peak KiB':>11}")
+        for mode, endpoint, level in _plan(args.modes, args.endpoints, levels):
+            result = measure(mode, endpoint, level, args.requests, server.url, memory=args.memory)
+            peak = f"{result.peak_kib:>11.0f}" if result.peak_kib is not None else f"{'-':>11}"
+            print(f"{mode:<10}{endpoint:<10}{level:>6}{result.throughput:>10.1f}{result.p50_ms:>10.2f}"
+                  f"{result.p99_ms:>10.2f}{peak}")
+            results.append(result)
+
+    if args.json_path:
+        with open(args.json_path, 'w') as fh:
+            json.dump([dict(r._asdict(), throughput=r.throughput) for r in results], fh, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
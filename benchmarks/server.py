@@ -0,0 +1,86 @@
+"""
+Local HTTP stand-in for the Mhanndalorian Bot API used by the benchmarks
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from benchmarks import payloads
+
+__all__ = ["MockServer", "default_bodies"]
+
+
+def default_bodies() -> dict[str, bytes]:
+    """Return the encoded response body served for each endpoint path"""
+    responses: dict[str, Any] = {
+        '/api/player': payloads.player(),
+        '/api/guild': payloads.guild(),
+        '/api/twlogs': payloads.twlogs(),
+        '/api/database': payloads.registry_records(),
+    }
+    return {path: json.dumps(body, separators=(',', ':')).encode() for path, body in responses.items()}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "MockServer"
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        body = self.server.bodies.get(self.path)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if body is None:
+            self.send_response(404)
+            body = b'{"message":"unknown endpoint"}'
+        else:
+            self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class MockServer(ThreadingHTTPServer):
+    """Threaded keep-alive HTTP server answering every POST with a pre-encoded recorded-size response
+
+    Keyword Args
+        latency: Seconds each response is delayed by, to simulate the network / upstream, Default: 0.0
+        bodies: Mapping of request path to response body, Default: default_bodies()
+
+    Notes
+        Use as a context manager; the server runs on a background thread on a free localhost port and ``url`` is the
+        value to pass as ``api_host``.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, *, latency: float = 0.0, bodies: dict[str, bytes] | None = None):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.latency = latency
+        self.bodies = default_bodies() if bodies is None else bodies
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "MockServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
@@ -3,7 +3,20 @@
 Public API:
     API       - authenticated endpoint client
     Registry  - player registry client
+    OnboardingResult - progress event yielded by Registry.onboard_players_async
     EndPoint  - endpoint enum
+    BatchResult - per-item outcome yielded by the batch fetch methods
+    ResponseCache - optional TTL response cache for API
+    MemoryCacheBackend, SQLiteCacheBackend - ResponseCache storage backends
+    IdentityCache - discord ID <-> allycode cache for Registry
+    RetryPolicy - retry/backoff configuration for API and Registry
+    RateLimiter - token bucket limiter shared by sync and async requests
+    MetricsCollector, InMemoryMetrics - request lifecycle metrics hooks and in-memory aggregator
+    PrometheusMetrics, OpenTelemetryMetrics - optional metrics exporters
+    SnapshotDiffer - structural diff of successive TW / TB / RAID responses
+    LogCursor, LogFollower - incremental TW / TB log following
+    PollScheduler - asyncio polling scheduler with adaptive intervals
+    RosterIndex - column-oriented roster index for guild-wide unit queries
 
 Logging:
     This package emits records under the ``mhanndalorian_bot`` logger hierarchy and attaches a
@@ -18,8 +31,20 @@ import logging
 
 from .api import API
 from .attrs import EndPoint
-from .registry import Registry
+from .batch import BatchResult
+from .cache import IdentityCache, MemoryCacheBackend, ResponseCache, SQLiteCacheBackend
+from .diff import SnapshotDiffer
+from .logs import LogCursor, LogFollower
+from .metrics import InMemoryMetrics, MetricsCollector, OpenTelemetryMetrics, PrometheusMetrics
+from .ratelimit import RateLimiter
+from .registry import OnboardingResult, Registry
+from .retry import RetryPolicy
+from .roster import RosterIndex
+from .scheduler import PollScheduler
 
-__all__ = ["API", "EndPoint", "Registry"]
+__all__ = ["API", "BatchResult", "EndPoint", "IdentityCache", "InMemoryMetrics", "LogCursor", "LogFollower",
+           "MemoryCacheBackend", "MetricsCollector", "OnboardingResult", "OpenTelemetryMetrics", "PollScheduler",
+           "PrometheusMetrics", "RateLimiter", "Registry", "ResponseCache", "RetryPolicy", "RosterIndex",
+           "SnapshotDiffer", "SQLiteCacheBackend"]
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
@@ -0,0 +1,11 @@
+"""
+Analytics over TW, TB and RAID responses
+"""
+
+from .raid import RaidHistory, RaidMemberStats, RaidProjection, RaidTracker
+from .tb import TBAnalytics, TBMemberRow, TBStarProjection, TBZoneActivityRow, TBZoneRow
+from .tw import TWAnalytics, TWMemberRow, TWSquadRow, TWSummary, TWZoneRow
+
+__all__ = ["RaidHistory", "RaidMemberStats", "RaidProjection", "RaidTracker", "TBAnalytics", "TBMemberRow",
+           "TBStarProjection", "TBZoneActivityRow", "TBZoneRow", "TWAnalytics", "TWMemberRow", "TWSquadRow",
+           "TWSummary", "TWZoneRow"]
@@ -0,0 +1,212 @@
+"""
+Raid progress tracking with delta-encoded snapshots and final score projections
+"""
+
+from __future__ import annotations
+
+import time
+from array import array
+from bisect import bisect_right
+from typing import Any, Callable, Hashable, Iterable, NamedTuple
+
+from mhanndalorian_bot.models import _int, _unwrap
+
+__all__ = ["RaidHistory", "RaidMemberStats", "RaidProjection", "RaidTracker"]
+
+
+class RaidMemberStats(NamedTuple):
+    """Progress of one member"""
+
+    player_id: str
+    progress: int
+    rank: int
+    rate: float
+    projected: int
+
+
+class RaidProjection(NamedTuple):
+    """Current and projected guild progress of one raid"""
+
+    raid_id: str
+    progress: int
+    rate: float
+    expire_time: float
+    projected: int
+
+
+class RaidHistory:
+    """Successive progress snapshots of one raid
+
+    Only changes are stored: for every member, the snapshot numbers at which their progress changed and the size of
+    each change. A raid polled every few minutes therefore costs a few bytes per member per actual attack rather
+    than a copy of the response per poll.
+
+    Args
+        raid_id: Raid identifier
+        expire_time: Epoch seconds at which the raid ends, 0 if unknown
+    """
+
+    __slots__ = ("raid_id", "expire_time", "times", "member_ids", "_codes", "_current", "_ranks", "_indices",
+                 "_deltas")
+
+    def __init__(self, raid_id: str, expire_time: float = 0.0):
+        self.raid_id = raid_id
+        self.expire_time = expire_time
+        self.times = array('d')
+        self.member_ids: list[str] = []
+        self._codes: dict[str, int] = {}
+        self._current = array('q')
+        self._ranks = array('i')
+        self._indices: list[array] = []
+        self._deltas: list[array] = []
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(raid_id={self.raid_id!r}, snapshots={len(self.times)})"
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def record(self, members: Iterable[dict[str, Any]], timestamp: float) -> int:
+        """Record the raidMember entries of one snapshot and return the number of members whose progress changed"""
+        if self.times and timestamp < self.times[-1]:
+            raise ValueError("Snapshots must be recorded in chronological order")
+        snapshot = len(self.times)
+        self.times.append(timestamp)
+        changed = 0
+        for member in members:
+            player_id = member.get('playerId', '')
+            code = self._codes.get(player_id)
+            if code is None:
+                code = self._codes[player_id] = len(self.member_ids)
+                self.member_ids.append(player_id)
+                self._current.append(0)
+                self._ranks.append(0)
+                self._indices.append(array('I'))
+                self._deltas.append(array('q'))
+            progress = _int(member.get('memberProgress'))
+            self._ranks[code] = _int(member.get('memberRank'))
+            delta = progress - self._current[code]
+            if delta:
+                self._current[code] = progress
+                self._indices[code].append(snapshot)
+                self._deltas[code].append(delta)
+                changed += 1
+        return changed
+
+    def _progress_at(self, code: int, snapshot: int) -> int:
+        end = bisect_right(self._indices[code], snapshot)
+        return sum(self._deltas[code][:end])
+
+    def _window_start(self, window: float | None) -> int:
+        """Return the number of the oldest snapshot within window seconds of the latest one"""
+        if window is None or not self.times:
+            return 0
+        return max(bisect_right(self.times, self.times[-1] - window) - 1, 0)
+
+    def progress(self, player_id: str) -> int:
+        """Return a member's latest progress"""
+        code = self._codes.get(player_id)
+        return self._current[code] if code is not None else 0
+
+    def series(self, player_id: str) -> list[tuple[float, int]]:
+        """Return (timestamp, progress) for every snapshot in which the member's progress changed"""
+        code = self._codes.get(player_id)
+        if code is None:
+            return []
+        result, total = [], 0
+        for snapshot, delta in zip(self._indices[code], self._deltas[code]):
+            total += delta
+            result.append((self.times[snapshot], total))
+        return result
+
+    def _remaining(self) -> float:
+        return max(self.expire_time - self.times[-1], 0.0) if self.expire_time and self.times else 0.0
+
+    def member_stats(self, *, window: float | None = 3600.0) -> list[RaidMemberStats]:
+        """Return progress, rank, rate (progress per second over the window) and projection for every member"""
+        if not self.times:
+            return []
+        start = self._window_start(window)
+        elapsed = self.times[-1] - self.times[start]
+        remaining = self._remaining()
+        stats = []
+        for code, player_id in enumerate(self.member_ids):
+            current = self._current[code]
+            rate = (current - self._progress_at(code, start)) / elapsed if elapsed > 0 else 0.0
+            stats.append(RaidMemberStats(player_id, current, self._ranks[code], rate,
+                                         current + round(rate * remaining)))
+        return stats
+
+    def projection(self, *, window: float | None = 3600.0) -> RaidProjection:
+        """Return the guild's total progress, its rate over the window and the projected total at expiry"""
+        total = sum(self._current)
+        if len(self.times) < 2:
+            return RaidProjection(self.raid_id, total, 0.0, self.expire_time, total)
+        start = self._window_start(window)
+        elapsed = self.times[-1] - self.times[start]
+        past = sum(self._progress_at(code, start) for code in range(len(self.member_ids)))
+        rate = (total - past) / elapsed if elapsed > 0 else 0.0
+        return RaidProjection(self.raid_id, total, rate, self.expire_time, total + round(rate * self._remaining()))
+
+
+class RaidTracker:
+    """Track progress of many concurrent raids from successive ACTIVERAID responses
+
+    Keyword Args
+        window: Default number of seconds of history used for rates and projections, Default: 3600.0
+        clock: Epoch time source used when add() is called without a timestamp. Default: time.time
+
+    Notes
+        Raw responses are not retained; each snapshot only appends the changed member progress to its RaidHistory.
+    """
+
+    def __init__(self, *, window: float = 3600.0, clock: Callable[[], float] = time.time):
+        self.window = window
+        self.clock = clock
+        self.raids: dict[Hashable, RaidHistory] = {}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(raids={len(self.raids)})"
+
+    def add(self, raid: dict[str, Any], *, key: Hashable | None = None,
+            timestamp: float | None = None) -> RaidHistory:
+        """Record one ACTIVERAID response
+
+            Args
+                raid: Response from API.fetch_raid() / fetch_raid_async()
+
+            Keyword Args
+                key: Key to track the raid under, e.g. the guild ID. Default: the raid ID
+                timestamp: Epoch seconds of the snapshot, Default: now
+
+            Returns
+                The RaidHistory of the raid. A new raid ID under an existing key starts a new history.
+        """
+        data = _unwrap(raid, 'raidId', 'data')
+        raid_id = data.get('raidId', '')
+        expire_time = _int(data.get('expireTime'))
+        if expire_time > 1e11:  # epoch milliseconds
+            expire_time /= 1000
+        key = raid_id if key is None else key
+
+        history = self.raids.get(key)
+        if history is None or history.raid_id != raid_id:
+            history = self.raids[key] = RaidHistory(raid_id, expire_time)
+        elif expire_time:
+            history.expire_time = expire_time
+        history.record(data.get('raidMember') or (), self.clock() if timestamp is None else timestamp)
+        return history
+
+    def add_many(self, raids: Iterable[tuple[Hashable, dict[str, Any]]], *,
+                 timestamp: float | None = None) -> list[RaidHistory]:
+        """Record many (key, response) pairs taken at the same time"""
+        timestamp = self.clock() if timestamp is None else timestamp
+        return [self.add(raid, key=key, timestamp=timestamp) for key, raid in raids]
+
+    def discard(self, key: Hashable) -> None:
+        """Stop tracking a raid"""
+        self.raids.pop(key, None)
+
+    def projections(self) -> dict[Hashable, RaidProjection]:
+        """Return the projection of every tracked raid"""
+        return {key: history.projection(window=self.window) for key, history in self.raids.items()}
@@ -0,0 +1,252 @@
+"""
+Territory Battle deployment, combat and special mission aggregation from TB and TBLOGS responses
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Iterable, Mapping, NamedTuple, Sequence
+
+from mhanndalorian_bot.models import _int, _unwrap
+
+__all__ = ["TBAnalytics", "TBMemberRow", "TBStarProjection", "TBZoneActivityRow", "TBZoneRow"]
+
+# currentStat mapStatId prefixes (before the trailing '_round_<n>') mapped to TBMemberRow fields
+_STAT_FIELDS = {
+    'power': 'deployed',
+    'score': 'score',
+    'strike_attempt': 'combat_attempts',
+    'strike_encounter': 'waves',
+    'covert_attempt': 'special_attempts',
+    'covert_complete': 'special_completed',
+    'unit_donated': 'platoon_units',
+}
+_ROUND_STAT = re.compile(r"^(.*)_round_(\d+)$")
+_ZONE_LISTS = (('conflictZoneStatus', 'conflict'), ('strikeZoneStatus', 'strike'), ('covertZoneStatus', 'covert'))
+
+
+class TBMemberRow(NamedTuple):
+    """Totals for one member across all rounds"""
+
+    guild_id: str
+    member_id: str
+    deployed: int = 0
+    score: int = 0
+    combat_attempts: int = 0
+    waves: int = 0
+    special_attempts: int = 0
+    special_completed: int = 0
+    platoon_units: int = 0
+
+    @property
+    def wave_rate(self) -> float:
+        """Waves won per combat mission attempt"""
+        return self.waves / self.combat_attempts if self.combat_attempts else 0.0
+
+
+class TBZoneRow(NamedTuple):
+    """Score and state of one zone"""
+
+    guild_id: str
+    zone_id: str
+    kind: str
+    state: str
+    score: int
+
+
+class TBZoneActivityRow(NamedTuple):
+    """TBLOGS activity of one member in one zone"""
+
+    guild_id: str
+    zone_id: str
+    member_id: str
+    events: int
+    score: int
+
+
+class TBStarProjection(NamedTuple):
+    """Current and projected stars of one deployment zone"""
+
+    zone_id: str
+    score: int
+    stars: int
+    projected_score: int
+    projected_stars: int
+
+
+def _stars(score: int, thresholds: Sequence[int]) -> int:
+    return sum(score >= threshold for threshold in thresholds)
+
+
+class TBAnalytics:
+    """Index TB and TBLOGS responses for one or many guilds into per-member and per-zone tables
+
+    Each call to add() reads a TB response (and optionally its TBLOGS response) once. Tables are keyed by guild ID
+    and then by member ID, zone ID or (zone ID, member ID), so the rollups below are dictionary lookups rather than
+    walks over the raw responses.
+
+    Notes
+        Member statistics come from the ``currentStat`` list, whose ``mapStatId`` values have the form
+        '<stat>_round_<n>' (e.g. 'power_round_1' for deployed GP, 'strike_encounter_round_2' for waves won).
+        Zones are read from ``conflictZoneStatus``, ``strikeZoneStatus`` and ``covertZoneStatus``. Log activities
+        carrying a ``zoneData.scoreDelta`` are summed per member and zone.
+    """
+
+    def __init__(self) -> None:
+        self.members: dict[str, dict[str, TBMemberRow]] = {}
+        self.zones: dict[str, dict[str, TBZoneRow]] = {}
+        self.activity: dict[str, dict[tuple[str, str], TBZoneActivityRow]] = {}
+        self.rounds: dict[str, dict[tuple[str, int], dict[str, int]]] = {}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(guilds={len(self.members)})"
+
+    def _add_stats(self, guild_id: str, stats: Iterable[dict[str, Any]]) -> None:
+        totals: dict[str, dict[str, int]] = {}
+        rounds = self.rounds[guild_id] = {}
+        for stat in stats:
+            match = _ROUND_STAT.match(stat.get('mapStatId', ''))
+            if match is None:
+                continue
+            field = _STAT_FIELDS.get(match.group(1))
+            if field is None:
+                continue
+            round_number = int(match.group(2))
+            for player in stat.get('playerStat') or ():
+                member_id = player.get('memberId', '')
+                value = _int(player.get('score'))
+                member = totals.setdefault(member_id, {})
+                member[field] = member.get(field, 0) + value
+                per_round = rounds.setdefault((member_id, round_number), {})
+                per_round[field] = per_round.get(field, 0) + value
+        self.members[guild_id] = {member_id: TBMemberRow(guild_id, member_id, **fields)
+                                  for member_id, fields in totals.items()}
+
+    def _add_logs(self, guild_id: str, logs: Any) -> None:
+        activity = self.activity[guild_id] = {}
+        entries = (logs.get('data') or ()) if isinstance(logs, dict) else logs
+        for entry in entries:
+            member_id = entry.get('authorId', '')
+            activities = entry.get('data')
+            for item in activities if isinstance(activities, list) else (entry,):
+                zone = (item.get('activity') or item).get('zoneData') or {}
+                if 'scoreDelta' not in zone:
+                    continue
+                key = (zone.get('zoneId', ''), member_id)
+                row = activity.get(key)
+                events, score = (row.events, row.score) if row else (0, 0)
+                activity[key] = TBZoneActivityRow(guild_id, *key, events + 1, score + _int(zone['scoreDelta']))
+
+    def add(self, tb: dict[str, Any], logs: dict[str, Any] | Iterable[dict[str, Any]] | None = None, *,
+            guild_id: str | None = None) -> str:
+        """Add one TB response, optionally with the matching TBLOGS response or entries
+
+            Args
+                tb: Response from API.fetch_tb() / fetch_tb_async()
+                logs: Response from API.fetch_tblogs() or an iterable of log entries (e.g. fetch_tblogs_iter())
+
+            Keyword Args
+                guild_id: Key to file the data under. Defaults to the response's guildId, then its instance ID.
+
+            Returns
+                The guild ID the data was stored under. Data previously added for it is replaced.
+        """
+        data = _unwrap(tb, 'currentStat', 'data', 'events')
+        guild_id = guild_id or data.get('guildId') or data.get('id', '')
+        self.discard(guild_id)
+
+        self._add_stats(guild_id, data.get('currentStat') or ())
+        zones = self.zones[guild_id] = {}
+        for list_key, kind in _ZONE_LISTS:
+            for zone in data.get(list_key) or ():
+                status = zone.get('zoneStatus') or {}
+                zone_id = status.get('zoneId', '')
+                zones[zone_id] = TBZoneRow(guild_id, zone_id, kind, str(status.get('zoneState', '')),
+                                           _int(status.get('score')))
+        if logs is not None:
+            self._add_logs(guild_id, logs)
+        return guild_id
+
+    def add_many(self, battles: Iterable[tuple[dict[str, Any], Any]]) -> list[str]:
+        """Add many (tb, logs) pairs, e.g. one per tracked guild. logs may be None."""
+        return [self.add(tb, logs) for tb, logs in battles]
+
+    def discard(self, guild_id: str) -> None:
+        """Remove all data stored for a guild"""
+        for table in (self.members, self.zones, self.activity, self.rounds):
+            table.pop(guild_id, None)
+
+    def member_rows(self, guild_id: str) -> list[TBMemberRow]:
+        """Return the member rows of one guild"""
+        return list(self.members.get(guild_id, {}).values())
+
+    def undeployed(self, guild_id: str, members: Iterable[str] | None = None, *,
+                   round_number: int | None = None) -> list[str]:
+        """Return the IDs of members who have not deployed
+
+            Args
+                guild_id: Guild the TB data was added under
+                members: All guild member IDs (e.g. from fetch_guild). Members missing from the TB statistics are
+                         then reported as well. Defaults to the members present in the statistics.
+
+            Keyword Args
+                round_number: Only consider deployment in this round, Default: all rounds
+        """
+        rows = self.members.get(guild_id, {})
+        if members is None:
+            members = list(rows)
+        if round_number is None:
+            return [m for m in members if m not in rows or not rows[m].deployed]
+        rounds = self.rounds.get(guild_id, {})
+        return [m for m in members if not rounds.get((m, round_number), {}).get('deployed')]
+
+    def wave_rates(self, guild_id: str) -> dict[str, float]:
+        """Return waves won per combat mission attempt for each member who attempted one"""
+        return {row.member_id: row.wave_rate for row in self.member_rows(guild_id) if row.combat_attempts}
+
+    def guild_wave_rate(self, guild_id: str) -> float:
+        """Return waves won per combat mission attempt for the whole guild"""
+        rows = self.member_rows(guild_id)
+        attempts = sum(row.combat_attempts for row in rows)
+        return sum(row.waves for row in rows) / attempts if attempts else 0.0
+
+    def zone_activity(self, guild_id: str, zone_id: str) -> list[TBZoneActivityRow]:
+        """Return the TBLOGS activity rows of one zone, highest score first"""
+        rows = [row for (zone, _), row in self.activity.get(guild_id, {}).items() if zone == zone_id]
+        return sorted(rows, key=lambda row: -row.score)
+
+    def project_stars(self, guild_id: str, thresholds: Mapping[str, Sequence[int]], *,
+                      available: int = 0) -> dict[str, TBStarProjection]:
+        """Project the stars of the deployment zones if the available GP is deployed
+
+            Args
+                guild_id: Guild the TB data was added under
+                thresholds: Ascending star score thresholds per deployment zone ID, e.g. {'zone': (x, y, z)}
+
+            Keyword Args
+                available: GP still to be deployed (e.g. guild GP minus deployed). It is assigned greedily to whichever
+                           zone needs the least to reach its next star.
+
+            Returns
+                TBStarProjection per zone ID present in both thresholds and the TB data
+        """
+        zones = self.zones.get(guild_id, {})
+        scores = {zone_id: zones[zone_id].score for zone_id in thresholds if zone_id in zones}
+        projected = dict(scores)
+        while True:
+            gaps = []
+            for zone_id, score in projected.items():
+                stars = _stars(score, thresholds[zone_id])
+                if stars < len(thresholds[zone_id]):
+                    gaps.append((thresholds[zone_id][stars] - score, zone_id))
+            if not gaps:
+                break
+            gap, zone_id = min(gaps)
+            if gap > available:
+                break
+            available -= gap
+            projected[zone_id] += gap
+
+        return {zone_id: TBStarProjection(zone_id, score, _stars(score, thresholds[zone_id]), projected[zone_id],
+                                          _stars(projected[zone_id], thresholds[zone_id]))
+                for zone_id, score in scores.items()}
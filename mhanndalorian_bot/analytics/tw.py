@@ -0,0 +1,194 @@
+"""
+Territory War scoring metrics extracted from TW and TWLOGS responses
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, NamedTuple
+
+from mhanndalorian_bot.models import _int, _unwrap
+
+__all__ = ["DEFEATED_SQUAD_STATUSES", "TWAnalytics", "TWMemberRow", "TWSquadRow", "TWSummary", "TWZoneRow"]
+
+# Squad status names (requests made with enums=True) counted as defeated defenses
+DEFEATED_SQUAD_STATUSES = frozenset({"SQUADDEFEATED"})
+
+
+class TWZoneRow(NamedTuple):
+    """Score and defense state of one zone"""
+
+    guild_id: str
+    zone_id: str
+    state: str
+    score: int
+    squads: int
+    defeated: int
+
+    @property
+    def remaining(self) -> int:
+        """Defensive squads still standing"""
+        return self.squads - self.defeated
+
+
+class TWSquadRow(NamedTuple):
+    """One defensive squad"""
+
+    guild_id: str
+    zone_id: str
+    squad_id: str
+    player_id: str
+    player_name: str
+    status: str
+    power: int
+    defends: int
+
+
+class TWMemberRow(NamedTuple):
+    """Offensive and defensive contribution of one member of the home guild"""
+
+    guild_id: str
+    player_id: str
+    player_name: str
+    attacks: int
+    banners: int
+    squads_placed: int
+    defends: int
+
+    @property
+    def banner_efficiency(self) -> float:
+        """Average banners per attack"""
+        return self.banners / self.attacks if self.attacks else 0.0
+
+
+class TWSummary(NamedTuple):
+    """Current and projected score of one TW"""
+
+    guild_id: str
+    instance_id: str
+    opponent_id: str
+    score: int
+    opponent_score: int
+    projected_score: int
+    projected_opponent_score: int
+
+
+class _Member:
+    __slots__ = ("name", "attacks", "banners", "squads_placed", "defends")
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self.attacks = self.banners = self.squads_placed = self.defends = 0
+
+
+class TWAnalytics:
+    """Accumulate TW metrics for one or many guilds into flat tables
+
+    Each call to add() walks a TW response (and optionally its TWLOGS response) once and appends rows to the
+    zones, squads, members and summaries tables. Rows are NamedTuples, so the tables can be sorted, filtered or
+    handed to e.g. ``pandas.DataFrame(analytics.members)`` directly.
+
+    Keyword Args
+        defeated_statuses: Squad status values counted as defeated, Default: DEFEATED_SQUAD_STATUSES
+        banners_per_squad: Average banners per remaining defensive squad used for projections when a guild's own
+                           banner efficiency is unknown, Default: 20.0
+
+    Notes
+        Log entries are read as ``{'authorId', 'authorName', 'data': [{'activity': {'zoneData': {'zoneId',
+        'scoreDelta'}}}]}``; every activity carrying a scoreDelta counts as one attack. Projected scores assume
+        every remaining opposing squad is cleared at the attacking guild's banner efficiency.
+    """
+
+    def __init__(self, *, defeated_statuses: Iterable[str] = DEFEATED_SQUAD_STATUSES,
+                 banners_per_squad: float = 20.0):
+        self.defeated_statuses = frozenset(defeated_statuses)
+        self.banners_per_squad = banners_per_squad
+        self.zones: list[TWZoneRow] = []
+        self.squads: list[TWSquadRow] = []
+        self.members: list[TWMemberRow] = []
+        self.summaries: list[TWSummary] = []
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(wars={len(self.summaries)}, members={len(self.members)})"
+
+    def _add_side(self, side: dict[str, Any], members: dict[str, _Member] | None) -> tuple[str, int, int]:
+        """Append zone and squad rows for one guild, returning (guild_id, score, remaining squads)"""
+        guild_id = (side.get('profile') or {}).get('id', '')
+        total_score = remaining = 0
+        for zone in side.get('conflictStatus') or ():
+            status = zone.get('zoneStatus') or {}
+            zone_id = status.get('zoneId', '')
+            score = _int(status.get('score'))
+            squads = zone.get('warSquad') or ()
+            defeated = 0
+            for squad in squads:
+                squad_status = str(squad.get('squadStatus', ''))
+                player_id = squad.get('playerId', '')
+                defends = _int(squad.get('successfulDefends'))
+                is_defeated = squad_status in self.defeated_statuses
+                defeated += is_defeated
+                self.squads.append(TWSquadRow(guild_id, zone_id, squad.get('squadId', ''), player_id,
+                                              squad.get('playerName', ''), squad_status, _int(squad.get('power')),
+                                              defends))
+                if members is not None:
+                    member = members.get(player_id)
+                    if member is None:
+                        member = members[player_id] = _Member(squad.get('playerName', ''))
+                    member.squads_placed += 1
+                    member.defends += defends
+            self.zones.append(TWZoneRow(guild_id, zone_id, str(status.get('zoneState', '')), score, len(squads),
+                                        defeated))
+            total_score += score
+            remaining += len(squads) - defeated
+        return guild_id, total_score, remaining
+
+    @staticmethod
+    def _add_logs(logs: Any, members: dict[str, _Member]) -> None:
+        entries = (logs.get('data') or ()) if isinstance(logs, dict) else logs
+        for entry in entries:
+            player_id = entry.get('authorId', '')
+            activities = entry.get('data')
+            for item in activities if isinstance(activities, list) else (entry,):
+                zone = (item.get('activity') or item).get('zoneData') or {}
+                if 'scoreDelta' not in zone:
+                    continue
+                member = members.get(player_id)
+                if member is None:
+                    member = members[player_id] = _Member(entry.get('authorName', ''))
+                member.attacks += 1
+                member.banners += _int(zone['scoreDelta'])
+
+    def add(self, tw: dict[str, Any], logs: dict[str, Any] | Iterable[dict[str, Any]] | None = None) -> TWSummary:
+        """Add one TW response, optionally with the matching TWLOGS response or entries
+
+            Args
+                tw: Response from API.fetch_tw() / fetch_tw_async()
+                logs: Response from API.fetch_twlogs() or an iterable of log entries (e.g. fetch_twlogs_iter())
+
+            Returns
+                TWSummary for the war, also appended to the summaries table
+        """
+        data = _unwrap(tw, 'homeGuild', 'data', 'events')
+        members: dict[str, _Member] = {}
+        guild_id, score, home_remaining = self._add_side(data.get('homeGuild') or {}, members)
+        opponent_id, opponent_score, opponent_remaining = self._add_side(data.get('awayGuild') or {}, None)
+        if logs is not None:
+            self._add_logs(logs, members)
+
+        attacks = sum(m.attacks for m in members.values())
+        efficiency = sum(m.banners for m in members.values()) / attacks if attacks else self.banners_per_squad
+
+        self.members.extend(TWMemberRow(guild_id, player_id, m.name, m.attacks, m.banners, m.squads_placed,
+                                        m.defends) for player_id, m in members.items())
+        summary = TWSummary(guild_id, data.get('instanceId', ''), opponent_id, score, opponent_score,
+                            score + round(opponent_remaining * efficiency),
+                            opponent_score + round(home_remaining * self.banners_per_squad))
+        self.summaries.append(summary)
+        return summary
+
+    def add_many(self, wars: Iterable[tuple[dict[str, Any], Any]]) -> list[TWSummary]:
+        """Add many (tw, logs) pairs, e.g. one per tracked guild. logs may be None."""
+        return [self.add(tw, logs) for tw, logs in wars]
+
+    def members_for(self, guild_id: str) -> list[TWMemberRow]:
+        """Return the member rows of one guild ordered by banners, highest first"""
+        return sorted((row for row in self.members if row.guild_id == guild_id), key=lambda row: -row.banners)
@@ -6,10 +6,15 @@ from __future__ import annotations
 
 import copy
 import logging
-from typing import Any
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Iterable, Iterator, Sequence
 
 from mhanndalorian_bot.attrs import EndPoint
 from mhanndalorian_bot.base import MBot
+from mhanndalorian_bot.batch import BatchResult, run_batch_async, run_batch_threaded
+from mhanndalorian_bot.cache import ResponseCache
+from mhanndalorian_bot.logs import LogCursor, LogFollower
+from mhanndalorian_bot.models import Guild, Inventory, Player, Raid, TerritoryWar
+from mhanndalorian_bot.stream import aiter_json_array, iter_json_array
 from mhanndalorian_bot.utils import func_timer
 
 
@@ -27,10 +32,30 @@ class API(MBot):
     """
     Container class for MBot module to facilitate interacting with Mhanndalorian Bot authenticated
     endpoints for SWGOH. See https://mhanndalorianbot.work/api.html for more information.
+
+    Keyword Args
+        cache: Optional ResponseCache used by fetch_data() and fetch_data_async(). Instances may share a cache;
+               entries are scoped to the instance api-key and discord ID.
+        **kwargs: Additional keyword arguments forwarded to MBot
+
+    Notes
+        Every fetch_* method accepts an ``allycode`` keyword argument selecting the player (and so the guild) the
+        request is made for. The payload is built per call, so one instance can serve many players concurrently
+        without calling set_allycode().
     """
 
     logger = logging.getLogger(__name__)
 
+    # Location of the streamed arrays within their endpoint responses, used by the *_iter methods
+    twlogs_path: tuple[str, ...] = ('data',)
+    tblogs_path: tuple[str, ...] = ('data',)
+    guild_members_path: tuple[str, ...] = ('events', 'guild', 'member')
+
+    def __init__(self, api_key: str, allycode: str, discord_id: str | None = None, *,
+                 cache: ResponseCache | None = None, **kwargs: Any):
+        super().__init__(api_key=api_key, allycode=allycode, discord_id=discord_id, **kwargs)
+        self.cache = cache
+
     @staticmethod
     def _resolve_endpoint(ep: EndPoint | str) -> str:
         """Convert the given endpoint to its string representation."""
@@ -54,6 +79,46 @@ class API(MBot):
             raise ValueError("guild_id cannot be empty")
         return guild_id
 
+    def _cache_scope(self) -> str:
+        """Return the credential fingerprint separating this instance's entries in a shared ResponseCache"""
+        return ResponseCache.credential_scope(self.headers.get("api-key"), self.headers.get("x-discord-id"))
+
+    @staticmethod
+    def _reject_allycode(kwargs: dict[str, Any], method: str) -> None:
+        """Raise TypeError if an allycode override was passed to a GUILD method, which selects its guild by ID"""
+        if 'allycode' in kwargs:
+            raise TypeError(f"{method}() does not accept allycode; GUILD requests are selected by guild_id")
+
+    def _build_payload(self, payload: dict[str, Any] | None, enums: bool, allycode: str | None) -> dict[str, Any]:
+        """Return the payload for a single request, applying the enums flag and any per-call allycode override"""
+        new_payload = _payload_with_enums(payload or self.payload, enums)
+        if allycode is not None:
+            new_payload['payload']['allyCode'] = self.cleanse_allycode(allycode)
+        return new_payload
+
+    def _request_json(self, method: str, endpoint: str, payload: dict[str, Any], *, hmac: bool) -> dict[Any, Any]:
+        """Send a request and return the decoded JSON body, raising RuntimeError on non-200 responses"""
+        result = self._send(method, endpoint, payload, hmac=hmac)
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"HTTP request completed - Status: {result.status_code}")
+
+        if result.status_code == 200:
+            return self._decode(result)
+        raise RuntimeError(f"Unexpected result: {result.content.decode()}")
+
+    async def _request_json_async(self, method: str, endpoint: str, payload: dict[str, Any], *,
+                                  hmac: bool) -> dict[Any, Any]:
+        """Async version of _request_json()"""
+        result = await self._asend(method, endpoint, payload, hmac=hmac)
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"HTTP request completed - Status: {result.status_code}")
+
+        if result.status_code == 200:
+            return self._decode(result)
+        raise RuntimeError(f"Unexpected result: {result.content.decode()}")
+
     @func_timer
     def fetch_data(
             self,
@@ -62,7 +127,9 @@ class API(MBot):
             method: str | None = None,
             hmac: bool | None = None,
             payload: dict[str, Any] | None = None,
-            enums: bool = False
+            enums: bool = False,
+            cache: bool = True,
+            allycode: str | None = None
             ) -> dict[Any, Any]:
         """Return data from the provided API endpoint using standard synchronous HTTP requests
 
@@ -74,6 +141,10 @@ class API(MBot):
                 hmac: Boolean flag indicating whether the endpoints requires HMAC signature authentication
                 payload: Dictionary of payload data to be sent with the request, defaults to empty dict.
                 enums: Boolean flag indicating whether to return enum values instead of enum names.
+                cache: Boolean flag allowing the response to be served from / stored in the instance ResponseCache,
+                       if one is configured. Default: True
+                allycode: Allycode to make the request for instead of the instance allycode. Sets ``allyCode`` in
+                          the payload of this request only.
 
             Returns
                 Dictionary from JSON response, if found.
@@ -82,7 +153,7 @@ class API(MBot):
         endpoint = self._resolve_endpoint(endpoint)
         method = (method or "POST").upper()
         is_hmac_signed = hmac if hmac is not None else self.hmac
-        payload = _payload_with_enums(payload or self.payload, enums)
+        payload = self._build_payload(payload, enums, allycode)
 
         if self.logger.isEnabledFor(logging.DEBUG):
             self.logger.debug(
@@ -90,18 +161,13 @@ class API(MBot):
                     + f"Payload: {payload}"
                     )
 
-        if is_hmac_signed:
-            self.logger.debug("HMAC signing is required. Calling 'sign' method.")
-            self.sign(method=method, endpoint=endpoint, payload=payload)
-
-        result = self.client.post(endpoint, json=payload)
+        def _fetch() -> dict[Any, Any]:
+            return self._request_json(method, endpoint, payload, hmac=is_hmac_signed)
 
-        if self.logger.isEnabledFor(logging.DEBUG):
-            self.logger.debug(f"HTTP request completed - Status: {result.status_code}")
-
-        if result.status_code == 200:
-            return result.json()
-        raise RuntimeError(f"Unexpected result: {result.content.decode()}")
+        if cache and self.cache is not None:
+            key = self.cache.make_key(endpoint, payload, self._cache_scope())
+            return self.cache.get_or_fetch(key, _fetch, ttl=self.cache.ttl_for(endpoint))
+        return _fetch()
 
     def fetch_tw_leaderboard(self, **kwargs) -> dict[Any, Any]:
         """Return data from the TWLEADERBOARD endpoint for the currently active Territory War guild event"""
@@ -118,10 +184,15 @@ class API(MBot):
         kwargs.setdefault('enums', False)
         return self.fetch_data(EndPoint.TBLOGS, **kwargs)
 
-    def fetch_inventory(self, **kwargs) -> dict[Any, Any]:
-        """Return data from the player INVENTORY endpoint"""
+    def fetch_inventory(self, *, model: bool = False, **kwargs) -> dict[Any, Any] | Inventory:
+        """Return data from the player INVENTORY endpoint
+
+            Keyword Args
+                model: Boolean flag to return a Inventory model instead of the raw dictionary, Default: False
+        """
         kwargs.setdefault('enums', False)
-        return self.fetch_data(EndPoint.INVENTORY, **kwargs)
+        data = self.fetch_data(EndPoint.INVENTORY, **kwargs)
+        return Inventory.from_dict(data) if model else data
 
     def fetch_arena(self, **kwargs) -> dict[Any, Any]:
         """Return data from the player squad and fleet arena endpoint"""
@@ -137,43 +208,67 @@ class API(MBot):
         kwargs.setdefault('enums', False)
         return self.fetch_data(EndPoint.TBHISTORY, **kwargs)
 
-    def fetch_tw(self, **kwargs) -> dict[Any, Any]:
-        """Return data from the TW endpoint for the currently active Territory War guild event"""
+    def fetch_tw(self, *, model: bool = False, **kwargs) -> dict[Any, Any] | TerritoryWar:
+        """Return data from the TW endpoint for the currently active Territory War guild event
+
+            Keyword Args
+                model: Boolean flag to return a TerritoryWar model instead of the raw dictionary, Default: False
+        """
         kwargs.setdefault('enums', False)
-        return self.fetch_data(EndPoint.TW, **kwargs)
+        data = self.fetch_data(EndPoint.TW, **kwargs)
+        return TerritoryWar.from_dict(data) if model else data
 
-    def fetch_raid(self, **kwargs) -> dict[Any, Any]:
-        """Return data from the ACTIVERAID endpoint for the currently active raid guild event"""
+    def fetch_raid(self, *, model: bool = False, **kwargs) -> dict[Any, Any] | Raid:
+        """Return data from the ACTIVERAID endpoint for the currently active raid guild event
+
+            Keyword Args
+                model: Boolean flag to return a Raid model instead of the raw dictionary, Default: False
+        """
         kwargs.setdefault('enums', False)
-        return self.fetch_data(EndPoint.RAID, **kwargs)
+        data = self.fetch_data(EndPoint.RAID, **kwargs)
+        return Raid.from_dict(data) if model else data
+
+    def fetch_player(self, allycode: str | None = None, *, model: bool = False,
+                     **kwargs) -> dict[Any, Any] | Player:
+        """Return data from the PLAYER endpoint for the provided allycode
 
-    def fetch_player(self, allycode: str | None = None, **kwargs) -> dict[Any, Any]:
-        """Return data from the PLAYER endpoint for the provided allycode"""
+            Keyword Args
+                model: Boolean flag to return a Player model instead of the raw dictionary, Default: False
+        """
         validated_allycode = self._verify_allycode(allycode) if allycode else self.allycode
-        enums = kwargs.setdefault('enums', False)
+        kwargs.setdefault('enums', False)
         player = self.fetch_data(
                 endpoint=EndPoint.PLAYER,
                 payload={"payload": {"allyCode": validated_allycode}},
-                enums=enums
+                **kwargs
                 )
 
         if isinstance(player, dict) and 'events' in player:
-            return player['events']
-        return player
+            player = player['events']
+        return Player.from_dict(player) if model else player
 
-    def fetch_guild(self, guild_id: str, **kwargs) -> dict[Any, Any]:
-        """Return data from the GUILD endpoint for the provided guild"""
+    def fetch_guild(self, guild_id: str, *, model: bool = False, **kwargs) -> dict[Any, Any] | Guild:
+        """Return data from the GUILD endpoint for the provided guild
+
+            Keyword Args
+                model: Boolean flag to return a Guild model instead of the raw dictionary, Default: False
+                **kwargs: Keyword arguments accepted by fetch_data(), except allycode
+
+            Raises
+                TypeError: if allycode is passed. The guild is selected by guild_id only.
+        """
+        self._reject_allycode(kwargs, 'fetch_guild')
         validated_guild_id = self._verify_guild_id(guild_id)
-        enums = kwargs.setdefault('enums', False)
+        kwargs.setdefault('enums', False)
         guild = self.fetch_data(
                 endpoint=EndPoint.GUILD,
                 payload={"payload": {"guildId": validated_guild_id}},
-                enums=enums
+                **kwargs
                 )
 
         if isinstance(guild, dict) and 'events' in guild and 'guild' in guild['events']:
-            return guild['events']['guild']
-        return guild
+            guild = guild['events']['guild']
+        return Guild.from_dict(guild) if model else guild
 
     def fetch_squad_presets(self, **kwargs) -> dict[Any, Any]:
         """Return data from the SQUADPRESETS endpoint"""
@@ -190,6 +285,66 @@ class API(MBot):
         kwargs.setdefault('enums', False)
         return self.fetch_data(EndPoint.CONQUEST, **kwargs)
 
+    # Streaming methods
+    def _iter_items(
+            self,
+            endpoint: EndPoint | str,
+            path: Sequence[str],
+            *,
+            hmac: bool | None = None,
+            payload: dict[str, Any] | None = None,
+            enums: bool = False,
+            allycode: str | None = None
+            ) -> Iterator[Any]:
+        """Stream the endpoint response and yield the elements of the array found at path"""
+        endpoint = self._resolve_endpoint(endpoint)
+        is_hmac_signed = hmac if hmac is not None else self.hmac
+        payload = self._build_payload(payload, enums, allycode)
+
+        with self._stream("POST", endpoint, payload, hmac=is_hmac_signed) as result:
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"HTTP stream opened - Status: {result.status_code}")
+            if result.status_code != 200:
+                raise RuntimeError(f"Unexpected result: {result.read().decode()}")
+            yield from iter_json_array(result.iter_bytes(), path)
+
+    def fetch_twlogs_iter(self, *, path: Sequence[str] | None = None, **kwargs) -> Iterator[dict[Any, Any]]:
+        """Yield TWLOGS entries one at a time while the response is still downloading
+
+            Keyword Args
+                path: Keys leading to the log entry array in the response, Default: API.twlogs_path
+                **kwargs: hmac, payload, enums and allycode as accepted by fetch_data()
+
+            Yields
+                Log entry dictionaries. Peak memory is bounded by the largest single entry rather than the full log.
+        """
+        return self._iter_items(EndPoint.TWLOGS, path or self.twlogs_path, **kwargs)
+
+    def fetch_tblogs_iter(self, *, path: Sequence[str] | None = None, **kwargs) -> Iterator[dict[Any, Any]]:
+        """Yield TBLOGS entries one at a time while the response is still downloading
+
+            Keyword Args
+                path: Keys leading to the log entry array in the response, Default: API.tblogs_path
+                **kwargs: hmac, payload, enums and allycode as accepted by fetch_data()
+        """
+        return self._iter_items(EndPoint.TBLOGS, path or self.tblogs_path, **kwargs)
+
+    def fetch_guild_members_iter(self, guild_id: str, *, path: Sequence[str] | None = None,
+                                 **kwargs) -> Iterator[dict[Any, Any]]:
+        """Yield GUILD member entries for the provided guild one at a time while the response is still downloading
+
+            Args
+                guild_id: Guild ID as a string
+
+            Keyword Args
+                path: Keys leading to the member array in the response, Default: API.guild_members_path
+                **kwargs: hmac and enums as accepted by fetch_data(). allycode is rejected like in fetch_guild()
+        """
+        self._reject_allycode(kwargs, 'fetch_guild_members_iter')
+        validated_guild_id = self._verify_guild_id(guild_id)
+        return self._iter_items(EndPoint.GUILD, path or self.guild_members_path,
+                                payload={"payload": {"guildId": validated_guild_id}}, **kwargs)
+
     # Async methods
     @func_timer
     async def fetch_data_async(
@@ -199,7 +354,9 @@ class API(MBot):
             method: str | None = None,
             hmac: bool | None = None,
             payload: dict[str, Any] | None = None,
-            enums: bool = False
+            enums: bool = False,
+            cache: bool = True,
+            allycode: str | None = None
             ) -> dict[Any, Any]:
         """Return data from the provided API endpoint using asynchronous HTTP requests
 
@@ -211,6 +368,10 @@ class API(MBot):
                 hmac: Boolean flag indicating whether the endpoints requires HMAC signature authentication
                 payload: Dictionary of payload data to be sent with the request, defaults to empty dict.
                 enums: Boolean flag indicating whether to return enum values instead of enum names.
+                cache: Boolean flag allowing the response to be served from / stored in the instance ResponseCache,
+                       if one is configured. Default: True
+                allycode: Allycode to make the request for instead of the instance allycode. Sets ``allyCode`` in
+                          the payload of this request only.
 
             Returns
                 Dictionary from JSON response.
@@ -218,7 +379,7 @@ class API(MBot):
         endpoint = self._resolve_endpoint(endpoint)
         method = (method or "POST").upper()
         is_hmac_signed = hmac if hmac is not None else self.hmac
-        payload = _payload_with_enums(payload or self.payload, enums)
+        payload = self._build_payload(payload, enums, allycode)
 
         if self.logger.isEnabledFor(logging.DEBUG):
             self.logger.debug(
@@ -226,18 +387,13 @@ class API(MBot):
                     + f"Payload: {payload}"
                     )
 
-        if is_hmac_signed:
-            self.logger.debug("HMAC signing is required. Calling 'sign' method.")
-            self.sign(method=method, endpoint=endpoint, payload=payload)
-
-        result = await self.aclient.post(endpoint, json=payload)
-
-        if self.logger.isEnabledFor(logging.DEBUG):
-            self.logger.debug(f"HTTP request completed - Status: {result.status_code}")
+        async def _fetch() -> dict[Any, Any]:
+            return await self._request_json_async(method, endpoint, payload, hmac=is_hmac_signed)
 
-        if result.status_code == 200:
-            return result.json()
-        raise RuntimeError(f"Unexpected result: {result.content.decode()}")
+        if cache and self.cache is not None:
+            key = self.cache.make_key(endpoint, payload, self._cache_scope())
+            return await self.cache.get_or_fetch_async(key, _fetch, ttl=self.cache.ttl_for(endpoint))
+        return await _fetch()
 
     async def fetch_tw_leaderboard_async(self, **kwargs) -> dict[Any, Any]:
         """Return data from the TWLEADERBOARD endpoint for the currently active Territory War guild event"""
@@ -254,10 +410,15 @@ class API(MBot):
         kwargs.setdefault('enums', False)
         return await self.fetch_data_async(EndPoint.TBLOGS, **kwargs)
 
-    async def fetch_inventory_async(self, **kwargs) -> dict[Any, Any]:
-        """Return data from the player INVENTORY endpoint"""
+    async def fetch_inventory_async(self, *, model: bool = False, **kwargs) -> dict[Any, Any] | Inventory:
+        """Return data from the player INVENTORY endpoint
+
+            Keyword Args
+                model: Boolean flag to return a Inventory model instead of the raw dictionary, Default: False
+        """
         kwargs.setdefault('enums', False)
-        return await self.fetch_data_async(EndPoint.INVENTORY, **kwargs)
+        data = await self.fetch_data_async(EndPoint.INVENTORY, **kwargs)
+        return Inventory.from_dict(data) if model else data
 
     async def fetch_arena_async(self, **kwargs) -> dict[Any, Any]:
         """Return data from the player squad and fleet arena endpoint"""
@@ -273,43 +434,67 @@ class API(MBot):
         kwargs.setdefault('enums', False)
         return await self.fetch_data_async(EndPoint.TBHISTORY, **kwargs)
 
-    async def fetch_tw_async(self, **kwargs) -> dict[Any, Any]:
-        """Return data from the TW endpoint for the currently active Territory War guild event"""
+    async def fetch_tw_async(self, *, model: bool = False, **kwargs) -> dict[Any, Any] | TerritoryWar:
+        """Return data from the TW endpoint for the currently active Territory War guild event
+
+            Keyword Args
+                model: Boolean flag to return a TerritoryWar model instead of the raw dictionary, Default: False
+        """
         kwargs.setdefault('enums', False)
-        return await self.fetch_data_async(EndPoint.TW, **kwargs)
+        data = await self.fetch_data_async(EndPoint.TW, **kwargs)
+        return TerritoryWar.from_dict(data) if model else data
+
+    async def fetch_raid_async(self, *, model: bool = False, **kwargs) -> dict[Any, Any] | Raid:
+        """Return data from the ACTIVERAID endpoint for the currently active raid guild event
 
-    async def fetch_raid_async(self, **kwargs) -> dict[Any, Any]:
-        """Return data from the ACTIVERAID endpoint for the currently active raid guild event"""
+            Keyword Args
+                model: Boolean flag to return a Raid model instead of the raw dictionary, Default: False
+        """
         kwargs.setdefault('enums', False)
-        return await self.fetch_data_async(EndPoint.RAID, **kwargs)
+        data = await self.fetch_data_async(EndPoint.RAID, **kwargs)
+        return Raid.from_dict(data) if model else data
+
+    async def fetch_player_async(self, allycode: str | None = None, *, model: bool = False,
+                                 **kwargs) -> dict[Any, Any] | Player:
+        """Return data from the PLAYER endpoint for the provided allycode
 
-    async def fetch_player_async(self, allycode: str | None = None, **kwargs) -> dict[Any, Any]:
-        """Return data from the PLAYER endpoint for the provided allycode"""
+            Keyword Args
+                model: Boolean flag to return a Player model instead of the raw dictionary, Default: False
+        """
         validated_allycode = self._verify_allycode(allycode) if allycode else self.allycode
-        enums = kwargs.setdefault('enums', False)
+        kwargs.setdefault('enums', False)
         player = await self.fetch_data_async(
                 endpoint=EndPoint.PLAYER,
                 payload={"payload": {"allyCode": validated_allycode}},
-                enums=enums
+                **kwargs
                 )
 
         if isinstance(player, dict) and 'events' in player:
-            return player['events']
-        return player
+            player = player['events']
+        return Player.from_dict(player) if model else player
+
+    async def fetch_guild_async(self, guild_id: str, *, model: bool = False, **kwargs) -> dict[Any, Any] | Guild:
+        """Return data from the GUILD endpoint for the provided guild
 
-    async def fetch_guild_async(self, guild_id: str, **kwargs) -> dict[Any, Any]:
-        """Return data from the GUILD endpoint for the provided guild"""
+            Keyword Args
+                model: Boolean flag to return a Guild model instead of the raw dictionary, Default: False
+                **kwargs: Keyword arguments accepted by fetch_data(), except allycode
+
+            Raises
+                TypeError: if allycode is passed. The guild is selected by guild_id only.
+        """
+        self._reject_allycode(kwargs, 'fetch_guild_async')
         validated_guild_id = self._verify_guild_id(guild_id)
-        enums = kwargs.setdefault('enums', False)
+        kwargs.setdefault('enums', False)
         guild = await self.fetch_data_async(
                 endpoint=EndPoint.GUILD,
                 payload={"payload": {"guildId": validated_guild_id}},
-                enums=enums
+                **kwargs
                 )
 
         if isinstance(guild, dict) and 'events' in guild and 'guild' in guild['events']:
-            return guild['events']['guild']
-        return guild
+            guild = guild['events']['guild']
+        return Guild.from_dict(guild) if model else guild
 
     async def fetch_squad_presets_async(self, **kwargs) -> dict[Any, Any]:
         """Return data from the SQUADPRESETS endpoint"""
@@ -325,3 +510,152 @@ class API(MBot):
         """Return data from the CONQUEST endpoint"""
         kwargs.setdefault('enums', False)
         return await self.fetch_data_async(EndPoint.CONQUEST, **kwargs)
+
+    async def _aiter_items(
+            self,
+            endpoint: EndPoint | str,
+            path: Sequence[str],
+            *,
+            hmac: bool | None = None,
+            payload: dict[str, Any] | None = None,
+            enums: bool = False,
+            allycode: str | None = None
+            ) -> AsyncGenerator[Any, None]:
+        """Async version of _iter_items()"""
+        endpoint = self._resolve_endpoint(endpoint)
+        is_hmac_signed = hmac if hmac is not None else self.hmac
+        payload = self._build_payload(payload, enums, allycode)
+
+        async with self._astream("POST", endpoint, payload, hmac=is_hmac_signed) as result:
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"HTTP stream opened - Status: {result.status_code}")
+            if result.status_code != 200:
+                raise RuntimeError(f"Unexpected result: {(await result.aread()).decode()}")
+            async for item in aiter_json_array(result.aiter_bytes(), path):
+                yield item
+
+    def fetch_twlogs_iter_async(self, *, path: Sequence[str] | None = None,
+                                **kwargs) -> AsyncGenerator[dict[Any, Any], None]:
+        """Async version of fetch_twlogs_iter(), for use with ``async for``"""
+        return self._aiter_items(EndPoint.TWLOGS, path or self.twlogs_path, **kwargs)
+
+    def fetch_tblogs_iter_async(self, *, path: Sequence[str] | None = None,
+                                **kwargs) -> AsyncGenerator[dict[Any, Any], None]:
+        """Async version of fetch_tblogs_iter(), for use with ``async for``"""
+        return self._aiter_items(EndPoint.TBLOGS, path or self.tblogs_path, **kwargs)
+
+    def fetch_guild_members_iter_async(self, guild_id: str, *, path: Sequence[str] | None = None,
+                                       **kwargs) -> AsyncGenerator[dict[Any, Any], None]:
+        """Async version of fetch_guild_members_iter(), for use with ``async for``"""
+        self._reject_allycode(kwargs, 'fetch_guild_members_iter_async')
+        validated_guild_id = self._verify_guild_id(guild_id)
+        return self._aiter_items(EndPoint.GUILD, path or self.guild_members_path,
+                                 payload={"payload": {"guildId": validated_guild_id}}, **kwargs)
+
+    # Log following
+    def follow_twlogs(self, *, cursor: LogCursor | None = None, interval: float = 60.0, **kwargs) -> LogFollower:
+        """Return an async iterator yielding only TWLOGS entries that were not seen in earlier polls
+
+            Keyword Args
+                cursor: Starting LogCursor, e.g. one restored with LogCursor.load(). Default: start of the log
+                interval: Seconds to wait between polls, Default: 60.0
+                **kwargs: cursor_path and newest_first as accepted by LogFollower, plus path, hmac, payload and enums
+                          as accepted by fetch_twlogs_iter_async()
+        """
+        return LogFollower(self.fetch_twlogs_iter_async, cursor=cursor, interval=interval, **kwargs)
+
+    def follow_tblogs(self, *, cursor: LogCursor | None = None, interval: float = 60.0, **kwargs) -> LogFollower:
+        """Return an async iterator yielding only TBLOGS entries that were not seen in earlier polls
+
+            Keyword Args
+                See follow_twlogs()
+        """
+        return LogFollower(self.fetch_tblogs_iter_async, cursor=cursor, interval=interval, **kwargs)
+
+    # Batch methods
+    async def fetch_players_many(
+            self,
+            allycodes: Iterable[str],
+            *,
+            concurrency: int = 10,
+            **kwargs
+            ) -> AsyncIterator[BatchResult]:
+        """Fetch PLAYER data for many allycodes concurrently, yielding results as they complete
+
+            Args
+                allycodes: Iterable of player allycodes as strings
+
+            Keyword Args
+                concurrency: Maximum number of requests in flight at once, Default: 10
+                **kwargs: Additional keyword arguments forwarded to fetch_player_async()
+
+            Yields
+                BatchResult with the allycode as ``key``. Failed requests are reported via ``BatchResult.error``
+                without aborting the rest of the batch.
+        """
+        async def _fetch(allycode: str) -> dict[Any, Any] | Player:
+            return await self.fetch_player_async(allycode, **kwargs)
+
+        async for result in run_batch_async(_fetch, allycodes, concurrency=concurrency):
+            yield result
+
+    async def fetch_guilds_many(
+            self,
+            guild_ids: Iterable[str],
+            *,
+            concurrency: int = 10,
+            **kwargs
+            ) -> AsyncIterator[BatchResult]:
+        """Fetch GUILD data for many guild IDs concurrently, yielding results as they complete
+
+            Args
+                guild_ids: Iterable of guild IDs as strings
+
+            Keyword Args
+                concurrency: Maximum number of requests in flight at once, Default: 10
+                **kwargs: Additional keyword arguments forwarded to fetch_guild_async()
+
+            Yields
+                BatchResult with the guild ID as ``key``. Failed requests are reported via ``BatchResult.error``
+                without aborting the rest of the batch.
+        """
+        async def _fetch(guild_id: str) -> dict[Any, Any] | Guild:
+            return await self.fetch_guild_async(guild_id, **kwargs)
+
+        async for result in run_batch_async(_fetch, guild_ids, concurrency=concurrency):
+            yield result
+
+    def fetch_many_threaded(
+            self,
+            func: Callable[..., Any] | str,
+            keys: Iterable[Any],
+            *,
+            max_workers: int = 10,
+            **kwargs
+            ) -> Iterator[BatchResult]:
+        """Call a sync fetch method for many keys on a bounded thread pool, yielding results as they complete
+
+            Args
+                func: Sync fetch method (or its name), called as ``func(key, **kwargs)``, e.g. ``api.fetch_player``
+                      or ``'fetch_guild'``
+                keys: Iterable of keys (allycodes, guild IDs, endpoints, ...). Consumed lazily.
+
+            Keyword Args
+                max_workers: Maximum number of worker threads and requests in flight, Default: 10
+                **kwargs: Additional keyword arguments forwarded to every call
+
+            Yields
+                BatchResult for each key in completion order. Failed requests are reported via ``BatchResult.error``
+                without aborting the rest of the batch.
+
+            Notes
+                All threads share this instance's httpx.Client, so the pool ``limits`` should allow at least
+                ``max_workers`` connections (the httpx default is 100) to get parallel throughput.
+        """
+        if isinstance(func, str):
+            func = getattr(self, func)
+
+        def _fetch(key: Any) -> Any:
+            return func(key, **kwargs)
+
+        yield from run_batch_threaded(_fetch, keys, max_workers=max_workers)
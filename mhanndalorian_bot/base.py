@@ -4,18 +4,25 @@ Base class definition for core object for storing and sharing information for us
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import hmac as _hmac
 import logging
+import threading
 import time
-from json import dumps
-from typing import Any
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncGenerator, Generator, Mapping
 
 import httpx
 from sentinels import Sentinel
 
 from mhanndalorian_bot.attrs import APIKey, AllyCode, EndPoint
-from mhanndalorian_bot.utils import func_debug_logger, func_timer
+from mhanndalorian_bot.metrics import DecodeEvent, MetricsCollector, RequestEvent
+from mhanndalorian_bot.ratelimit import RateLimiter
+from mhanndalorian_bot.retry import RetryPolicy
+from mhanndalorian_bot.serializers import Serializer, get_serializer
+from mhanndalorian_bot.signing import Signer
+from mhanndalorian_bot.utils import endpoint_name, func_debug_logger, func_timer
 
 NotSet = Sentinel('NotSet')
 
@@ -47,6 +54,31 @@ class MBot:
         verify: TLS verification setting forwarded to httpx clients. True (default) uses the system trust
                 store; pass a path to a CA bundle for custom certs, or False to disable verification
                 (NOT recommended).
+        timeout: Request timeout in seconds or an httpx.Timeout instance, Default: 75
+        limits: Optional httpx.Limits controlling the connection pool (max connections, keep-alive), defaults to
+                the httpx defaults.
+        http2: Boolean flag enabling HTTP/2 for the instance clients. Requires the `h2` package
+               (``pip install mhanndalorian-bot[http2]``), Default: False
+        client: Optional pre-built httpx.Client to use instead of creating one. Useful for sharing a single
+                connection pool between several instances. Clients passed in are not closed by close().
+        aclient: Optional pre-built httpx.AsyncClient, see `client`.
+        retry: Optional RetryPolicy applied to every request. Default: None (no retries)
+        rate_limit: Optional RateLimiter acquired before every request attempt (sync and async). Share one limiter
+                    between instances to pace all requests made with the same API key.
+        endpoint_limits: Optional mapping of EndPoint (or endpoint name) to a RateLimiter acquired in addition to
+                         `rate_limit` for requests to that endpoint.
+        serializer: Serializer instance or name ('auto', 'json', 'orjson', 'msgspec') used to encode payloads and
+                    decode responses. 'auto' (default) uses orjson or msgspec when installed, else the stdlib.
+        metrics: Optional MetricsCollector receiving an event for every request attempt and decoded response,
+                 e.g. InMemoryMetrics, PrometheusMetrics or OpenTelemetryMetrics. Default: None (no measurement)
+
+    Notes
+        Each instance owns its own headers, payload and HTTP clients. Clients are created lazily on first use, so
+        instances that only use the sync (or async) methods never open the other connection pool.
+
+        The sync methods are thread-safe: one instance (and its connection pool) may be shared by many worker
+        threads. Request headers, signatures and bodies are built per call, the set_* methods replace the
+        instance headers / payload rather than editing them in place, and lazy client creation is locked.
     """
 
     api_host: str = "https://mhanndalorianbot.work"
@@ -57,15 +89,33 @@ class MBot:
     api_key = APIKey()
     allycode = AllyCode()
 
-    headers = {"Content-Type": "application/json"}
-    payload = {"payload": {"allyCode": ""}}
-
-    client: httpx.Client = httpx.Client(base_url=f"{api_host}", timeout=75)
-    aclient: httpx.AsyncClient = httpx.AsyncClient(base_url=f"{api_host}", timeout=75)
-
     def __init__(self, api_key: str, allycode: str, discord_id: str | None = None, *,
                  api_host: str | None = None, hmac: bool | None = True, debug: bool | None = False,
-                 verify: bool | str = True):
+                 verify: bool | str = True, timeout: float | httpx.Timeout = 75, limits: httpx.Limits | None = None,
+                 http2: bool = False, client: httpx.Client | None = None, aclient: httpx.AsyncClient | None = None,
+                 retry: RetryPolicy | None = None, rate_limit: RateLimiter | None = None,
+                 endpoint_limits: Mapping[EndPoint | str, RateLimiter] | None = None,
+                 serializer: Serializer | str = "auto", metrics: MetricsCollector | None = None):
+
+        self.headers: dict[str, str] = {"Content-Type": "application/json"}
+        self.payload: dict[str, Any] = {"payload": {"allyCode": ""}}
+
+        self._verify = verify
+        self._timeout = timeout
+        self._limits = limits
+        self._http2 = http2
+        self._client = client
+        self._aclient = aclient
+        self._owns_client = client is None
+        self._owns_aclient = aclient is None
+        self._client_lock = threading.Lock()
+        self._signer: Signer | None = None
+        self.serializer = serializer if isinstance(serializer, Serializer) else get_serializer(serializer)
+        self.retry = retry
+        self.rate_limit = rate_limit
+        self.metrics = metrics
+        self.endpoint_limits: dict[str, RateLimiter] = {endpoint_name(ep): limiter
+                                                        for ep, limiter in (endpoint_limits or {}).items()}
 
         self.set_api_key(api_key)
         self.set_allycode(allycode)
@@ -82,9 +132,6 @@ class MBot:
         if isinstance(hmac, bool):
             self.hmac = hmac
 
-        if verify is not True:
-            self.set_verify(verify)
-
     def __enter__(self) -> "MBot":
         return self
 
@@ -97,13 +144,62 @@ class MBot:
     async def __aexit__(self, exc_type, exc, tb) -> None:
         await self.aclose()
 
+    def _client_options(self) -> dict[str, Any]:
+        """Return the keyword arguments used to construct the instance HTTP clients"""
+        options: dict[str, Any] = dict(base_url=self.api_host, timeout=self._timeout, verify=self._verify,
+                                       http2=self._http2)
+        if self._limits is not None:
+            options['limits'] = self._limits
+        return options
+
+    @property
+    def client(self) -> httpx.Client:
+        """Synchronous HTTP client for this instance, created on first use"""
+        client = self._client
+        if client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = httpx.Client(**self._client_options())
+                    self._owns_client = True
+                client = self._client
+        return client
+
+    @client.setter
+    def client(self, client: httpx.Client) -> None:
+        self._client = client
+        self._owns_client = False
+
+    @property
+    def aclient(self) -> httpx.AsyncClient:
+        """Asynchronous HTTP client for this instance, created on first use"""
+        aclient = self._aclient
+        if aclient is None:
+            with self._client_lock:
+                if self._aclient is None:
+                    self._aclient = httpx.AsyncClient(**self._client_options())
+                    self._owns_aclient = True
+                aclient = self._aclient
+        return aclient
+
+    @aclient.setter
+    def aclient(self, aclient: httpx.AsyncClient) -> None:
+        self._aclient = aclient
+        self._owns_aclient = False
+
     def close(self) -> None:
-        """Close the synchronous HTTP client."""
-        self.client.close()
+        """Close the synchronous HTTP client if it was created by this instance."""
+        with self._client_lock:
+            client, owned = self._client, self._owns_client
+            if client is not None and owned:
+                self._client = None
+        if client is not None and owned:
+            client.close()
 
     async def aclose(self) -> None:
-        """Close the asynchronous HTTP client."""
-        await self.aclient.aclose()
+        """Close the asynchronous HTTP client if it was created by this instance."""
+        if self._aclient is not None and self._owns_aclient:
+            await self._aclient.aclose()
+            self._aclient = None
 
     @staticmethod
     def human_time(unix_time: int | float) -> str:
@@ -169,9 +265,7 @@ class MBot:
 
         setattr(self, "api_key", api_key)
 
-        self.headers["api-key"] = self.api_key
-        self.client.headers = self.headers
-        self.aclient.headers = self.headers
+        self.headers = {**self.headers, "api-key": self.api_key}
 
     @func_debug_logger
     def set_allycode(self, allycode: str) -> None:
@@ -181,7 +275,7 @@ class MBot:
 
         setattr(self, "allycode", allycode)
 
-        self.payload["payload"]["allyCode"] = allycode
+        self.payload = {**self.payload, "payload": {**self.payload.get("payload", {}), "allyCode": allycode}}
 
     @func_debug_logger
     def set_discord_id(self, discord_id: str) -> None:
@@ -189,7 +283,7 @@ class MBot:
 
         discord_id = self.cleanse_discord_id(discord_id)
 
-        self.headers['x-discord-id'] = discord_id
+        self.headers = {**self.headers, 'x-discord-id': discord_id}
 
     @func_debug_logger
     def set_api_host(self, api_host: str) -> None:
@@ -200,27 +294,31 @@ class MBot:
 
         setattr(self, "api_host", api_host)
 
-        self.client.base_url = f"{api_host}"
-        self.aclient.base_url = f"{api_host}"
+        if self._client is not None:
+            self._client.base_url = f"{api_host}"
+        if self._aclient is not None:
+            self._aclient.base_url = f"{api_host}"
 
     def set_verify(self, verify: bool | str) -> None:
-        """Rebuild the HTTP clients with the specified TLS verification setting.
+        """Apply a new TLS verification setting to the instance HTTP clients.
 
         Args:
             verify: True (default) uses the system trust store, False disables verification
                     (NOT recommended), or a string path to a CA bundle for custom certs.
 
         Note:
-            The previous async client is closed best-effort; if called while async requests
-            are in flight, call ``aclose()`` first.
+            Clients owned by this instance are discarded and lazily rebuilt with the new setting; clients passed
+            in by the caller are left open and replaced. The previous async client is not awaited for closing;
+            if called while async requests are in flight, call ``aclose()`` first.
         """
-        base_url = self.client.base_url
-        timeout = self.client.timeout
-        headers = dict(self.client.headers)
+        self._verify = verify
 
-        self.client.close()
-        self.client = httpx.Client(base_url=base_url, timeout=timeout, verify=verify, headers=headers)
-        self.aclient = httpx.AsyncClient(base_url=base_url, timeout=timeout, verify=verify, headers=headers)
+        self.close()
+        with self._client_lock:
+            self._client = None
+            self._aclient = None
+            self._owns_client = True
+            self._owns_aclient = True
 
     @func_debug_logger
     def set_client(self, **kwargs: Any) -> None:
@@ -230,36 +328,40 @@ class MBot:
 
     @func_timer
     @func_debug_logger
-    def sign(self, method: str, endpoint: str | EndPoint, payload: dict[str, Any] | Sentinel = NotSet, *,
-             timestamp: str | None = None, api_key: str | None = None) -> None:
-        """Create HMAC signature for request
+    def sign(self, method: str, endpoint: str | EndPoint, payload: dict[str, Any] | bytes | Sentinel = NotSet, *,
+             timestamp: str | None = None, api_key: str | None = None) -> dict[str, str]:
+        """Create HMAC signature headers for a request
 
             Args
                 method: HTTP method as a string
                 endpoint: API endpoint path as a string or EndPoint enum instance
-                payload: Dictionary containing API endpoint payload data.
-                         This will be converted to a JSON string and hashed.
-                         If no payload is provided, a default containing the currently set allyCode will be used.
+                payload: Dictionary containing API endpoint payload data, or the already encoded request body.
+                         Dictionaries are encoded with the instance serializer before hashing, so the hash matches
+                         the body sent by fetch_data(). If no payload is provided, a default containing the
+                         currently set allyCode will be used.
 
             Keyword Args
                 timestamp: Optional timestamp string to use instead of generating a new one. (primarily for testing)
                 api_key: Optional API key to use instead of the one set in the container class. (primarily for testing)
+
+            Returns
+                Dictionary containing the `x-timestamp` and `Authorization` headers for this request only. Neither
+                the instance headers nor the HTTP client headers are modified, so concurrent requests can be
+                signed independently.
+
+            Notes
+                Requests sent by the library are signed with the equivalent, precomputed Signer instead. This method
+                logs every intermediate digest at DEBUG level and is meant for testing and troubleshooting.
         """
         debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
 
-        if 'api-key' in self.headers:
-            del self.headers['api-key']
-            if debug_enabled:
-                self.logger.debug("'api-key' header removed")
-
         if timestamp:
             req_time = timestamp
         else:
             req_time = str(int(time.time() * 1000))
 
-        self.headers['x-timestamp'] = req_time
         if debug_enabled:
-            self.logger.debug(f"'x-timestamp' header set to {self.headers['x-timestamp']}")
+            self.logger.debug(f"'x-timestamp' header set to {req_time}")
 
         if api_key:
             if debug_enabled:
@@ -288,11 +390,11 @@ class MBot:
             self.logger.debug(f"HMAC Hexdigest (endpoint): {hmac_obj.hexdigest()}")
 
         payload = self.payload if payload is NotSet else payload
-        payload_str = dumps(payload, separators=(',', ':'))
+        body = payload if isinstance(payload, bytes) else self.serializer.dumps(payload)
         if debug_enabled:
-            self.logger.debug(f"Payload string: {payload_str}")
+            self.logger.debug(f"Payload string: {body.decode()}")
 
-        payload_hash_digest = hashlib.md5(payload_str.encode()).hexdigest()
+        payload_hash_digest = hashlib.md5(body).hexdigest()
         if debug_enabled:
             self.logger.debug(f"Payload hash digest: {payload_hash_digest}")
 
@@ -300,10 +402,237 @@ class MBot:
         if debug_enabled:
             self.logger.debug(f"HMAC Hexdigest (payload): {hmac_obj.hexdigest()}")
 
-        self.headers['Authorization'] = hmac_obj.hexdigest()
-        self.client.headers = self.headers
-        self.aclient.headers = self.headers
+        signature_headers = {'x-timestamp': req_time, 'Authorization': hmac_obj.hexdigest()}
         if debug_enabled:
-            self.logger.debug(
-                f"HTTP client headers updated with HMAC signature: {_redact_headers(self.client.headers)}"
-            )
+            self.logger.debug(f"HMAC signature headers created: {_redact_headers(signature_headers)}")
+        return signature_headers
+
+    def _request_headers(self, method: str, endpoint: str, body: bytes, hmac: bool) -> dict[str, str]:
+        """Build the full header set for a single request without mutating shared state
+
+        HMAC signed requests replace the `api-key` header with the `x-timestamp` / `Authorization` signature pair.
+        The signature comes from the instance Signer (same result as sign(), without its per-call overhead),
+        which is rebuilt whenever the API key changes.
+        """
+        headers = dict(self.headers)
+        if hmac:
+            headers.pop('api-key', None)
+            signer = self._signer
+            if signer is None or signer.api_key != self.api_key:
+                signer = self._signer = Signer(self.api_key)
+            headers.update(signer.headers(method, endpoint, body))
+        return headers
+
+    def _next_retry_delay(self, attempt: int, endpoint: str, *, response: httpx.Response | None = None,
+                          error: Exception | None = None) -> float | None:
+        """Return the delay before retrying a failed attempt according to the instance RetryPolicy, or None"""
+        if self.retry is None:
+            return None
+        delay = self.retry.next_delay(attempt, response=response, error=error)
+        if delay is not None:
+            reason = f"status {response.status_code}" if response is not None else repr(error)
+            self.logger.warning(f"Request to {endpoint} failed ({reason}), retrying in {delay:.2f}s "
+                                f"(attempt {attempt + 1}/{self.retry.max_attempts})")
+        return delay
+
+    def _decode(self, response: httpx.Response) -> Any:
+        """Decode a JSON response body with the instance serializer"""
+        if self.metrics is None:
+            return self.serializer.loads(response.content)
+        started = time.perf_counter()
+        data = self.serializer.loads(response.content)
+        self._emit(self.metrics.on_decode, DecodeEvent(endpoint_name(response.request.url.path),
+                                                       time.perf_counter() - started, len(response.content)))
+        return data
+
+    def _emit(self, hook: Any, event: Any) -> None:
+        """Pass an event to a metrics hook, logging rather than raising any error it raises"""
+        try:
+            hook(event)
+        except Exception:
+            self.logger.exception(f"Metrics hook {getattr(hook, '__qualname__', hook)!r} failed")
+
+    def _record_request(self, metrics: MetricsCollector, method: str, endpoint: str, body: bytes, attempt: int,
+                        started: float, signed: float, *, response: httpx.Response | None = None,
+                        error: Exception | None = None, retried: bool = False, streamed: bool = False) -> None:
+        """Report one request attempt to the metrics collector. started / signed are perf_counter() values.
+
+        For streamed responses bytes_in counts the body bytes read so far instead of the (unread) content.
+        """
+        finished = time.perf_counter()
+        if response is None:
+            bytes_in = 0
+        else:
+            bytes_in = response.num_bytes_downloaded if streamed else len(response.content)
+        event = RequestEvent(endpoint_name(endpoint), method, response.status_code if response is not None else None,
+                             type(error).__name__ if error is not None else None, attempt, retried,
+                             finished - signed, signed - started, len(body), bytes_in)
+        self._emit(metrics.on_request, event)
+
+    def _limiters(self, endpoint: str) -> list[RateLimiter]:
+        """Return the rate limiters that apply to a request for the given endpoint"""
+        limiters = [self.rate_limit] if self.rate_limit is not None else []
+        if self.endpoint_limits:
+            limiter = self.endpoint_limits.get(endpoint_name(endpoint))
+            if limiter is not None:
+                limiters.append(limiter)
+        return limiters
+
+    def _send(self, method: str, endpoint: str, payload: dict[str, Any], *, hmac: bool) -> httpx.Response:
+        """Send a request using the synchronous client with per-request (optionally signed) headers
+
+        Failed attempts are retried according to the instance RetryPolicy, re-signing each attempt.
+        """
+        body = self.serializer.dumps(payload)
+        limiters = self._limiters(endpoint)
+        metrics = self.metrics
+        attempt = 1
+        while True:
+            for limiter in limiters:
+                limiter.acquire()
+            started = time.perf_counter() if metrics is not None else 0.0
+            headers = self._request_headers(method, endpoint, body, hmac)
+            signed = time.perf_counter() if metrics is not None else 0.0
+            try:
+                response = self.client.request(method, endpoint, content=body, headers=headers)
+            except httpx.TransportError as exc:
+                delay = self._next_retry_delay(attempt, endpoint, error=exc)
+                if metrics is not None:
+                    self._record_request(metrics, method, endpoint, body, attempt, started, signed, error=exc,
+                                         retried=delay is not None)
+                if delay is None:
+                    raise
+            else:
+                delay = self._next_retry_delay(attempt, endpoint, response=response)
+                if metrics is not None:
+                    self._record_request(metrics, method, endpoint, body, attempt, started, signed, response=response,
+                                         retried=delay is not None)
+                if delay is None:
+                    return response
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    async def _asend(self, method: str, endpoint: str, payload: dict[str, Any], *, hmac: bool) -> httpx.Response:
+        """Send a request using the asynchronous client with per-request (optionally signed) headers
+
+        Failed attempts are retried according to the instance RetryPolicy, re-signing each attempt.
+        """
+        body = self.serializer.dumps(payload)
+        limiters = self._limiters(endpoint)
+        metrics = self.metrics
+        attempt = 1
+        while True:
+            for limiter in limiters:
+                await limiter.acquire_async()
+            started = time.perf_counter() if metrics is not None else 0.0
+            headers = self._request_headers(method, endpoint, body, hmac)
+            signed = time.perf_counter() if metrics is not None else 0.0
+            try:
+                response = await self.aclient.request(method, endpoint, content=body, headers=headers)
+            except httpx.TransportError as exc:
+                delay = self._next_retry_delay(attempt, endpoint, error=exc)
+                if metrics is not None:
+                    self._record_request(metrics, method, endpoint, body, attempt, started, signed, error=exc,
+                                         retried=delay is not None)
+                if delay is None:
+                    raise
+            else:
+                delay = self._next_retry_delay(attempt, endpoint, response=response)
+                if metrics is not None:
+                    self._record_request(metrics, method, endpoint, body, attempt, started, signed, response=response,
+                                         retried=delay is not None)
+                if delay is None:
+                    return response
+                await response.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @contextmanager
+    def _stream(self, method: str, endpoint: str, payload: dict[str, Any], *,
+                hmac: bool) -> Generator[httpx.Response, None, None]:
+        """Open a streaming request using the synchronous client. The body is read incrementally by the caller.
+
+        Opening the stream is retried according to the instance RetryPolicy, based on the response status and
+        headers. Once the body is being read, failures are not retried. The metrics event of the final attempt is
+        emitted when the stream is closed, so its latency and bytes_in cover the body read by the caller.
+        """
+        body = self.serializer.dumps(payload)
+        limiters = self._limiters(endpoint)
+        metrics = self.metrics
+        attempt = 1
+        while True:
+            for limiter in limiters:
+                limiter.acquire()
+            started = time.perf_counter() if metrics is not None else 0.0
+            headers = self._request_headers(method, endpoint, body, hmac)
+            signed = time.perf_counter() if metrics is not None else 0.0
+            request = self.client.build_request(method, endpoint, content=body, headers=headers)
+            try:
+                response = self.client.send(request, stream=True)
+            except httpx.TransportError as exc:
+                delay = self._next_retry_delay(attempt, endpoint, error=exc)
+                if metrics is not None:
+                    self._record_request(metrics, method, endpoint, body, attempt, started, signed, error=exc,
+                                         retried=delay is not None)
+                if delay is None:
+                    raise
+            else:
+                delay = self._next_retry_delay(attempt, endpoint, response=response)
+                if delay is None:
+                    break
+                response.close()
+                if metrics is not None:
+                    self._record_request(metrics, method, endpoint, body, attempt, started, signed, response=response,
+                                         retried=True, streamed=True)
+            time.sleep(delay)
+            attempt += 1
+        try:
+            yield response
+        finally:
+            response.close()
+            if metrics is not None:
+                self._record_request(metrics, method, endpoint, body, attempt, started, signed, response=response,
+                                     streamed=True)
+
+    @asynccontextmanager
+    async def _astream(self, method: str, endpoint: str, payload: dict[str, Any], *,
+                       hmac: bool) -> AsyncGenerator[httpx.Response, None]:
+        """Open a streaming request using the asynchronous client. Opening the stream is retried like _stream()."""
+        body = self.serializer.dumps(payload)
+        limiters = self._limiters(endpoint)
+        metrics = self.metrics
+        attempt = 1
+        while True:
+            for limiter in limiters:
+                await limiter.acquire_async()
+            started = time.perf_counter() if metrics is not None else 0.0
+            headers = self._request_headers(method, endpoint, body, hmac)
+            signed = time.perf_counter() if metrics is not None else 0.0
+            request = self.aclient.build_request(method, endpoint, content=body, headers=headers)
+            try:
+                response = await self.aclient.send(request, stream=True)
+            except httpx.TransportError as exc:
+                delay = self._next_retry_delay(attempt, endpoint, error=exc)
+                if metrics is not None:
+                    self._record_request(metrics, method, endpoint, body, attempt, started, signed, error=exc,
+                                         retried=delay is not None)
+                if delay is None:
+                    raise
+            else:
+                delay = self._next_retry_delay(attempt, endpoint, response=response)
+                if delay is None:
+                    break
+                await response.aclose()
+                if metrics is not None:
+                    self._record_request(metrics, method, endpoint, body, attempt, started, signed, response=response,
+                                         retried=True, streamed=True)
+            await asyncio.sleep(delay)
+            attempt += 1
+        try:
+            yield response
+        finally:
+            await response.aclose()
+            if metrics is not None:
+                self._record_request(metrics, method, endpoint, body, attempt, started, signed, response=response,
+                                     streamed=True)
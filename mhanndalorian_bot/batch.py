@@ -0,0 +1,149 @@
+"""
+Helpers for running many API requests concurrently
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator, NamedTuple
+
+__all__ = ["BatchResult", "run_batch_async", "run_batch_threaded"]
+
+
+class BatchResult(NamedTuple):
+    """Outcome of a single item in a batch request
+
+    Attributes
+        key: Identifier the request was made for (allycode, guild ID, ...)
+        data: Response data if the request succeeded, otherwise None
+        error: Exception raised while processing the item, otherwise None
+    """
+
+    key: Any
+    data: Any = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """True if the request for this item completed without raising"""
+        return self.error is None
+
+
+async def run_batch_async(
+        func: Callable[[Any], Awaitable[Any]],
+        keys: Iterable[Any],
+        *,
+        concurrency: int = 10
+        ) -> AsyncIterator[BatchResult]:
+    """Run ``func`` for every key with at most ``concurrency`` calls in flight, yielding results as they complete
+
+        Args
+            func: Coroutine function called with a single key
+            keys: Iterable of keys. Consumed lazily, so generators of any length are supported.
+
+        Keyword Args
+            concurrency: Maximum number of calls awaiting completion at any time, Default: 10
+
+        Yields
+            BatchResult for each key in completion order. An exception raised by ``func`` is reported
+            in ``BatchResult.error`` and does not stop the remaining items.
+
+        Notes
+            If the consumer stops iterating early, in-flight calls are cancelled.
+    """
+    if not isinstance(concurrency, int) or concurrency < 1:
+        raise ValueError("concurrency must be a positive integer")
+
+    key_iter = iter(keys)
+    pending: dict[asyncio.Future, Any] = {}
+
+    def _fill() -> None:
+        while len(pending) < concurrency:
+            try:
+                key = next(key_iter)
+            except StopIteration:
+                return
+            pending[asyncio.ensure_future(func(key))] = key
+
+    try:
+        _fill()
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            results: list[BatchResult] = []
+            for task in done:
+                key = pending.pop(task)
+                exc = task.exception()
+                if exc is None:
+                    results.append(BatchResult(key, task.result()))
+                elif isinstance(exc, Exception):
+                    results.append(BatchResult(key, error=exc))
+                else:
+                    raise exc
+            # Top up before handing results to the consumer so the pipeline stays full
+            _fill()
+            for result in results:
+                yield result
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+def run_batch_threaded(
+        func: Callable[[Any], Any],
+        keys: Iterable[Any],
+        *,
+        max_workers: int = 10
+        ) -> Iterator[BatchResult]:
+    """Run ``func`` for every key on a pool of at most ``max_workers`` threads, yielding results as they complete
+
+        Args
+            func: Callable called with a single key
+            keys: Iterable of keys. Consumed lazily, so generators of any length are supported.
+
+        Keyword Args
+            max_workers: Maximum number of threads (and calls in flight), Default: 10
+
+        Yields
+            BatchResult for each key in completion order. An exception raised by ``func`` is reported
+            in ``BatchResult.error`` and does not stop the remaining items.
+
+        Notes
+            If the consumer stops iterating early, queued calls are cancelled and calls already running are
+            allowed to finish before the generator closes.
+    """
+    if not isinstance(max_workers, int) or max_workers < 1:
+        raise ValueError("max_workers must be a positive integer")
+
+    key_iter = iter(keys)
+    pending: dict[Future, Any] = {}
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def _fill() -> None:
+        while len(pending) < max_workers:
+            try:
+                key = next(key_iter)
+            except StopIteration:
+                return
+            pending[executor.submit(func, key)] = key
+
+    try:
+        _fill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            results: list[BatchResult] = []
+            for future in done:
+                key = pending.pop(future)
+                exc = future.exception()
+                if exc is None:
+                    results.append(BatchResult(key, future.result()))
+                elif isinstance(exc, Exception):
+                    results.append(BatchResult(key, error=exc))
+                else:
+                    raise exc
+            _fill()
+            yield from results
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,486 @@
+"""
+Response cache with per-endpoint TTLs, pluggable storage backends and single-flight request coalescing
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from json import dumps, loads
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Mapping, NamedTuple, TypeVar
+
+from mhanndalorian_bot.attrs import EndPoint
+from mhanndalorian_bot.utils import endpoint_name
+
+__all__ = ["CacheBackend", "CacheStats", "DEFAULT_TTLS", "IdentityCache", "MemoryCacheBackend", "ResponseCache",
+           "SQLiteCacheBackend"]
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Default per-endpoint TTLs (seconds) used by ResponseCache. Live event data changes within seconds, while player and
+# guild profiles change rarely; other endpoints use ResponseCache.ttl.
+DEFAULT_TTLS: dict[str, float] = {
+    EndPoint.TW.value: 15.0,
+    EndPoint.TWLOGS.value: 15.0,
+    EndPoint.TB.value: 15.0,
+    EndPoint.TBLOGS.value: 15.0,
+    EndPoint.RAID.value: 15.0,
+    EndPoint.PLAYER.value: 300.0,
+    EndPoint.GUILD.value: 300.0,
+    EndPoint.TBHISTORY.value: 3600.0,
+}
+
+
+class CacheStats(NamedTuple):
+    """Snapshot of ResponseCache counters
+
+    Attributes
+        hits: Lookups served from a fresh cache entry
+        misses: Lookups that resulted in a request being sent
+        coalesced: Lookups that waited for an identical request already in flight instead of sending their own
+        size: Number of entries currently stored
+    """
+
+    hits: int
+    misses: int
+    coalesced: int
+    size: int
+
+
+class _Call:
+    """In-flight synchronous fetch shared by all threads requesting the same key"""
+
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class CacheBackend(ABC):
+    """Storage interface used by ResponseCache
+
+    Implementations must be safe to call from multiple threads. Missing or expired keys are reported as None.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        """Return the fresh value stored for key, or None"""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store value under key for ttl seconds"""
+
+    @abstractmethod
+    def delete_prefix(self, prefix: str) -> None:
+        """Remove every entry whose key starts with prefix. An empty prefix removes everything."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Return the number of stored entries"""
+
+    def close(self) -> None:
+        """Release any resources held by the backend"""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU backend
+
+    Args
+        max_entries: Maximum number of entries kept before the least recently used entry is evicted, Default: 1024
+        clock: Monotonic time source, primarily for testing. Default: time.monotonic
+    """
+
+    def __init__(self, max_entries: int = 1024, *, clock: Callable[[], float] = time.monotonic):
+        if max_entries < 1:
+            raise ValueError("max_entries must be a positive integer")
+
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self.clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (self.clock() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            if not prefix:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """File based backend storing zlib compressed JSON response bodies in a SQLite database
+
+    Entries survive process restarts, and several worker processes on one host can share the same database file.
+
+    Args
+        path: Path of the SQLite database file. Parent directories are created if needed.
+
+    Keyword Args
+        compress_level: zlib compression level (0-9) for stored bodies, Default: 6
+        timeout: Seconds to wait for a lock held by another process before failing, Default: 5.0
+        clock: Wall-clock time source shared by all processes, primarily for testing. Default: time.time
+
+    Notes
+        Values must be JSON serializable. Expired rows are removed lazily on lookup or explicitly via
+        purge_expired(). Disk I/O is performed synchronously, including from fetch_data_async().
+    """
+
+    def __init__(self, path: str | Path, *, compress_level: int = 6, timeout: float = 5.0,
+                 clock: Callable[[], float] = time.time):
+        self.path = Path(path)
+        self.compress_level = compress_level
+        self.timeout = timeout
+        self.clock = clock
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses "
+                    "(key TEXT PRIMARY KEY, stored_at REAL NOT NULL, expires_at REAL NOT NULL, body BLOB NOT NULL)"
+                    )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the connection owned by the calling thread, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, key: str) -> Any:
+        conn = self._connection()
+        row = conn.execute("SELECT expires_at, body FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        expires_at, body = row
+        if expires_at <= self.clock():
+            with conn:
+                conn.execute("DELETE FROM responses WHERE key = ? AND expires_at = ?", (key, expires_at))
+            return None
+        return loads(zlib.decompress(body))
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        now = self.clock()
+        body = zlib.compress(dumps(value, separators=(',', ':')).encode(), self.compress_level)
+        conn = self._connection()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO responses (key, stored_at, expires_at, body) VALUES (?, ?, ?, ?)",
+                         (key, now, now + ttl, body))
+
+    def delete_prefix(self, prefix: str) -> None:
+        conn = self._connection()
+        with conn:
+            if prefix:
+                conn.execute("DELETE FROM responses WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+            else:
+                conn.execute("DELETE FROM responses")
+
+    def stored_at(self, key: str) -> float | None:
+        """Return the wall-clock time the entry for key was stored, or None if it does not exist"""
+        row = self._connection().execute("SELECT stored_at FROM responses WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def purge_expired(self) -> int:
+        """Delete all expired rows and return the number removed"""
+        conn = self._connection()
+        with conn:
+            return conn.execute("DELETE FROM responses WHERE expires_at <= ?", (self.clock(),)).rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+class ResponseCache:
+    """Thread-safe TTL cache for decoded API responses
+
+    Keyword Args
+        ttl: Default time-to-live in seconds for endpoints without a TTL of their own, Default: 60
+        ttls: Optional mapping of EndPoint (or endpoint name) to a TTL in seconds, applied on top of DEFAULT_TTLS.
+              A TTL of 0 disables caching for that endpoint while still coalescing concurrent identical requests.
+        max_entries: Maximum number of responses kept by the default in-memory backend before the least recently
+                     used entry is evicted, Default: 1024
+        backend: Optional CacheBackend used for storage, e.g. SQLiteCacheBackend for a cache that survives restarts.
+                 Defaults to a MemoryCacheBackend.
+        clock: Monotonic time source for the default in-memory backend, primarily for testing.
+               Default: time.monotonic
+
+    Notes
+        Cached responses are returned by reference from the in-memory backend. Copy them before mutating if the
+        cache is shared. Keys built by API include a fingerprint of the api-key and x-discord-id credentials, so
+        instances with different credentials sharing one cache never see each other's responses.
+    """
+
+    def __init__(self, *, ttl: float = 60.0, ttls: Mapping[EndPoint | str, float] | None = None,
+                 max_entries: int = 1024, backend: CacheBackend | None = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.ttls: dict[str, float] = {**DEFAULT_TTLS,
+                                       **{endpoint_name(ep): value for ep, value in (ttls or {}).items()}}
+        self.backend = backend if backend is not None else MemoryCacheBackend(max_entries, clock=clock)
+
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+        self._tasks: dict[tuple[int, str], asyncio.Future] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self.backend)
+
+    @staticmethod
+    def credential_scope(api_key: str | None, discord_id: str | None) -> str:
+        """Return a short, stable fingerprint of the request credentials for use in make_key()"""
+        return hashlib.sha256(f"{api_key or ''}\0{discord_id or ''}".encode()).hexdigest()[:16]
+
+    @staticmethod
+    def make_key(endpoint: EndPoint | str, payload: dict[str, Any], scope: str = "") -> str:
+        """Return the cache key for an endpoint, credential scope and request payload (including the enums flag)"""
+        return f"{endpoint_name(endpoint)}|{scope}|{dumps(payload, sort_keys=True, separators=(',', ':'))}"
+
+    def ttl_for(self, endpoint: EndPoint | str) -> float:
+        """Return the TTL in seconds that applies to the provided endpoint"""
+        return self.ttls.get(endpoint_name(endpoint), self.ttl)
+
+    @property
+    def stats(self) -> CacheStats:
+        """Current hit/miss/coalesced counters and cache size"""
+        return CacheStats(self.hits, self.misses, self.coalesced, len(self.backend))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the fresh value stored for key, or default. Does not update the hit/miss counters."""
+        value = self.backend.get(key)
+        return default if value is None else value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store value under key for ttl seconds. Values with a TTL of 0 or less are not stored."""
+        if ttl > 0:
+            self.backend.set(key, value, ttl)
+
+    def invalidate(self, endpoint: EndPoint | str | None = None) -> None:
+        """Drop cached entries for a single endpoint, or every entry if no endpoint is given"""
+        self.backend.delete_prefix("" if endpoint is None else f"{endpoint_name(endpoint)}|")
+
+    clear = invalidate
+
+    def close(self) -> None:
+        """Close the storage backend"""
+        self.backend.close()
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], T], *, ttl: float) -> T:
+        """Return the cached value for key, calling fetch() on a miss
+
+        Concurrent callers (threads) requesting the same missing key wait for a single fetch() call.
+        Exceptions raised by fetch() are propagated to every waiting caller and are not cached.
+        """
+        value = self.backend.get(key)
+        with self._lock:
+            if value is not None:
+                self.hits += 1
+                return value
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fetch()
+            self.set(key, call.result, ttl)
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+    async def get_or_fetch_async(self, key: str, fetch: Callable[[], Awaitable[T]], *, ttl: float) -> T:
+        """Return the cached value for key, awaiting fetch() on a miss
+
+        Concurrent coroutines requesting the same missing key share a single fetch() task. The task is shielded,
+        so cancelling one waiter does not cancel the request for the others.
+        """
+        task_key = (id(asyncio.get_running_loop()), key)
+        value = self.backend.get(key)
+        with self._lock:
+            if value is not None:
+                self.hits += 1
+                return value
+            task = self._tasks.get(task_key)
+            if task is None:
+                self.misses += 1
+                task = self._tasks[task_key] = asyncio.ensure_future(self._run_fetch(task_key, fetch, ttl))
+                # Retrieve the exception if every waiter was cancelled, avoiding "never retrieved" warnings
+                task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            else:
+                self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    async def _run_fetch(self, task_key: tuple[int, str], fetch: Callable[[], Awaitable[T]], ttl: float) -> T:
+        """Await fetch(), store the result and release the in-flight slot"""
+        try:
+            result = await fetch()
+            self.set(task_key[1], result, ttl)
+            return result
+        finally:
+            with self._lock:
+                self._tasks.pop(task_key, None)
+
+
+class IdentityCache:
+    """Discord ID <-> allycode cache for Registry lookups
+
+    Registry records are stored under both their allycode and discord ID, together with the mapping between the two,
+    so repeated lookups of either identifier are answered locally until the TTL expires.
+
+    Keyword Args
+        ttl: Time-to-live in seconds for records and mappings, Default: 3600
+        max_entries: Maximum number of entries kept by the default in-memory backend, Default: 4096
+        backend: Optional CacheBackend used for storage. Pass a SQLiteCacheBackend to keep identities across
+                 restarts. Defaults to a MemoryCacheBackend.
+
+    Notes
+        A discord ID with several registered allycodes resolves to the primary one. The full list of records found
+        for a discord ID is kept separately (see get_records()). Registry invalidates the identifiers involved in
+        register_player() and verify_player() calls.
+    """
+
+    def __init__(self, *, ttl: float = 3600.0, max_entries: int = 4096, backend: CacheBackend | None = None):
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.ttl = ttl
+        self.backend = backend if backend is not None else MemoryCacheBackend(max_entries)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.backend)
+
+    @staticmethod
+    def _key(kind: str, identifier: str) -> str:
+        # Trailing separator so a 9 digit allycode is never a prefix of an 18 digit discord ID key
+        return f"{kind}|{identifier}|"
+
+    def get_record(self, identifier: str) -> dict[str, Any] | None:
+        """Return the cached registry record for an allycode or discord ID"""
+        return self.backend.get(self._key("record", identifier))
+
+    def get_records(self, discord_id: str) -> list[dict[str, Any]] | None:
+        """Return every cached registry record of a discord ID, as returned by the 'find' endpoint"""
+        return self.backend.get(self._key("records", discord_id))
+
+    def allycode_for(self, discord_id: str) -> str | None:
+        """Return the cached (primary) allycode of a discord ID"""
+        return self.backend.get(self._key("allycode", discord_id))
+
+    def discord_id_for(self, allycode: str) -> str | None:
+        """Return the cached discord ID of an allycode"""
+        return self.backend.get(self._key("discord", allycode))
+
+    def add_mapping(self, discord_id: str, allycode: str, *, primary: bool = True) -> None:
+        """Record that allycode belongs to discord_id. A non-primary allycode does not replace an existing mapping."""
+        with self._lock:
+            self.backend.set(self._key("discord", allycode), discord_id, self.ttl)
+            if primary or self.allycode_for(discord_id) is None:
+                self.backend.set(self._key("allycode", discord_id), allycode, self.ttl)
+
+    def add_record(self, record: Any) -> None:
+        """Cache a registry record returned by the 'find' endpoint. Records without an allyCode are ignored."""
+        if not isinstance(record, dict) or not record.get('allyCode'):
+            return
+        allycode = str(record['allyCode']).replace('-', '')
+        discord_id = str(record.get('discordId') or '')
+        with self._lock:
+            self.backend.set(self._key("record", allycode), record, self.ttl)
+            if discord_id:
+                primary = bool(record.get('primary')) or self.allycode_for(discord_id) in (None, allycode)
+                self.backend.set(self._key("discord", allycode), discord_id, self.ttl)
+                if primary:
+                    self.backend.set(self._key("allycode", discord_id), allycode, self.ttl)
+                    self.backend.set(self._key("record", discord_id), record, self.ttl)
+
+    def add_records(self, discord_id: str, records: list[Any]) -> None:
+        """Cache the full 'find' response for a discord ID, and each record in it"""
+        for record in records:
+            self.add_record(record)
+        with self._lock:
+            self.backend.set(self._key("records", discord_id), records, self.ttl)
+
+    def invalidate(self, *identifiers: str) -> None:
+        """Forget the given allycodes / discord IDs together with the identifiers mapped to them"""
+        with self._lock:
+            related = set(identifiers)
+            for identifier in identifiers:
+                related.update(filter(None, (self.allycode_for(identifier), self.discord_id_for(identifier))))
+            for identifier in related:
+                for kind in ("record", "records", "allycode", "discord"):
+                    self.backend.delete_prefix(self._key(kind, identifier))
+
+    def clear(self) -> None:
+        """Remove every cached identity"""
+        self.backend.delete_prefix("")
+
+    def close(self) -> None:
+        """Close the storage backend"""
+        self.backend.close()
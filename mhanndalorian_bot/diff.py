@@ -0,0 +1,176 @@
+"""
+Structural diffing of successive TW, TB and RAID response snapshots
+"""
+
+from __future__ import annotations
+
+from typing import Any, NamedTuple, Sequence
+
+__all__ = ["Change", "DEFAULT_ID_PATHS", "Snapshot", "SnapshotDiffer", "diff"]
+
+# Keys identifying list elements, tried in order. Lists whose elements all carry a unique ID are compared element by
+# element using it (zones, squads, members, ...); other lists are compared positionally.
+DEFAULT_ID_PATHS: tuple[tuple[str, ...], ...] = (
+    ('zoneStatus', 'zoneId'),
+    ('squadId',),
+    ('zoneId',),
+    ('playerId',),
+    ('memberId',),
+    ('id',),
+)
+
+_DICT, _KEYED, _LIST = "dict", "keyed", "list"
+
+
+class Change(NamedTuple):
+    """Single difference between two snapshots
+
+    Attributes
+        op: 'added', 'removed' or 'changed'
+        path: Keys and element IDs leading to the changed value, e.g. ('homeGuild', 'conflictStatus', 'tw_t1',
+              'warSquad', 'S1', 'squadStatus')
+        old: Previous value, None for additions
+        new: Current value, None for removals
+    """
+
+    op: str
+    path: tuple[Any, ...]
+    old: Any = None
+    new: Any = None
+
+
+class _Node:
+    """Hashed view of one value in a snapshot"""
+
+    __slots__ = ("value", "digest", "kind", "children")
+
+    def __init__(self, value: Any, digest: int, kind: str | None = None, children: dict[Any, _Node] | None = None):
+        self.value = value
+        self.digest = digest
+        self.kind = kind
+        self.children = children
+
+
+def _item_id(item: Any, id_path: Sequence[str]) -> Any:
+    for key in id_path:
+        if not isinstance(item, dict) or key not in item:
+            return None
+        item = item[key]
+    return item if isinstance(item, (str, int)) else None
+
+
+def _build(value: Any, id_paths: Sequence[Sequence[str]]) -> _Node:
+    """Build the hashed tree for value bottom-up"""
+    if isinstance(value, dict):
+        children = {key: _build(child, id_paths) for key, child in value.items()}
+        return _Node(value, hash((_DICT, frozenset((k, c.digest) for k, c in children.items()))), _DICT, children)
+
+    if isinstance(value, list):
+        if value and all(isinstance(item, dict) for item in value):
+            for id_path in id_paths:
+                ids = [_item_id(item, id_path) for item in value]
+                if None not in ids and len(set(ids)) == len(ids):
+                    children = {item_id: _build(item, id_paths) for item_id, item in zip(ids, value)}
+                    digest = hash((_KEYED, frozenset((k, c.digest) for k, c in children.items())))
+                    return _Node(value, digest, _KEYED, children)
+        children = {index: _build(item, id_paths) for index, item in enumerate(value)}
+        return _Node(value, hash((_LIST, tuple(c.digest for c in children.values()))), _LIST, children)
+
+    # Numbers are hashed by their repr since hash(-1) == hash(-2) would hide score changes between them
+    return _Node(value, hash((type(value).__name__, value if isinstance(value, str) else repr(value))))
+
+
+class Snapshot:
+    """Decoded response with a precomputed digest for every sub-tree
+
+    Args
+        data: Decoded TW, TB, RAID (or any JSON) response
+
+    Keyword Args
+        id_paths: Key paths identifying list elements, Default: DEFAULT_ID_PATHS
+
+    Notes
+        Digests use Python's built-in hash and are only comparable within one process. The snapshot references
+        the response data without copying it; do not mutate the data while the snapshot is in use.
+    """
+
+    __slots__ = ("data", "_root")
+
+    def __init__(self, data: Any, *, id_paths: Sequence[Sequence[str]] = DEFAULT_ID_PATHS):
+        self.data = data
+        self._root = _build(data, id_paths)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(digest={self.digest:#x})"
+
+    @property
+    def digest(self) -> int:
+        """Digest of the whole response"""
+        return self._root.digest
+
+
+def _diff_nodes(old: _Node, new: _Node, path: tuple[Any, ...], changes: list[Change]) -> None:
+    if old.digest == new.digest:
+        return
+    old_children, new_children = old.children, new.children
+    if (old_children is None or new_children is None or old.kind != new.kind
+            or old.kind == _LIST and len(old_children) != len(new_children)):
+        changes.append(Change("changed", path, old.value, new.value))
+        return
+
+    for key, old_child in old_children.items():
+        new_child = new_children.get(key)
+        if new_child is None:
+            changes.append(Change("removed", path + (key,), old_child.value))
+        else:
+            _diff_nodes(old_child, new_child, path + (key,), changes)
+    for key, new_child in new_children.items():
+        if key not in old_children:
+            changes.append(Change("added", path + (key,), None, new_child.value))
+
+
+def diff(old: Any, new: Any, *, id_paths: Sequence[Sequence[str]] = DEFAULT_ID_PATHS) -> list[Change]:
+    """Return the changes between two snapshots of the same endpoint
+
+        Args
+            old: Previous response or Snapshot
+            new: Current response or Snapshot
+
+        Keyword Args
+            id_paths: Key paths identifying list elements when raw responses are passed, Default: DEFAULT_ID_PATHS
+
+        Returns
+            List of Change tuples. Unchanged sub-trees are skipped by comparing their digests, so the comparison
+            step grows with the size of the changes. Building a Snapshot still hashes the whole response; pass
+            Snapshots (or use SnapshotDiffer) to avoid hashing the same response twice.
+    """
+    old = old if isinstance(old, Snapshot) else Snapshot(old, id_paths=id_paths)
+    new = new if isinstance(new, Snapshot) else Snapshot(new, id_paths=id_paths)
+    changes: list[Change] = []
+    _diff_nodes(old._root, new._root, (), changes)
+    return changes
+
+
+class SnapshotDiffer:
+    """Keep the previous snapshot of a polled endpoint and report changes for each new response
+
+    Keyword Args
+        id_paths: Key paths identifying list elements, Default: DEFAULT_ID_PATHS
+    """
+
+    def __init__(self, *, id_paths: Sequence[Sequence[str]] = DEFAULT_ID_PATHS):
+        self.id_paths = id_paths
+        self.snapshot: Snapshot | None = None
+
+    def update(self, data: Any) -> list[Change]:
+        """Record a new response and return its changes against the previous one
+
+            The first call reports the whole response as one 'added' change at the empty path.
+        """
+        snapshot = Snapshot(data, id_paths=self.id_paths)
+        previous, self.snapshot = self.snapshot, snapshot
+        if previous is None:
+            return [Change("added", (), None, data)]
+        changes: list[Change] = []
+        _diff_nodes(previous._root, snapshot._root, (), changes)
+        return changes
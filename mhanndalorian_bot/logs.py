@@ -0,0 +1,176 @@
+"""
+Incremental TW / TB log following with a persistable cursor
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from contextlib import aclosing
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Iterable
+
+from mhanndalorian_bot.models import _int
+
+__all__ = ["LogCursor", "LogFollower"]
+
+logger = logging.getLogger(__name__)
+
+
+class LogCursor:
+    """Position within an event log: the newest timestamp seen and the IDs of the entries carrying it
+
+    Args
+        timestamp: Newest entry timestamp already processed, Default: 0 (nothing seen)
+        seen_ids: IDs of the already processed entries with exactly that timestamp
+
+    Keyword Args
+        id_key: Entry key holding a unique entry ID, Default: 'id'. Entries without it are identified by a digest
+                of their content.
+        time_key: Entry key holding the entry timestamp, Default: 'timestamp'
+
+    Notes
+        Only the IDs at the newest timestamp are remembered, so the cursor stays constant in size however long the
+        log grows. Entries that share the newest timestamp but arrive in a later poll are still reported.
+    """
+
+    def __init__(self, timestamp: int = 0, seen_ids: Iterable[str] = (), *, id_key: str = 'id',
+                 time_key: str = 'timestamp'):
+        self.timestamp = timestamp
+        self.seen_ids = set(seen_ids)
+        self.id_key = id_key
+        self.time_key = time_key
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(timestamp={self.timestamp}, seen_ids={len(self.seen_ids)})"
+
+    def entry_time(self, entry: dict[str, Any]) -> int:
+        """Return the timestamp of a log entry"""
+        return _int(entry.get(self.time_key))
+
+    def entry_id(self, entry: dict[str, Any]) -> str:
+        """Return the ID of a log entry, or a content digest when the entry has none"""
+        entry_id = entry.get(self.id_key)
+        if entry_id is not None:
+            return str(entry_id)
+        return hashlib.sha1(json.dumps(entry, sort_keys=True, separators=(',', ':')).encode()).hexdigest()
+
+    def is_new(self, entry: dict[str, Any]) -> bool:
+        """Return True if the entry is newer than the cursor"""
+        timestamp = self.entry_time(entry)
+        if timestamp != self.timestamp:
+            return timestamp > self.timestamp
+        return self.entry_id(entry) not in self.seen_ids
+
+    def advance(self, entry: dict[str, Any]) -> None:
+        """Mark the entry as processed"""
+        timestamp = self.entry_time(entry)
+        if timestamp > self.timestamp:
+            self.timestamp = timestamp
+            self.seen_ids = {self.entry_id(entry)}
+        elif timestamp == self.timestamp:
+            self.seen_ids.add(self.entry_id(entry))
+
+    def new_entries(self, entries: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Return the entries newer than the cursor in chronological order, without advancing the cursor"""
+        return sorted((entry for entry in entries if self.is_new(entry)), key=self.entry_time)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable representation of the cursor"""
+        return {"timestamp": self.timestamp, "seen_ids": sorted(self.seen_ids), "id_key": self.id_key,
+                "time_key": self.time_key}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LogCursor":
+        """Create a cursor from the output of to_dict()"""
+        return cls(_int(data.get('timestamp')), data.get('seen_ids') or (), id_key=data.get('id_key', 'id'),
+                   time_key=data.get('time_key', 'timestamp'))
+
+    def save(self, path: str | os.PathLike) -> None:
+        """Write the cursor to a JSON file, replacing it atomically"""
+        tmp_path = f"{os.fspath(path)}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike, **kwargs: Any) -> "LogCursor":
+        """Read a cursor saved with save(). A missing file returns a new cursor built with kwargs."""
+        try:
+            with open(path, encoding="utf-8") as file:
+                return cls.from_dict(json.load(file))
+        except FileNotFoundError:
+            return cls(**kwargs)
+
+
+class LogFollower:
+    """Async iterator that polls an event log and yields only entries not seen before
+
+    Args
+        fetch: Callable returning an async generator over the current log entries, e.g. API.fetch_twlogs_iter_async
+
+    Keyword Args
+        cursor: Starting LogCursor. Defaults to the cursor stored at cursor_path, or an empty cursor.
+        interval: Seconds to wait between polls, Default: 60.0
+        cursor_path: Optional file the cursor is saved to after every poll
+        newest_first: Set to True if the log is returned newest entry first. Reading then stops at the first
+                      already seen entry instead of downloading the remainder of the log, Default: False
+        **kwargs: Additional keyword arguments passed to fetch on every poll
+
+    Notes
+        New entries are yielded oldest first and the cursor advances once the consumer resumes after each entry,
+        so an entry interrupted mid-processing is delivered again after a restart from the saved cursor.
+    """
+
+    def __init__(self, fetch: Callable[..., AsyncGenerator[dict[str, Any], None]], *, cursor: LogCursor | None = None,
+                 interval: float = 60.0, cursor_path: str | os.PathLike | None = None, newest_first: bool = False,
+                 **kwargs: Any):
+        if interval < 0:
+            raise ValueError("interval must not be negative")
+        if cursor is None:
+            cursor = LogCursor.load(cursor_path) if cursor_path is not None else LogCursor()
+        self.fetch = fetch
+        self.cursor = cursor
+        self.interval = interval
+        self.cursor_path = cursor_path
+        self.newest_first = newest_first
+        self.fetch_kwargs = kwargs
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(cursor={self.cursor!r}, interval={self.interval})"
+
+    async def _collect(self) -> list[dict[str, Any]]:
+        """Read the log once and return the new entries in chronological order"""
+        new: list[dict[str, Any]] = []
+        async with aclosing(self.fetch(**self.fetch_kwargs)) as entries:
+            async for entry in entries:
+                if self.cursor.is_new(entry):
+                    new.append(entry)
+                elif self.newest_first:
+                    break
+        new.sort(key=self.cursor.entry_time)
+        return new
+
+    def _save(self) -> None:
+        if self.cursor_path is not None:
+            self.cursor.save(self.cursor_path)
+
+    async def poll(self) -> list[dict[str, Any]]:
+        """Read the log once, advance the cursor past every new entry and return them oldest first"""
+        new = await self._collect()
+        for entry in new:
+            self.cursor.advance(entry)
+        self._save()
+        return new
+
+    async def __aiter__(self) -> AsyncIterator[dict[str, Any]]:
+        while True:
+            new = await self._collect()
+            logger.debug(f"Log poll returned {len(new)} new entries")
+            for entry in new:
+                yield entry
+                self.cursor.advance(entry)
+            self._save()
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,300 @@
+"""
+Request lifecycle metrics: collector interface, in-memory aggregator and Prometheus / OpenTelemetry adapters
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import Any, NamedTuple, Sequence
+
+__all__ = ["DEFAULT_LATENCY_BUCKETS", "DecodeEvent", "EndpointStats", "InMemoryMetrics", "MetricsCollector",
+           "OpenTelemetryMetrics", "PrometheusMetrics", "RequestEvent"]
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is unbounded
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class RequestEvent(NamedTuple):
+    """One HTTP request attempt
+
+    Attributes
+        endpoint: Endpoint name, e.g. 'player'
+        method: HTTP method
+        status: Response status code, None if the attempt failed with a transport error
+        error: Exception class name of a transport error, otherwise None
+        attempt: Attempt number, starting at 1
+        retried: True if the attempt failed and will be retried
+        latency: Seconds from sending the request to receiving the full response (or the error)
+        sign_time: Seconds spent building the request headers, including the HMAC signature
+        bytes_out: Size of the request body
+        bytes_in: Size of the response body, 0 on transport errors
+    """
+
+    endpoint: str
+    method: str
+    status: int | None
+    error: str | None
+    attempt: int
+    retried: bool
+    latency: float
+    sign_time: float
+    bytes_out: int
+    bytes_in: int
+
+    @property
+    def outcome(self) -> str:
+        """Status code as a string, or the transport error class name"""
+        return str(self.status) if self.status is not None else (self.error or "")
+
+
+class DecodeEvent(NamedTuple):
+    """Decoding of one response body"""
+
+    endpoint: str
+    seconds: float
+    size: int
+
+
+class MetricsCollector:
+    """Receiver of request lifecycle events
+
+    Pass an instance as ``metrics=`` to API or Registry. Subclasses override the hooks they need; the defaults do
+    nothing. Hooks are called synchronously on the requesting thread or event loop, so they should be cheap and must
+    be thread-safe when the instance is shared between threads. Exceptions raised by a hook are logged and ignored.
+
+    Notes
+        Instances created without a collector skip every measurement, so the instrumentation costs one attribute
+        check per request when disabled.
+    """
+
+    def on_request(self, event: RequestEvent) -> None:
+        """Called after every request attempt, including attempts that are retried"""
+
+    def on_decode(self, event: DecodeEvent) -> None:
+        """Called after a response body has been decoded"""
+
+
+class EndpointStats:
+    """Aggregated metrics for one endpoint
+
+    Attributes
+        requests: Request attempts
+        errors: Attempts that failed with a transport error or a status code of 400 or above
+        retries: Attempts that were retried
+        outcomes: Attempts per status code / transport error name
+        bytes_out / bytes_in: Total request / response body bytes
+        latency_sum: Total request latency in seconds
+        latency_counts: Attempts per latency bucket, see InMemoryMetrics.buckets
+        sign_time: Total seconds spent signing
+        decodes / decode_time: Decoded responses and total seconds spent decoding
+    """
+
+    __slots__ = ("buckets", "requests", "errors", "retries", "outcomes", "bytes_out", "bytes_in", "latency_sum",
+                 "latency_counts", "sign_time", "decodes", "decode_time")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.requests = self.errors = self.retries = self.bytes_out = self.bytes_in = self.decodes = 0
+        self.latency_sum = self.sign_time = self.decode_time = 0.0
+        self.outcomes: dict[str, int] = {}
+        self.latency_counts = [0] * (len(self.buckets) + 1)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(requests={self.requests}, errors={self.errors}, retries={self.retries})"
+
+    @property
+    def mean_latency(self) -> float:
+        return self.latency_sum / self.requests if self.requests else 0.0
+
+    def latency_quantile(self, q: float) -> float:
+        """Estimate a latency quantile (0 < q <= 1) by interpolating within the histogram bucket that contains it
+
+        Returns the last finite bucket bound for quantiles that fall into the unbounded bucket.
+        """
+        if not self.requests:
+            return 0.0
+        rank = q * self.requests
+        seen = 0
+        for index, count in enumerate(self.latency_counts):
+            if count and seen + count >= rank:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                return lower + (self.buckets[index] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the statistics as a plain dictionary"""
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retries,
+            'outcomes': dict(self.outcomes),
+            'bytes_out': self.bytes_out,
+            'bytes_in': self.bytes_in,
+            'latency_mean': self.mean_latency,
+            'latency_p50': self.latency_quantile(0.5),
+            'latency_p99': self.latency_quantile(0.99),
+            'latency_histogram': dict(zip((*self.buckets, float('inf')), self.latency_counts)),
+            'sign_time': self.sign_time,
+            'decodes': self.decodes,
+            'decode_time': self.decode_time,
+        }
+
+
+class InMemoryMetrics(MetricsCollector):
+    """Thread-safe collector aggregating events per endpoint in memory
+
+    Keyword Args
+        buckets: Ascending latency histogram bucket bounds in seconds, Default: DEFAULT_LATENCY_BUCKETS
+    """
+
+    def __init__(self, *, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.endpoints: dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(endpoints={sorted(self.endpoints)})"
+
+    def _stats(self, endpoint: str) -> EndpointStats:
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = self.endpoints[endpoint] = EndpointStats(self.buckets)
+        return stats
+
+    def on_request(self, event: RequestEvent) -> None:
+        with self._lock:
+            stats = self._stats(event.endpoint)
+            stats.requests += 1
+            stats.errors += event.status is None or event.status >= 400
+            stats.retries += event.retried
+            outcome = event.outcome
+            stats.outcomes[outcome] = stats.outcomes.get(outcome, 0) + 1
+            stats.bytes_out += event.bytes_out
+            stats.bytes_in += event.bytes_in
+            stats.latency_sum += event.latency
+            stats.latency_counts[bisect_left(self.buckets, event.latency)] += 1
+            stats.sign_time += event.sign_time
+
+    def on_decode(self, event: DecodeEvent) -> None:
+        with self._lock:
+            stats = self._stats(event.endpoint)
+            stats.decodes += 1
+            stats.decode_time += event.seconds
+
+    def stats(self, endpoint: str) -> EndpointStats | None:
+        """Return the live statistics of one endpoint, or None if no request was made to it"""
+        return self.endpoints.get(endpoint)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Return the statistics of every endpoint as plain dictionaries"""
+        with self._lock:
+            return {endpoint: stats.to_dict() for endpoint, stats in self.endpoints.items()}
+
+    def reset(self) -> None:
+        """Discard all statistics"""
+        with self._lock:
+            self.endpoints.clear()
+
+
+class PrometheusMetrics(MetricsCollector):
+    """Collector exporting events as Prometheus metrics. Requires the optional `prometheus-client` package.
+
+    Keyword Args
+        namespace: Prefix of the metric names, Default: 'mhanndalorian_bot'
+        registry: prometheus_client CollectorRegistry to register the metrics with, Default: the global registry
+        buckets: Latency histogram bucket bounds in seconds, Default: DEFAULT_LATENCY_BUCKETS
+
+    Notes
+        Exposes <namespace>_requests_total{endpoint, method, outcome}, <namespace>_retries_total{endpoint},
+        <namespace>_request_duration_seconds{endpoint}, <namespace>_sign_duration_seconds{endpoint},
+        <namespace>_decode_duration_seconds{endpoint} and <namespace>_sent_bytes_total / _received_bytes_total.
+    """
+
+    def __init__(self, *, namespace: str = "mhanndalorian_bot", registry: Any = None,
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        try:
+            from prometheus_client import Counter, Histogram, Summary  # ty: ignore[unresolved-import]
+        except ImportError as exc:
+            raise ImportError("PrometheusMetrics requires the 'prometheus-client' package "
+                              "(pip install mhanndalorian-bot[prometheus])") from exc
+
+        options: dict[str, Any] = {'namespace': namespace}
+        if registry is not None:
+            options['registry'] = registry
+        self.requests = Counter("requests", "Request attempts", ["endpoint", "method", "outcome"], **options)
+        self.retries = Counter("retries", "Request attempts that were retried", ["endpoint"], **options)
+        self.latency = Histogram("request_duration_seconds", "Request latency", ["endpoint"], buckets=buckets,
+                                 **options)
+        self.sign_time = Summary("sign_duration_seconds", "Time spent signing requests", ["endpoint"], **options)
+        self.decode_time = Summary("decode_duration_seconds", "Time spent decoding responses", ["endpoint"],
+                                   **options)
+        self.bytes_out = Counter("sent_bytes", "Request body bytes", ["endpoint"], **options)
+        self.bytes_in = Counter("received_bytes", "Response body bytes", ["endpoint"], **options)
+
+    def on_request(self, event: RequestEvent) -> None:
+        endpoint = event.endpoint
+        self.requests.labels(endpoint, event.method, event.outcome).inc()
+        if event.retried:
+            self.retries.labels(endpoint).inc()
+        self.latency.labels(endpoint).observe(event.latency)
+        self.sign_time.labels(endpoint).observe(event.sign_time)
+        self.bytes_out.labels(endpoint).inc(event.bytes_out)
+        self.bytes_in.labels(endpoint).inc(event.bytes_in)
+
+    def on_decode(self, event: DecodeEvent) -> None:
+        self.decode_time.labels(event.endpoint).observe(event.seconds)
+
+
+class OpenTelemetryMetrics(MetricsCollector):
+    """Collector recording events with OpenTelemetry instruments. Requires the optional `opentelemetry-api` package.
+
+    Keyword Args
+        meter: OpenTelemetry Meter to create the instruments with, Default: the global meter 'mhanndalorian_bot'
+
+    Notes
+        Records the counters mhanndalorian_bot.requests, .retries, .sent_bytes and .received_bytes and the
+        histograms mhanndalorian_bot.request.duration, .sign.duration and .decode.duration, with 'endpoint',
+        'method' and 'outcome' attributes.
+    """
+
+    def __init__(self, *, meter: Any = None):
+        if meter is None:
+            try:
+                from opentelemetry import metrics  # ty: ignore[unresolved-import]
+            except ImportError as exc:
+                raise ImportError("OpenTelemetryMetrics requires the 'opentelemetry-api' package "
+                                  "(pip install mhanndalorian-bot[otel])") from exc
+            meter = metrics.get_meter("mhanndalorian_bot")
+
+        self.requests = meter.create_counter("mhanndalorian_bot.requests", unit="{request}",
+                                             description="Request attempts")
+        self.retries = meter.create_counter("mhanndalorian_bot.retries", unit="{request}",
+                                            description="Request attempts that were retried")
+        self.latency = meter.create_histogram("mhanndalorian_bot.request.duration", unit="s",
+                                              description="Request latency")
+        self.sign_time = meter.create_histogram("mhanndalorian_bot.sign.duration", unit="s",
+                                                description="Time spent signing requests")
+        self.decode_time = meter.create_histogram("mhanndalorian_bot.decode.duration", unit="s",
+                                                  description="Time spent decoding responses")
+        self.bytes_out = meter.create_counter("mhanndalorian_bot.sent_bytes", unit="By",
+                                              description="Request body bytes")
+        self.bytes_in = meter.create_counter("mhanndalorian_bot.received_bytes", unit="By",
+                                             description="Response body bytes")
+
+    def on_request(self, event: RequestEvent) -> None:
+        attributes = {'endpoint': event.endpoint, 'method': event.method, 'outcome': event.outcome}
+        endpoint = {'endpoint': event.endpoint}
+        self.requests.add(1, attributes)
+        if event.retried:
+            self.retries.add(1, endpoint)
+        self.latency.record(event.latency, attributes)
+        self.sign_time.record(event.sign_time, endpoint)
+        self.bytes_out.add(event.bytes_out, endpoint)
+        self.bytes_in.add(event.bytes_in, endpoint)
+
+    def on_decode(self, event: DecodeEvent) -> None:
+        self.decode_time.record(event.seconds, {'endpoint': event.endpoint})
@@ -0,0 +1,384 @@
+"""
+Typed, slotted response models for PLAYER, GUILD, TW, RAID and INVENTORY data
+
+Models are built from the decoded JSON returned by the API.fetch_* methods. Heavy sub-trees (player roster, guild
+members, TW zones and squads, raid members, inventory lists) are kept as the raw lists until first accessed, then
+converted once and the raw list released.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+__all__ = ["Guild", "GuildMember", "Inventory", "Player", "Raid", "RaidMember", "RosterUnit", "TerritoryWar",
+           "TWGuild", "TWSquad", "TWZone", "parse_model"]
+
+_GP_STAT_KEY = "STAT_GALACTIC_POWER_ACQUIRED_NAME"
+# Comlink relic tiers are offset: 1 = relic locked, 2 = R0, 3 = R1, ...
+_RELIC_TIER_OFFSET = 2
+
+
+def _int(value: Any, default: int = 0) -> int:
+    """Convert numeric strings (as returned for large values) and numbers to int"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _unwrap(data: dict[str, Any], marker: str, *wrappers: str) -> dict[str, Any]:
+    """Return the first dictionary containing marker, looking through the given wrapper keys"""
+    if marker in data:
+        return data
+    for key in wrappers:
+        inner = data.get(key)
+        if isinstance(inner, dict) and marker in inner:
+            return inner
+    return data
+
+
+@dataclass(slots=True)
+class RosterUnit:
+    """Single unit from a player roster"""
+
+    definition_id: str
+    rarity: int
+    level: int
+    gear: int
+    relic_tier: int
+    gp: int
+
+    @property
+    def base_id(self) -> str:
+        """Unit identifier without the rarity suffix, e.g. 'VADER' for 'VADER:SEVEN_STAR'"""
+        return self.definition_id.split(':', 1)[0]
+
+    @property
+    def relic(self) -> int:
+        """Relic level (0 if relics are locked)"""
+        return max(self.relic_tier - _RELIC_TIER_OFFSET, 0)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "RosterUnit":
+        return cls(
+                definition_id=data.get('definitionId', ''),
+                rarity=_int(data.get('currentRarity')),
+                level=_int(data.get('currentLevel')),
+                gear=_int(data.get('currentTier')),
+                relic_tier=_int((data.get('relic') or {}).get('currentTier')),
+                gp=_int(data.get('gp', data.get('galacticPower'))),
+                )
+
+
+@dataclass(slots=True)
+class Player:
+    """PLAYER endpoint response"""
+
+    name: str
+    ally_code: str
+    player_id: str
+    guild_id: str
+    guild_name: str
+    level: int
+    galactic_power: int
+    _roster_raw: list[dict[str, Any]] | None = field(default=None, repr=False, compare=False)
+    _roster: list[RosterUnit] | None = field(default=None, repr=False)
+
+    @property
+    def roster(self) -> list[RosterUnit]:
+        """Roster units, converted on first access"""
+        if self._roster is None:
+            self._roster = [RosterUnit.from_dict(unit) for unit in self._roster_raw or ()]
+            self._roster_raw = None
+        return self._roster
+
+    def unit(self, base_id: str) -> RosterUnit | None:
+        """Return the roster unit with the given base ID, if owned"""
+        return next((unit for unit in self.roster if unit.base_id == base_id), None)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Player":
+        data = _unwrap(data, 'rosterUnit', 'events', 'data')
+        gp = next((stat.get('value') for stat in data.get('profileStat') or ()
+                   if stat.get('nameKey') == _GP_STAT_KEY), data.get('galacticPower'))
+        return cls(
+                name=data.get('name', ''),
+                ally_code=str(data.get('allyCode', '')),
+                player_id=data.get('playerId', ''),
+                guild_id=data.get('guildId', ''),
+                guild_name=data.get('guildName', ''),
+                level=_int(data.get('level')),
+                galactic_power=_int(gp),
+                _roster_raw=data.get('rosterUnit') or [],
+                )
+
+
+@dataclass(slots=True)
+class GuildMember:
+    """Member entry of a GUILD response"""
+
+    player_id: str
+    name: str
+    level: int
+    galactic_power: int
+    member_level: int
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "GuildMember":
+        return cls(
+                player_id=data.get('playerId', ''),
+                name=data.get('playerName', ''),
+                level=_int(data.get('playerLevel')),
+                galactic_power=_int(data.get('galacticPower')),
+                member_level=_int(data.get('memberLevel')),
+                )
+
+
+@dataclass(slots=True)
+class Guild:
+    """GUILD endpoint response"""
+
+    guild_id: str
+    name: str
+    member_count: int
+    galactic_power: int
+    _members_raw: list[dict[str, Any]] | None = field(default=None, repr=False, compare=False)
+    _members: list[GuildMember] | None = field(default=None, repr=False)
+
+    @property
+    def members(self) -> list[GuildMember]:
+        """Guild members, converted on first access"""
+        if self._members is None:
+            self._members = [GuildMember.from_dict(member) for member in self._members_raw or ()]
+            self._members_raw = None
+        return self._members
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Guild":
+        if 'events' in data and isinstance(data['events'], dict):
+            data = data['events'].get('guild', data['events'])
+        profile = data.get('profile') or {}
+        return cls(
+                guild_id=profile.get('id', ''),
+                name=profile.get('name', ''),
+                member_count=_int(profile.get('memberCount')),
+                galactic_power=_int(profile.get('guildGalacticPower')),
+                _members_raw=data.get('member') or [],
+                )
+
+
+@dataclass(slots=True)
+class TWSquad:
+    """Defensive squad placed in a TW zone"""
+
+    squad_id: str
+    player_id: str
+    player_name: str
+    status: str
+    power: int
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TWSquad":
+        return cls(
+                squad_id=data.get('squadId', ''),
+                player_id=data.get('playerId', ''),
+                player_name=data.get('playerName', ''),
+                status=str(data.get('squadStatus', '')),
+                power=_int(data.get('power')),
+                )
+
+
+@dataclass(slots=True)
+class TWZone:
+    """Zone (territory) status for one guild in a TW"""
+
+    zone_id: str
+    state: str
+    score: int
+    _squads_raw: list[dict[str, Any]] | None = field(default=None, repr=False, compare=False)
+    _squads: list[TWSquad] | None = field(default=None, repr=False)
+
+    @property
+    def squads(self) -> list[TWSquad]:
+        """Defensive squads in the zone, converted on first access"""
+        if self._squads is None:
+            self._squads = [TWSquad.from_dict(squad) for squad in self._squads_raw or ()]
+            self._squads_raw = None
+        return self._squads
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TWZone":
+        status = data.get('zoneStatus') or {}
+        return cls(
+                zone_id=status.get('zoneId', ''),
+                state=str(status.get('zoneState', '')),
+                score=_int(status.get('score')),
+                _squads_raw=data.get('warSquad') or [],
+                )
+
+
+@dataclass(slots=True)
+class TWGuild:
+    """One side of a TW"""
+
+    guild_id: str
+    name: str
+    _zones_raw: list[dict[str, Any]] | None = field(default=None, repr=False, compare=False)
+    _zones: list[TWZone] | None = field(default=None, repr=False)
+
+    @property
+    def zones(self) -> list[TWZone]:
+        """Zone statuses, converted on first access"""
+        if self._zones is None:
+            self._zones = [TWZone.from_dict(zone) for zone in self._zones_raw or ()]
+            self._zones_raw = None
+        return self._zones
+
+    @property
+    def score(self) -> int:
+        """Total score across all zones"""
+        return sum(zone.score for zone in self.zones)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TWGuild":
+        profile = data.get('profile') or {}
+        return cls(
+                guild_id=profile.get('id', ''),
+                name=profile.get('name', ''),
+                _zones_raw=data.get('conflictStatus') or [],
+                )
+
+
+@dataclass(slots=True)
+class TerritoryWar:
+    """TW endpoint response"""
+
+    instance_id: str
+    home_guild: TWGuild | None
+    away_guild: TWGuild | None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TerritoryWar":
+        data = _unwrap(data, 'homeGuild', 'data', 'events')
+        home, away = data.get('homeGuild'), data.get('awayGuild')
+        return cls(
+                instance_id=data.get('instanceId', ''),
+                home_guild=TWGuild.from_dict(home) if home else None,
+                away_guild=TWGuild.from_dict(away) if away else None,
+                )
+
+
+@dataclass(slots=True)
+class RaidMember:
+    """Member progress entry of an ACTIVERAID response"""
+
+    player_id: str
+    progress: int
+    rank: int
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "RaidMember":
+        return cls(
+                player_id=data.get('playerId', ''),
+                progress=_int(data.get('memberProgress')),
+                rank=_int(data.get('memberRank')),
+                )
+
+
+@dataclass(slots=True)
+class Raid:
+    """ACTIVERAID endpoint response"""
+
+    raid_id: str
+    expire_time: int
+    guild_reward_score: int
+    _members_raw: list[dict[str, Any]] | None = field(default=None, repr=False, compare=False)
+    _members: list[RaidMember] | None = field(default=None, repr=False)
+
+    @property
+    def members(self) -> list[RaidMember]:
+        """Member progress entries, converted on first access"""
+        if self._members is None:
+            self._members = [RaidMember.from_dict(member) for member in self._members_raw or ()]
+            self._members_raw = None
+        return self._members
+
+    @property
+    def total_progress(self) -> int:
+        """Sum of all member progress"""
+        return sum(member.progress for member in self.members)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Raid":
+        data = _unwrap(data, 'raidId', 'data')
+        return cls(
+                raid_id=data.get('raidId', ''),
+                expire_time=_int(data.get('expireTime')),
+                guild_reward_score=_int(data.get('guildRewardScore')),
+                _members_raw=data.get('raidMember') or [],
+                )
+
+
+@dataclass(slots=True)
+class Inventory:
+    """INVENTORY endpoint response"""
+
+    _raw: dict[str, Any] = field(repr=False, compare=False)
+    _materials: dict[str, int] | None = field(default=None, repr=False)
+    _currencies: dict[str, int] | None = field(default=None, repr=False)
+    _equipment: dict[str, int] | None = field(default=None, repr=False)
+
+    @property
+    def materials(self) -> dict[str, int]:
+        """Material quantities keyed by material ID"""
+        if self._materials is None:
+            self._materials = {m.get('id', ''): _int(m.get('quantity')) for m in self._raw.pop('material', None) or ()}
+        return self._materials
+
+    @property
+    def currencies(self) -> dict[str, int]:
+        """Currency quantities keyed by currency name"""
+        if self._currencies is None:
+            self._currencies = {str(c.get('currency', '')): _int(c.get('quantity'))
+                                for c in self._raw.pop('currencyItem', None) or ()}
+        return self._currencies
+
+    @property
+    def equipment(self) -> dict[str, int]:
+        """Gear piece quantities keyed by equipment ID"""
+        if self._equipment is None:
+            self._equipment = {e.get('id', ''): _int(e.get('quantity')) for e in self._raw.pop('equipment', None) or ()}
+        return self._equipment
+
+    @property
+    def unequipped_mods(self) -> list[dict[str, Any]]:
+        """Raw unequipped mod entries"""
+        return self._raw.get('unequippedMod') or []
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Inventory":
+        inventory = data.get('inventory', data)
+        return cls(_raw=dict(inventory) if isinstance(inventory, dict) else {})
+
+
+_MODELS: dict[str, type[Player] | type[Guild] | type[TerritoryWar] | type[Raid] | type[Inventory]] = {
+    'player': Player,
+    'guild': Guild,
+    'tw': TerritoryWar,
+    'activeraid': Raid,
+    'inventory': Inventory,
+}
+
+
+def parse_model(endpoint_name: str, data: dict[str, Any]) -> Any:
+    """Convert a decoded response for the named endpoint into its model
+
+        Raises
+            ValueError: if no model exists for the endpoint
+    """
+    try:
+        model = _MODELS[endpoint_name]
+    except KeyError:
+        raise ValueError(f"No response model available for endpoint {endpoint_name!r}") from None
+    return model.from_dict(data)
@@ -0,0 +1,70 @@
+"""
+Client side token bucket rate limiting shared by synchronous and asynchronous requests
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Callable
+
+__all__ = ["RateLimiter"]
+
+
+class RateLimiter:
+    """Thread-safe token bucket limiting how many requests may start per time period
+
+    Args
+        rate: Number of requests allowed per `per` seconds
+        per: Length of the period in seconds, Default: 1.0
+
+    Keyword Args
+        burst: Maximum number of tokens that can accumulate while idle, i.e. the largest burst sent back to back.
+               Defaults to `rate` (rounded up, minimum 1).
+        clock: Monotonic time source, primarily for testing. Default: time.monotonic
+
+    Notes
+        Callers reserve a token immediately and then wait for the reservation to mature, so waiters are served in
+        arrival order across threads and coroutines. acquire_async() waits with asyncio.sleep() and never blocks the
+        event loop. A single limiter may be shared by several API / Registry instances using the same API key.
+    """
+
+    def __init__(self, rate: float, per: float = 1.0, *, burst: int | None = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if rate <= 0 or per <= 0:
+            raise ValueError("rate and per must be positive")
+
+        self.rate = rate / per
+        self.capacity = float(burst if burst is not None else max(1, -(-rate // 1)))
+        if self.capacity < 1:
+            raise ValueError("burst must be at least 1")
+        self.clock = clock
+
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(rate={self.rate}/s, capacity={self.capacity})"
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens from the bucket and return the number of seconds to wait before using them"""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """Block the calling thread until tokens are available"""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, tokens: float = 1.0) -> None:
+        """Wait without blocking the event loop until tokens are available"""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
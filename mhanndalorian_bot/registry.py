@@ -3,29 +3,60 @@ Class definition for SWGOH MHanndalorian Bot player registry service
 """
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Iterable, NamedTuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     import httpx
 
 from mhanndalorian_bot.base import MBot
 from mhanndalorian_bot.attrs import EndPoint
-from mhanndalorian_bot.utils import func_timer
+from mhanndalorian_bot.batch import run_batch_async
+from mhanndalorian_bot.cache import IdentityCache
+from mhanndalorian_bot.utils import _redact_value, func_timer
+
+
+class OnboardingResult(NamedTuple):
+    """Progress event yielded by Registry.onboard_players_async()
+
+    Attributes
+        discord_id: Discord user ID of the player
+        allycode: Allycode of the player
+        status: 'registered' (data holds the portrait and title to set), 'verified', 'failed' (error holds the
+                exception raised by register_player_async) or 'expired' (not verified before the deadline)
+        data: Registration response for 'registered' events, otherwise None
+        error: Exception for 'failed' events, otherwise None
+    """
+
+    discord_id: str
+    allycode: str
+    status: str
+    data: Any = None
+    error: Exception | None = None
 
 
 class Registry(MBot):
     """
     Container class for MBot module to facilitate interacting with Mhanndalorian Bot SWGOH player registry
+
+    Keyword Args
+        identity_cache: Optional IdentityCache answering repeated player lookups locally. Instances may share one.
+        **kwargs: Additional keyword arguments forwarded to MBot
     """
 
     logger = logging.getLogger(__name__)
 
+    # Number of identifiers sent per 'find' request by fetch_players() / fetch_players_async()
+    find_chunk_size: int = 25
+
     def __init__(self, api_key: str, allycode: str, discord_id: str, *,
                  api_host: str = "https://mhanndalorianbot.work", hmac: bool = True, debug: bool = False,
-                 verify: bool | str = True):
+                 verify: bool | str = True, identity_cache: IdentityCache | None = None, **kwargs: Any):
         super().__init__(api_key=api_key, allycode=allycode, discord_id=discord_id,
-                         api_host=api_host, hmac=hmac, debug=debug, verify=verify)
+                         api_host=api_host, hmac=hmac, debug=debug, verify=verify, **kwargs)
+        self.identity_cache = identity_cache
 
     @func_timer
     def validate_arguments(self, allycode: str | None, discord_id: str | None) -> str:
@@ -43,6 +74,83 @@ class Registry(MBot):
         assert identifier is not None  # guaranteed by the checks above
         return identifier
 
+    def _bulk_identifiers(self, allycodes: Iterable[str] | None, discord_ids: Iterable[str] | None) -> list[str]:
+        """Validate and de-duplicate identifiers for a bulk lookup, preserving order"""
+        identifiers = [self.cleanse_allycode(allycode) for allycode in allycodes or ()]
+        identifiers += [self.cleanse_discord_id(discord_id) for discord_id in discord_ids or ()]
+        if not identifiers:
+            raise ValueError("At least one allycode or discord_id must be provided.")
+        return list(dict.fromkeys(identifiers))
+
+    def _find_chunks(self, identifiers: list[str], chunk_size: int | None) -> list[list[str]]:
+        size = chunk_size or self.find_chunk_size
+        if size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+        return [identifiers[i:i + size] for i in range(0, len(identifiers), size)]
+
+    def _find_records(self, resp: "httpx.Response") -> list[dict[str, Any]]:
+        if resp.status_code != 200:
+            raise RuntimeError(f"Unexpected result: {resp.content.decode()}")
+        resp_data = self._decode(resp)
+        return resp_data if isinstance(resp_data, list) else [resp_data]
+
+    @staticmethod
+    def _index_records(records: Iterable[dict[str, Any]], identifiers: list[str]) -> dict[str, dict[str, Any]]:
+        """Map each requested identifier to its record. A discord ID with several allycodes maps to the primary one."""
+        wanted = set(identifiers)
+        result: dict[str, dict[str, Any]] = {}
+        for record in records:
+            if not isinstance(record, dict):
+                continue
+            allycode = str(record.get('allyCode', '')).replace('-', '')
+            if allycode in wanted:
+                result[allycode] = record
+            discord_id = str(record.get('discordId', ''))
+            if discord_id in wanted and (discord_id not in result or record.get('primary')):
+                result[discord_id] = record
+        return result
+
+    def _cache_records(self, records: Any) -> None:
+        if self.identity_cache is not None:
+            for record in records if isinstance(records, list) else (records,):
+                self.identity_cache.add_record(record)
+
+    def _cached_player(self, identifier: str, is_discord_id: bool) -> Any:
+        """Return a cached fetch_player() result, in the same shape as the uncached response, or None"""
+        if self.identity_cache is None:
+            return None
+        if is_discord_id:
+            records = self.identity_cache.get_records(identifier)
+            return self._player_result(records) if records else None
+        return self.identity_cache.get_record(identifier)
+
+    def _cache_player(self, identifier: str, is_discord_id: bool, resp_data: Any) -> None:
+        if self.identity_cache is not None and is_discord_id and isinstance(resp_data, list):
+            self.identity_cache.add_records(identifier, resp_data)
+        else:
+            self._cache_records(resp_data)
+
+    @staticmethod
+    def _player_result(resp_data: Any) -> Any:
+        """Unwrap a 'find' response holding a single record"""
+        if isinstance(resp_data, list) and len(resp_data) == 1:
+            return resp_data[0]
+        return resp_data
+
+    def _split_cached(self, identifiers: list[str]) -> tuple[dict[str, dict[str, Any]], list[str]]:
+        """Return the identity cache hits and the identifiers that still need a request"""
+        if self.identity_cache is None:
+            return {}, identifiers
+        hits = {i: r for i in identifiers if (r := self.identity_cache.get_record(i)) is not None}
+        return hits, [i for i in identifiers if i not in hits]
+
+    def _invalidate_identity(self, discord_id: str, allycode: str, verified: bool = False,
+                             primary: bool = False) -> None:
+        if self.identity_cache is not None:
+            self.identity_cache.invalidate(discord_id, allycode)
+            if verified:
+                self.identity_cache.add_mapping(discord_id, allycode, primary=primary)
+
     @func_timer
     def fetch_player(
             self, *,
@@ -62,21 +170,63 @@ class Registry(MBot):
         """
 
         user_identifier = self.validate_arguments(allycode, discord_id)
+        if (cached := self._cached_player(user_identifier, not allycode)) is not None:
+            return cached
+
         payload = {'user': [user_identifier], 'endpoint': 'find'}
         endpoint = f"/api/{EndPoint.FETCH.value}"
 
-        if hmac or self.hmac is True:
-            self.sign(method='POST', endpoint=endpoint, payload=payload)
-
-        resp: "httpx.Response" = self.client.post(endpoint, json=payload)
+        resp: "httpx.Response" = self._send('POST', endpoint, payload, hmac=hmac or self.hmac is True)
 
         if resp.status_code == 200:
-            resp_data = resp.json()
-            if isinstance(resp_data, list) and len(resp_data) == 1:
-                return resp_data[0]
-            return resp_data
+            resp_data = self._decode(resp)
+            self._cache_player(user_identifier, not allycode, resp_data)
+            return self._player_result(resp_data)
         raise RuntimeError(f"Unexpected result: {resp.content.decode()}")
 
+    @func_timer
+    def fetch_players(
+            self, *,
+            allycodes: Iterable[str] | None = None,
+            discord_ids: Iterable[str] | None = None,
+            chunk_size: int | None = None,
+            concurrency: int = 4,
+            hmac: bool = False
+            ) -> dict[str, dict[str, Any]]:
+        """Return registry records for many allycodes and/or discord IDs
+
+            Keyword Args
+                allycodes: Iterable of player allycodes as strings.
+                discord_ids: Iterable of Discord user IDs as strings.
+                chunk_size: Number of identifiers per request, Default: Registry.find_chunk_size. Identifiers found in
+                            the identity cache are not requested.
+                concurrency: Maximum number of requests in flight at once, Default: 4
+                hmac: Boolean flag to indicate use of HMAC request signing.
+
+            Returns
+                Dictionary mapping each found identifier (allycodes without dashes) to its record. Identifiers
+                without a registry record are omitted.
+        """
+        identifiers = self._bulk_identifiers(allycodes, discord_ids)
+        is_hmac_signed = hmac or self.hmac is True
+        endpoint = f"/api/{EndPoint.FETCH.value}"
+
+        def _find(chunk: list[str]) -> list[dict[str, Any]]:
+            payload = {'user': chunk, 'endpoint': 'find'}
+            return self._find_records(self._send('POST', endpoint, payload, hmac=is_hmac_signed))
+
+        found, missing = self._split_cached(identifiers)
+        chunks = self._find_chunks(missing, chunk_size)
+        if len(chunks) <= 1 or concurrency <= 1:
+            results = [_find(chunk) for chunk in chunks]
+        else:
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(chunks))) as executor:
+                results = list(executor.map(_find, chunks))
+        records = [record for chunk_records in results for record in chunk_records]
+        self._cache_records(records)
+        found.update(self._index_records(records, missing))
+        return found
+
     @func_timer
     def register_player(self,
                         discord_id: str,
@@ -100,13 +250,11 @@ class Registry(MBot):
         payload = dict(discordId=discord_id, method="registration", payload={"allyCode": allycode})
         endpoint = f"/api/{EndPoint.REGISTER.value}"
 
-        if hmac or self.hmac is True:
-            self.sign(method='POST', endpoint=endpoint, payload=payload)
-
-        resp: "httpx.Response" = self.client.post(endpoint, json=payload)
+        resp: "httpx.Response" = self._send('POST', endpoint, payload, hmac=hmac or self.hmac is True)
 
         if resp.status_code == 200:
-            return resp.json()
+            self._invalidate_identity(discord_id, allycode)
+            return self._decode(resp)
         raise RuntimeError(f"Unexpected result: {resp.content.decode()}")
 
     @func_timer
@@ -132,13 +280,12 @@ class Registry(MBot):
         payload = dict(discordId=discord_id, method="verification", primary=primary, payload={"allyCode": allycode})
         endpoint = f"/api/{EndPoint.VERIFY.value}"
 
-        if hmac or self.hmac is True:
-            self.sign(method='POST', endpoint=endpoint, payload=payload)
-
-        resp: "httpx.Response" = self.client.post(endpoint, json=payload)
+        resp: "httpx.Response" = self._send('POST', endpoint, payload, hmac=hmac or self.hmac is True)
 
         if resp.status_code == 200:
-            resp_json = resp.json()
+            resp_json = self._decode(resp)
+            verified = isinstance(resp_json, dict) and resp_json.get('verified') is True
+            self._invalidate_identity(discord_id, allycode, verified, primary)
             if 'verified' in resp_json:
                 return resp_json['verified']
         else:
@@ -146,6 +293,24 @@ class Registry(MBot):
 
         return False
 
+    def resolve_allycode(self, discord_id: str, *, hmac: bool = False) -> str | None:
+        """Return the (primary) allycode registered to a discord ID, using the identity cache when available
+
+            Args
+                discord_id: Discord user ID as a string.
+
+            Keyword Args
+                hmac: Boolean flag to indicate use of HMAC request signing.
+
+            Returns
+                Allycode as a string, or None if the discord ID is not registered
+        """
+        discord_id = self.cleanse_discord_id(discord_id)
+        if self.identity_cache is not None and (allycode := self.identity_cache.allycode_for(discord_id)):
+            return allycode
+        record = self.fetch_player(discord_id=discord_id, hmac=hmac)
+        return str(record['allyCode']) if isinstance(record, dict) and record.get('allyCode') else None
+
     # Async methods
     @func_timer
     async def fetch_player_async(
@@ -166,21 +331,47 @@ class Registry(MBot):
         """
 
         user_identifier = self.validate_arguments(allycode, discord_id)
+        if (cached := self._cached_player(user_identifier, not allycode)) is not None:
+            return cached
+
         payload = {'user': [user_identifier], 'endpoint': 'find'}
         endpoint = f"/api/{EndPoint.FETCH.value}"
 
-        if hmac or self.hmac is True:
-            self.sign(method='POST', endpoint=endpoint, payload=payload)
-
-        result: "httpx.Response" = await self.aclient.post(endpoint, json=payload)
+        result: "httpx.Response" = await self._asend('POST', endpoint, payload, hmac=hmac or self.hmac is True)
 
         if result.status_code == 200:
-            resp_data = result.json()
-            if isinstance(resp_data, list) and len(resp_data) == 1:
-                return resp_data[0]
-            return resp_data
+            resp_data = self._decode(result)
+            self._cache_player(user_identifier, not allycode, resp_data)
+            return self._player_result(resp_data)
         return {"msg": "Unexpected result", "reason": result.content.decode()}
 
+    @func_timer
+    async def fetch_players_async(
+            self, *,
+            allycodes: Iterable[str] | None = None,
+            discord_ids: Iterable[str] | None = None,
+            chunk_size: int | None = None,
+            concurrency: int = 4,
+            hmac: bool = False
+            ) -> dict[str, dict[str, Any]]:
+        """Async version of fetch_players()"""
+        identifiers = self._bulk_identifiers(allycodes, discord_ids)
+        is_hmac_signed = hmac or self.hmac is True
+        endpoint = f"/api/{EndPoint.FETCH.value}"
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+        async def _find(chunk: list[str]) -> list[dict[str, Any]]:
+            payload = {'user': chunk, 'endpoint': 'find'}
+            async with semaphore:
+                return self._find_records(await self._asend('POST', endpoint, payload, hmac=is_hmac_signed))
+
+        found, missing = self._split_cached(identifiers)
+        results = await asyncio.gather(*(_find(chunk) for chunk in self._find_chunks(missing, chunk_size)))
+        records = [record for chunk_records in results for record in chunk_records]
+        self._cache_records(records)
+        found.update(self._index_records(records, missing))
+        return found
+
     @func_timer
     async def register_player_async(self, discord_id: str, allycode: str, *, hmac: bool = False) -> dict[Any, Any]:
         """Register a player in the registry
@@ -202,13 +393,11 @@ class Registry(MBot):
         payload = dict(discordId=discord_id, method="registration", payload={"allyCode": allycode})
         endpoint = f"/api/{EndPoint.REGISTER.value}"
 
-        if hmac or self.hmac is True:
-            self.sign(method='POST', endpoint=endpoint, payload=payload)
-
-        resp: "httpx.Response" = await self.aclient.post(endpoint, json=payload)
+        resp: "httpx.Response" = await self._asend('POST', endpoint, payload, hmac=hmac or self.hmac is True)
 
         if resp.status_code == 200:
-            return resp.json()
+            self._invalidate_identity(discord_id, allycode)
+            return self._decode(resp)
         raise RuntimeError(f"Unexpected result: {resp.content.decode()}")
 
     @func_timer
@@ -237,16 +426,99 @@ class Registry(MBot):
         payload = dict(discordId=discord_id, method="verification", primary=primary, payload={"allyCode": allycode})
         endpoint = f"/api/{EndPoint.VERIFY.value}"
 
-        if hmac or self.hmac is True:
-            self.sign(method='POST', endpoint=endpoint, payload=payload)
-
-        resp: "httpx.Response" = await self.aclient.post(endpoint, json=payload)
+        resp: "httpx.Response" = await self._asend('POST', endpoint, payload, hmac=hmac or self.hmac is True)
 
         if resp.status_code == 200:
-            resp_json = resp.json()
+            resp_json = self._decode(resp)
+            verified = isinstance(resp_json, dict) and resp_json.get('verified') is True
+            self._invalidate_identity(discord_id, allycode, verified, primary)
             if 'verified' in resp_json:
                 return resp_json['verified']
         else:
             self.logger.error(f"Unexpected result: {resp.content.decode()}")
 
         return False
+
+    async def resolve_allycode_async(self, discord_id: str, *, hmac: bool = False) -> str | None:
+        """Async version of resolve_allycode()"""
+        discord_id = self.cleanse_discord_id(discord_id)
+        if self.identity_cache is not None and (allycode := self.identity_cache.allycode_for(discord_id)):
+            return allycode
+        record = await self.fetch_player_async(discord_id=discord_id, hmac=hmac)
+        return str(record['allyCode']) if isinstance(record, dict) and record.get('allyCode') else None
+
+    async def onboard_players_async(
+            self,
+            players: Iterable[tuple[str, str]],
+            *,
+            primary: bool = False,
+            concurrency: int = 10,
+            poll_interval: float = 15.0,
+            backoff_factor: float = 1.5,
+            max_interval: float = 120.0,
+            deadline: float = 900.0,
+            hmac: bool = False
+            ) -> AsyncIterator[OnboardingResult]:
+        """Register a batch of players, then poll verification for all of them until each verifies or time runs out
+
+            Args
+                players: Iterable of (discord_id, allycode) pairs
+
+            Keyword Args
+                primary: Passed to verify_player_async() for every player, Default: False
+                concurrency: Maximum number of requests in flight at once, Default: 10
+                poll_interval: Seconds to wait before the first verification round, Default: 15.0
+                backoff_factor: Multiplier applied to the wait after every round without progress, Default: 1.5
+                max_interval: Longest wait between verification rounds in seconds, Default: 120.0
+                deadline: Seconds after the start at which unverified players are given up on, Default: 900.0
+                hmac: Boolean flag to indicate use of HMAC request signing.
+
+            Yields
+                OnboardingResult events as they happen: one 'registered' or 'failed' per player, followed by
+                'verified' or 'expired' for each registered player.
+
+            Notes
+                All pending players are verified in one round per interval, so the request rate stays bounded by
+                concurrency however many players are onboarding. The wait resets to poll_interval whenever a round
+                verifies at least one player.
+        """
+        loop = asyncio.get_running_loop()
+        ends_at = loop.time() + deadline
+        # Ordered set of (discord_id, allycode) pairs awaiting verification. A discord ID may onboard several allycodes.
+        pending: dict[tuple[str, str], None] = {}
+
+        async def _register(player: tuple[str, str]) -> Any:
+            return await self.register_player_async(*player, hmac=hmac)
+
+        async for result in run_batch_async(_register, players, concurrency=concurrency):
+            discord_id, allycode = result.key
+            if result.ok:
+                pending[result.key] = None
+                yield OnboardingResult(discord_id, allycode, "registered", data=result.data)
+            else:
+                yield OnboardingResult(discord_id, allycode, "failed", error=result.error)
+
+        async def _verify(player: tuple[str, str]) -> bool:
+            return await self.verify_player_async(*player, primary=primary, hmac=hmac)
+
+        interval = poll_interval
+        while pending:
+            remaining = ends_at - loop.time()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(interval, remaining))
+
+            progressed = False
+            async for result in run_batch_async(_verify, list(pending), concurrency=concurrency):
+                discord_id, allycode = result.key
+                if result.ok and result.data:
+                    progressed = True
+                    del pending[result.key]
+                    yield OnboardingResult(discord_id, allycode, "verified")
+                elif not result.ok:
+                    self.logger.warning(f"Verification of {_redact_value('discord_id', discord_id)} failed: "
+                                        f"{result.error!r}")
+            interval = poll_interval if progressed else min(interval * backoff_factor, max_interval)
+
+        for discord_id, allycode in pending:
+            yield OnboardingResult(discord_id, allycode, "expired")
@@ -0,0 +1,114 @@
+"""
+Retry policy with exponential backoff, jitter and Retry-After handling
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Iterable
+
+import httpx
+
+__all__ = ["RetryPolicy"]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class RetryPolicy:
+    """Configuration for retrying failed requests
+
+    Args
+        max_attempts: Total number of attempts per request, including the first one, Default: 3
+
+    Keyword Args
+        backoff_base: Delay in seconds before the first retry, Default: 0.5
+        backoff_factor: Multiplier applied to the delay for each subsequent retry, Default: 2.0
+        backoff_max: Upper bound in seconds for a computed backoff delay, Default: 30.0
+        jitter: Fraction (0.0 - 1.0) of each backoff delay that is randomized. 1.0 gives "full jitter"
+                (uniform between 0 and the computed delay), 0.0 disables jitter, Default: 1.0
+        retry_statuses: HTTP status codes that trigger a retry, Default: 429, 500, 502, 503, 504
+        retry_transport_errors: Boolean flag to retry connection errors and timeouts, Default: True
+        respect_retry_after: Boolean flag to wait for the server supplied Retry-After header instead of the computed
+                             backoff when present, Default: True
+        max_retry_after: Longest Retry-After in seconds that will be honoured. Longer waits are not retried and the
+                         response is returned to the caller, Default: 60.0
+
+    Notes
+        Each retry is signed again with a fresh timestamp.
+    """
+
+    def __init__(self, max_attempts: int = 3, *, backoff_base: float = 0.5, backoff_factor: float = 2.0,
+                 backoff_max: float = 30.0, jitter: float = 1.0,
+                 retry_statuses: Iterable[int] = DEFAULT_RETRY_STATUSES, retry_transport_errors: bool = True,
+                 respect_retry_after: bool = True, max_retry_after: float = 60.0):
+        if not isinstance(max_attempts, int) or max_attempts < 1:
+            raise ValueError("max_attempts must be a positive integer")
+        if not 0.0 <= jitter <= 1.0:
+            raise ValueError("jitter must be between 0.0 and 1.0")
+
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_transport_errors = retry_transport_errors
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__name__}(max_attempts={self.max_attempts}, backoff_base={self.backoff_base}, "
+                f"backoff_factor={self.backoff_factor}, backoff_max={self.backoff_max}, jitter={self.jitter})")
+
+    def backoff(self, attempt: int) -> float:
+        """Return the jittered backoff delay in seconds to wait after the given (1-based) attempt failed"""
+        delay = min(self.backoff_base * self.backoff_factor ** (attempt - 1), self.backoff_max)
+        return delay * (1.0 - self.jitter * random.random())
+
+    @staticmethod
+    def retry_after(response: httpx.Response) -> float | None:
+        """Return the Retry-After header of a response in seconds, or None if absent or unparsable"""
+        value = response.headers.get('retry-after')
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+    def next_delay(self, attempt: int, *, response: httpx.Response | None = None,
+                   error: Exception | None = None) -> float | None:
+        """Return the seconds to wait before retrying, or None if the request should not be retried
+
+            Args
+                attempt: Number of the attempt that just completed, starting at 1
+
+            Keyword Args
+                response: Response received for the attempt, if any
+                error: Exception raised by the attempt, if any
+        """
+        if attempt >= self.max_attempts:
+            return None
+
+        if error is not None:
+            if self.retry_transport_errors and isinstance(error, httpx.TransportError):
+                return self.backoff(attempt)
+            return None
+
+        if response is None or response.status_code not in self.retry_statuses:
+            return None
+
+        if self.respect_retry_after:
+            retry_after = self.retry_after(response)
+            if retry_after is not None:
+                return retry_after if retry_after <= self.max_retry_after else None
+        return self.backoff(attempt)
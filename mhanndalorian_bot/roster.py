@@ -0,0 +1,215 @@
+"""
+Column-oriented roster index for guild-wide unit queries
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any, Iterable
+
+from mhanndalorian_bot.models import _RELIC_TIER_OFFSET, Player, _int
+
+try:
+    import numpy as np  # ty: ignore[unresolved-import]
+except ImportError:
+    np = None
+
+__all__ = ["RosterIndex"]
+
+
+class RosterIndex:
+    """Column-oriented index of roster units across many players
+
+    Each owned unit is one row stored in parallel typed arrays (member, unit, rarity, gear, relic, gp). Member and
+    unit identifiers are interned to integer codes. Filters on a single unit only touch that unit's rows; guild-wide
+    rollups are vectorized with NumPy when it is installed and fall back to plain loops over `array` otherwise.
+
+    Args
+        players: Optional iterable of PLAYER responses (dicts as returned by API.fetch_player or Player models)
+
+    Notes
+        Members are identified by playerId, falling back to allyCode. Relic values are relic levels (R0 = 0), not
+        raw relic tiers.
+    """
+
+    def __init__(self, players: Iterable[dict[str, Any] | Player] = ()):
+        self.member_ids: list[str] = []
+        self.member_names: dict[str, str] = {}
+        self.unit_ids: list[str] = []
+        self._member_codes: dict[str, int] = {}
+        self._unit_codes: dict[str, int] = {}
+        self._unit_rows: dict[int, list[int]] = {}
+        self._np_columns: dict[str, Any] | None = None
+
+        self.member = array('i')
+        self.unit = array('i')
+        self.rarity = array('b')
+        self.gear = array('b')
+        self.relic = array('b')
+        self.gp = array('q')
+
+        for player in players:
+            self.add_player(player)
+
+    def __len__(self) -> int:
+        return len(self.unit)
+
+    @classmethod
+    def from_players(cls, players: Iterable[dict[str, Any] | Player]) -> "RosterIndex":
+        """Build an index from PLAYER responses"""
+        return cls(players)
+
+    @classmethod
+    def from_guild(cls, guild: dict[str, Any]) -> "RosterIndex":
+        """Build an index from a GUILD response whose member entries include a `rosterUnit` list"""
+        index = cls()
+        index.add_guild(guild)
+        return index
+
+    @staticmethod
+    def _code(codes: dict[str, int], table: list[str], key: str) -> int:
+        code = codes.get(key)
+        if code is None:
+            code = codes[key] = len(table)
+            table.append(key)
+        return code
+
+    def _append(self, member_code: int, base_id: str, rarity: int, gear: int, relic: int, gp: int) -> None:
+        """Append one row, leaving the index unchanged if any column rejects its value"""
+        unit_code = self._unit_codes.get(base_id, len(self.unit_ids))
+        row = len(self.unit)
+        columns = (self.member, self.unit, self.rarity, self.gear, self.relic, self.gp)
+        appended = 0
+        try:
+            for column, value in zip(columns, (member_code, unit_code, rarity, gear, relic, gp)):
+                column.append(value)
+                appended += 1
+        except BaseException:
+            for column in columns[:appended]:
+                column.pop()
+            raise
+        self._code(self._unit_codes, self.unit_ids, base_id)
+        self._unit_rows.setdefault(unit_code, []).append(row)
+        self._np_columns = None
+
+    def add_player(self, player: dict[str, Any] | Player) -> None:
+        """Add every roster unit of a PLAYER response (dict or Player model) to the index"""
+        if isinstance(player, Player):
+            member_id = player.player_id or player.ally_code
+            self.member_names[member_id] = player.name
+            member_code = self._code(self._member_codes, self.member_ids, member_id)
+            for unit in player.roster:
+                self._append(member_code, unit.base_id, unit.rarity, unit.gear, unit.relic, unit.gp)
+            return
+
+        if 'rosterUnit' not in player and isinstance(player.get('events'), dict):
+            player = player['events']
+        member_id = player.get('playerId') or str(player.get('allyCode', ''))
+        self.member_names[member_id] = player.get('name') or player.get('playerName', '')
+        member_code = self._code(self._member_codes, self.member_ids, member_id)
+        for unit in player.get('rosterUnit') or ():
+            relic_tier = _int((unit.get('relic') or {}).get('currentTier'))
+            self._append(member_code,
+                         unit.get('definitionId', '').split(':', 1)[0],
+                         _int(unit.get('currentRarity')),
+                         _int(unit.get('currentTier')),
+                         max(relic_tier - _RELIC_TIER_OFFSET, 0),
+                         _int(unit.get('gp', unit.get('galacticPower'))))
+
+    def add_guild(self, guild: dict[str, Any]) -> None:
+        """Add members of a GUILD response that carry their roster (`rosterUnit`) to the index"""
+        if 'events' in guild and isinstance(guild['events'], dict):
+            guild = guild['events'].get('guild', guild['events'])
+        for member in guild.get('member') or ():
+            if 'rosterUnit' in member:
+                self.add_player(member)
+
+    def _array_columns(self) -> dict[str, array]:
+        return dict(member=self.member, unit=self.unit, rarity=self.rarity, gear=self.gear, relic=self.relic,
+                    gp=self.gp)
+
+    def _numpy_columns(self) -> dict[str, Any]:
+        """Return NumPy copies of the columns, built once and reused until the next row is added"""
+        assert np is not None  # only called when NumPy is installed
+        if self._np_columns is None:
+            self._np_columns = {name: np.array(col, dtype=col.typecode)
+                                for name, col in self._array_columns().items()}
+        return self._np_columns
+
+    def columns(self) -> dict[str, Any]:
+        """Return a snapshot of the columns, as NumPy arrays when NumPy is installed
+
+        The snapshot is a copy, so it stays valid (and the index stays growable) while the caller holds it.
+        """
+        if np is None:
+            return {name: col[:] for name, col in self._array_columns().items()}
+        return {name: col.copy() for name, col in self._numpy_columns().items()}
+
+    def _row_matches(self, row: int, min_rarity: int, min_gear: int, min_relic: int, min_gp: int) -> bool:
+        return (self.rarity[row] >= min_rarity and self.gear[row] >= min_gear
+                and self.relic[row] >= min_relic and self.gp[row] >= min_gp)
+
+    def filter(self, unit_id: str, *, min_rarity: int = 0, min_gear: int = 0, min_relic: int = 0,
+               min_gp: int = 0) -> list[str]:
+        """Return the IDs of members owning unit_id at or above every given threshold
+
+            Args
+                unit_id: Unit base ID, e.g. 'VADER'
+
+            Keyword Args
+                min_rarity: Minimum star level
+                min_gear: Minimum gear tier
+                min_relic: Minimum relic level
+                min_gp: Minimum unit galactic power
+        """
+        unit_code = self._unit_codes.get(unit_id.split(':', 1)[0])
+        if unit_code is None:
+            return []
+        return [self.member_ids[self.member[row]] for row in self._unit_rows[unit_code]
+                if self._row_matches(row, min_rarity, min_gear, min_relic, min_gp)]
+
+    def _mask(self, min_rarity: int, min_gear: int, min_relic: int, min_gp: int) -> Any:
+        cols = self._numpy_columns()
+        return ((cols['rarity'] >= min_rarity) & (cols['gear'] >= min_gear) & (cols['relic'] >= min_relic)
+                & (cols['gp'] >= min_gp))
+
+    def count_by_unit(self, *, min_rarity: int = 0, min_gear: int = 0, min_relic: int = 0,
+                      min_gp: int = 0) -> dict[str, int]:
+        """Return the number of members owning each unit at or above the given thresholds"""
+        if np is not None and len(self):
+            mask = self._mask(min_rarity, min_gear, min_relic, min_gp)
+            counts = np.bincount(self._numpy_columns()['unit'][mask], minlength=len(self.unit_ids))
+            return {self.unit_ids[code]: int(count) for code, count in enumerate(counts) if count}
+
+        counts: dict[str, int] = {}
+        for row in range(len(self)):
+            if self._row_matches(row, min_rarity, min_gear, min_relic, min_gp):
+                unit_id = self.unit_ids[self.unit[row]]
+                counts[unit_id] = counts.get(unit_id, 0) + 1
+        return counts
+
+    def group_by_unit(self, *, min_rarity: int = 0, min_gear: int = 0, min_relic: int = 0,
+                      min_gp: int = 0) -> dict[str, list[str]]:
+        """Return member IDs grouped by unit ID for rows at or above the given thresholds"""
+        groups: dict[str, list[str]] = {}
+        if np is not None and len(self):
+            rows = np.flatnonzero(self._mask(min_rarity, min_gear, min_relic, min_gp)).tolist()
+        else:
+            rows = [row for row in range(len(self))
+                    if self._row_matches(row, min_rarity, min_gear, min_relic, min_gp)]
+        for row in rows:
+            groups.setdefault(self.unit_ids[self.unit[row]], []).append(self.member_ids[self.member[row]])
+        return groups
+
+    def total_gp(self, unit_id: str | None = None) -> dict[str, int]:
+        """Return the summed unit GP per member, optionally restricted to one unit"""
+        totals: dict[str, int] = {}
+        if unit_id is not None:
+            unit_code = self._unit_codes.get(unit_id.split(':', 1)[0])
+            rows: Iterable[int] = self._unit_rows.get(unit_code, []) if unit_code is not None else []
+        else:
+            rows = range(len(self))
+        for row in rows:
+            member_id = self.member_ids[self.member[row]]
+            totals[member_id] = totals.get(member_id, 0) + self.gp[row]
+        return totals
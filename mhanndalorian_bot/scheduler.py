@@ -0,0 +1,258 @@
+"""
+Asyncio polling scheduler with adaptive intervals and change-only callbacks
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import heapq
+import inspect
+import itertools
+import json
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Hashable
+
+from mhanndalorian_bot.models import _int
+
+__all__ = ["PollJob", "PollScheduler", "raid_interval_hint", "tw_interval_hint"]
+
+logger = logging.getLogger(__name__)
+
+IntervalHint = Callable[[Any], "float | None"]
+
+
+def _digest(data: Any) -> str:
+    """Return a stable digest of decoded JSON data"""
+    return hashlib.blake2b(json.dumps(data, sort_keys=True, separators=(',', ':'), default=str).encode(),
+                           digest_size=16).hexdigest()
+
+
+def raid_interval_hint(data: Any, *, margin: float = 5.0, now: float | None = None) -> float | None:
+    """Interval hint for ACTIVERAID jobs
+
+        Returns the seconds until shortly after the raid's expireTime so the final result is picked up promptly, or
+        None when the response holds no active raid (the job then backs off to its maximum interval).
+
+        Keyword Args
+            margin: Seconds to wait past expireTime, Default: 5.0
+            now: Current epoch time in seconds, primarily for testing. Default: time.time()
+    """
+    if not isinstance(data, dict):
+        return None
+    raid = data.get('data') if isinstance(data.get('data'), dict) else data
+    expire_time = _int(raid.get('expireTime'))
+    if not expire_time:
+        return None
+    if expire_time > 1e11:  # epoch milliseconds
+        expire_time /= 1000
+    remaining = expire_time - (time.time() if now is None else now)
+    return max(remaining + margin, 0.0) if remaining > -margin else None
+
+
+def tw_interval_hint(data: Any) -> float | None:
+    """Interval hint for TW jobs
+
+        Returns infinity (i.e. poll at the maximum interval) when no TW is in progress, and None otherwise so the
+        interval follows the observed change rate. A TW is considered in progress while the response contains at
+        least one zone status for the home guild.
+    """
+    if not isinstance(data, dict):
+        return float('inf')
+    tw = data.get('data') if isinstance(data.get('data'), dict) else data
+    home = tw.get('homeGuild') or {}
+    return None if home.get('conflictStatus') else float('inf')
+
+
+class PollJob:
+    """Polling job managed by PollScheduler
+
+    Attributes
+        key: Job identifier, e.g. ('GUILD_ID', 'tw')
+        interval: Current polling interval in seconds
+        runs: Number of completed polls
+        changes: Number of polls that returned changed data
+        last_data: Data returned by the most recent successful poll
+    """
+
+    __slots__ = ("key", "fetch", "callback", "interval", "min_interval", "max_interval", "hint", "runs", "changes",
+                 "errors", "last_data", "_digest", "_next_run", "_active")
+
+    def __init__(self, key: Hashable, fetch: Callable[[], Awaitable[Any]], callback: Callable[..., Any], *,
+                 interval: float, min_interval: float, max_interval: float, hint: IntervalHint | None):
+        self.key = key
+        self.fetch = fetch
+        self.callback = callback
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.hint = hint
+        self.runs = 0
+        self.changes = 0
+        self.errors = 0
+        self.last_data: Any = None
+        self._digest: str | None = None
+        self._next_run = 0.0
+        self._active = True
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(key={self.key!r}, interval={self.interval:.1f}, runs={self.runs})"
+
+    def _clamp(self, interval: float) -> float:
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def _adapt(self, changed: bool, data: Any) -> None:
+        """Shorten the interval after a change and lengthen it while the data stays the same"""
+        self.interval = self._clamp(self.interval / 2 if changed else self.interval * 1.5)
+        if self.hint is not None:
+            suggested = self.hint(data)
+            if suggested is not None:
+                self.interval = self._clamp(min(self.interval, suggested) if suggested != float('inf')
+                                            else self.max_interval)
+
+
+class PollScheduler:
+    """Run many polling jobs from one event loop, calling back only when a job's data changes
+
+    Keyword Args
+        concurrency: Maximum number of fetches in flight at once, Default: 10
+        jitter: Fraction (0.0 - 1.0) by which each delay is randomly shortened so jobs with equal intervals drift
+                apart instead of firing together, Default: 0.1
+        stagger: Boolean flag to spread the first run of each job randomly across its initial interval instead of
+                 running it immediately, Default: True
+        clock: Monotonic time source, primarily for testing. Default: time.monotonic
+
+    Notes
+        Each job's interval halves (down to min_interval) when its data changed and grows by half (up to
+        max_interval) when it did not. An optional hint function can cap the next interval based on the response,
+        e.g. raid_interval_hint() polls right after a raid expires and tw_interval_hint() idles between wars.
+        Failed fetches are logged and retried after a doubled interval.
+    """
+
+    def __init__(self, *, concurrency: int = 10, jitter: float = 0.1, stagger: bool = True,
+                 clock: Callable[[], float] = time.monotonic):
+        if not isinstance(concurrency, int) or concurrency < 1:
+            raise ValueError("concurrency must be a positive integer")
+        if not 0.0 <= jitter <= 1.0:
+            raise ValueError("jitter must be between 0.0 and 1.0")
+
+        self.jitter = jitter
+        self.stagger = stagger
+        self.clock = clock
+        self.jobs: dict[Hashable, PollJob] = {}
+
+        self._concurrency = concurrency
+        self._queue: list[tuple[float, int, PollJob]] = []
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._tasks: set[asyncio.Task] = set()
+        self._running = False
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(jobs={len(self.jobs)}, running={self._running})"
+
+    def _schedule(self, job: PollJob, delay: float) -> None:
+        job._next_run = self.clock() + delay
+        heapq.heappush(self._queue, (job._next_run, next(self._counter), job))
+        self._wakeup.set()
+
+    def add(self, key: Hashable, fetch: Callable[[], Awaitable[Any]], callback: Callable[..., Any], *,
+            interval: float = 60.0, min_interval: float | None = None, max_interval: float | None = None,
+            hint: IntervalHint | None = None) -> PollJob:
+        """Add a polling job, replacing any job with the same key
+
+            Args
+                key: Job identifier, e.g. (guild_id, 'tw')
+                fetch: Coroutine function without arguments returning the data, e.g.
+                       functools.partial(api.fetch_tw_async, enums=True)
+                callback: Function or coroutine function called as callback(key, data, previous) when the data
+                          differs from the previous poll. The first successful poll always triggers it.
+
+            Keyword Args
+                interval: Initial polling interval in seconds, Default: 60.0
+                min_interval: Shortest interval, Default: interval / 4
+                max_interval: Longest interval, Default: interval * 10
+                hint: Optional function returning a suggested next interval for a response (see Notes on the class)
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        min_interval = interval / 4 if min_interval is None else min_interval
+        max_interval = interval * 10 if max_interval is None else max_interval
+        if not 0 < min_interval <= interval <= max_interval:
+            raise ValueError("intervals must satisfy 0 < min_interval <= interval <= max_interval")
+
+        self.remove(key)
+        job = PollJob(key, fetch, callback, interval=interval, min_interval=min_interval, max_interval=max_interval,
+                      hint=hint)
+        self.jobs[key] = job
+        self._schedule(job, random.random() * interval if self.stagger else 0.0)
+        return job
+
+    def remove(self, key: Hashable) -> None:
+        """Remove the job with the given key, if present"""
+        job = self.jobs.pop(key, None)
+        if job is not None:
+            job._active = False
+
+    async def _run_job(self, job: PollJob, semaphore: asyncio.Semaphore) -> None:
+        async with semaphore:
+            try:
+                data = await job.fetch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                job.errors += 1
+                job.interval = job._clamp(job.interval * 2)
+                logger.warning(f"Polling job {job.key!r} failed ({exc!r}), retrying in {job.interval:.1f}s")
+            else:
+                digest = _digest(data)
+                changed = digest != job._digest
+                previous, job.last_data, job._digest = job.last_data, data, digest
+                job.runs += 1
+                job._adapt(changed, data)
+                if changed:
+                    job.changes += 1
+                    try:
+                        result = job.callback(job.key, data, previous)
+                        if inspect.isawaitable(result):
+                            await result
+                    except Exception:
+                        logger.exception(f"Callback for polling job {job.key!r} raised")
+
+        if job._active:
+            self._schedule(job, job.interval * (1.0 - self.jitter * random.random()))
+
+    async def run(self) -> None:
+        """Run the jobs until stop() is called or the task is cancelled"""
+        semaphore = asyncio.Semaphore(self._concurrency)
+        self._running = True
+        try:
+            while self._running:
+                self._wakeup.clear()
+                while self._queue and not self._queue[0][2]._active:
+                    heapq.heappop(self._queue)
+                delay = self._queue[0][0] - self.clock() if self._queue else None
+                if delay is None or delay > 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                _, _, job = heapq.heappop(self._queue)
+                task = asyncio.create_task(self._run_job(job, semaphore))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        finally:
+            self._running = False
+            for task in self._tasks:
+                task.cancel()
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stop(self) -> None:
+        """Ask a running scheduler to return from run()"""
+        self._running = False
+        self._wakeup.set()
@@ -0,0 +1,111 @@
+"""
+Pluggable JSON serializers used to encode request payloads and decode responses
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import Any
+
+__all__ = ["JSONSerializer", "MsgspecSerializer", "OrjsonSerializer", "Serializer", "get_serializer"]
+
+logger = logging.getLogger(__name__)
+
+
+class Serializer(ABC):
+    """Interface for encoding payloads to compact JSON bytes and decoding response bodies
+
+    Encoded payloads are hashed for the HMAC signature and sent verbatim as the request body, so dumps() must be
+    deterministic for a given object.
+    """
+
+    name: str = ""
+
+    @abstractmethod
+    def dumps(self, obj: Any) -> bytes:
+        """Encode obj as compact UTF-8 JSON"""
+
+    @abstractmethod
+    def loads(self, data: bytes | str) -> Any:
+        """Decode a JSON document"""
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+class JSONSerializer(Serializer):
+    """Standard library json serializer"""
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode()
+
+    def loads(self, data: bytes | str) -> Any:
+        return json.loads(data)
+
+
+class OrjsonSerializer(Serializer):
+    """Serializer backed by the optional `orjson` package"""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson  # ty: ignore[unresolved-import]
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._dumps(obj)
+
+    def loads(self, data: bytes | str) -> Any:
+        return self._loads(data)
+
+
+class MsgspecSerializer(Serializer):
+    """Serializer backed by the optional `msgspec` package"""
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        import msgspec  # ty: ignore[unresolved-import]
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: bytes | str) -> Any:
+        return self._decoder.decode(data)
+
+
+_SERIALIZERS: dict[str, type[Serializer]] = {
+    cls.name: cls for cls in (OrjsonSerializer, MsgspecSerializer, JSONSerializer)
+}
+
+
+def get_serializer(name: str = "auto") -> Serializer:
+    """Return a serializer instance by name
+
+        Args
+            name: One of 'json', 'orjson', 'msgspec' or 'auto'. 'auto' (default) selects the fastest installed
+                  library in the order orjson, msgspec, json.
+
+        Raises
+            ValueError: if the name is unknown
+            ImportError: if the named optional library is not installed
+    """
+    if name == "auto":
+        for cls in _SERIALIZERS.values():
+            try:
+                serializer = cls()
+            except ImportError:
+                continue
+            logger.debug(f"Using {serializer.name} serializer")
+            return serializer
+
+    if name not in _SERIALIZERS:
+        raise ValueError(f"Unknown serializer {name!r}. Expected one of: auto, {', '.join(_SERIALIZERS)}")
+    return _SERIALIZERS[name]()
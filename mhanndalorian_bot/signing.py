@@ -0,0 +1,71 @@
+"""
+Precomputed HMAC request signing used on the request hot path
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac as _hmac
+import time
+
+__all__ = ["Signer"]
+
+
+class Signer:
+    """HMAC-SHA256 request signer for one API key
+
+    The signature is HMAC(api_key, timestamp + METHOD + endpoint + md5(body).hexdigest()). Keying the HMAC is done
+    once per instance and every signature starts from a copy() of that keyed state. The encoded method + endpoint
+    part is cached per (method, endpoint), so signing a request costs one md5 of the body, one HMAC copy and a
+    single update. The result is identical to MBot.sign(), without its decorators and debug logging.
+
+    Args
+        api_key: MHanndalorian Bot API key as a string
+
+    Notes
+        Instances are immutable apart from the part cache and may be shared between threads.
+    """
+
+    __slots__ = ("api_key", "_keyed", "_parts")
+
+    # Cached (method, endpoint) parts before the cache is cleared, bounding memory for arbitrary endpoint strings
+    max_parts = 256
+
+    def __init__(self, api_key: str):
+        if not isinstance(api_key, str):
+            raise ValueError("api_key must be a string")
+        self.api_key = api_key
+        self._keyed = _hmac.new(api_key.encode(), digestmod=hashlib.sha256)
+        self._parts: dict[tuple[str, str], bytes] = {}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(api_key='****{self.api_key[-4:]}')"
+
+    def _part(self, method: str, endpoint: str) -> bytes:
+        part = self._parts.get((method, endpoint))
+        if part is None:
+            if len(self._parts) >= self.max_parts:
+                self._parts.clear()
+            part = self._parts[(method, endpoint)] = method.upper().encode() + endpoint.encode()
+        return part
+
+    def signature(self, method: str, endpoint: str, body: bytes, timestamp: str) -> str:
+        """Return the hex HMAC signature of an encoded request body"""
+        mac = self._keyed.copy()
+        mac.update(timestamp.encode() + self._part(method, endpoint) + hashlib.md5(body).hexdigest().encode())
+        return mac.hexdigest()
+
+    def headers(self, method: str, endpoint: str, body: bytes, *, timestamp: str | None = None) -> dict[str, str]:
+        """Return the `x-timestamp` and `Authorization` headers for one request
+
+            Args
+                method: HTTP method as a string
+                endpoint: API endpoint path, e.g. '/api/tw'
+                body: Request body exactly as sent
+
+            Keyword Args
+                timestamp: Millisecond epoch timestamp string, Default: now
+        """
+        if timestamp is None:
+            timestamp = str(time.time_ns() // 1_000_000)
+        return {'x-timestamp': timestamp, 'Authorization': self.signature(method, endpoint, body, timestamp)}
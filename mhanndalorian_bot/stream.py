@@ -0,0 +1,230 @@
+"""
+Incremental JSON decoding for streaming large API responses
+"""
+
+from __future__ import annotations
+
+import codecs
+import re
+from json import JSONDecodeError, JSONDecoder
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator, Sequence
+
+__all__ = ["JSONArrayStream", "aiter_json_array", "iter_json_array"]
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_DECODER = JSONDecoder()
+# Characters that may continue a number or literal split across chunks
+_CONTINUATION = frozenset('.eE+-0123456789')
+
+# Parser states
+_VALUE = 0  # expecting the value for the current path component
+_OBJ_FIRST = 1  # after '{': key or '}'
+_OBJ_NEXT = 2  # after a member: ',' or '}'
+_OBJ_KEY = 3  # after ',': key
+_SKIP = 4  # skipping the value of a non-matching key
+_ARR_FIRST = 5  # after '[' of the target array: item or ']'
+_ARR_NEXT = 6  # after an item: ',' or ']'
+_ARR_ITEM = 7  # after ',': item
+_DONE = 8
+
+
+class _NeedMore(Exception):
+    """Raised internally when the buffer does not yet hold a complete token"""
+
+
+class JSONArrayStream:
+    """Push parser yielding the elements of one array nested inside a JSON document
+
+    Data is fed in arbitrary byte chunks and each array element is decoded as soon as it is complete, so peak
+    memory is bounded by the largest single element rather than the whole document.
+
+    Args
+        path: Sequence of object keys leading from the document root to the target array,
+              e.g. ``('events', 'guild', 'member')``. An empty path targets a top level array.
+
+    Notes
+        Values of non-matching keys that appear before the target are decoded and discarded. Parsing stops once
+        the target array is closed; the rest of the document is ignored. If the path does not exist the stream
+        yields nothing and ``found`` remains False.
+    """
+
+    def __init__(self, path: Sequence[str] = ()):
+        self.path = tuple(path)
+        self.found = False
+        self._depth = 0
+        self._state = _VALUE
+        self._buf = ""
+        self._pos = 0
+        self._retry_at = 0
+        self._eof = False
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+
+    @property
+    def done(self) -> bool:
+        """True once the target array has been fully read or is known to be missing"""
+        return self._state == _DONE
+
+    def feed(self, data: bytes) -> list[Any]:
+        """Add a chunk of the response body and return any array elements completed by it"""
+        if self._state == _DONE:
+            return []
+        self._buf += self._decoder.decode(data)
+        if len(self._buf) < self._retry_at:
+            return []
+        return self._parse()
+
+    def close(self) -> list[Any]:
+        """Signal the end of the body and return the remaining elements
+
+        Raises
+            ValueError: if the body ended inside the target array or contained invalid JSON
+        """
+        self._buf += self._decoder.decode(b"", final=True)
+        self._eof = True
+        items = self._parse() if self._state != _DONE else []
+        if self._state != _DONE:
+            raise ValueError("Truncated JSON document: stream ended before the target array was closed")
+        return items
+
+    def _skip_ws(self) -> str:
+        """Advance past whitespace and return the next character without consuming it"""
+        match = _WHITESPACE.match(self._buf, self._pos)
+        if match is not None:
+            self._pos = match.end()
+        if self._pos >= len(self._buf):
+            raise _NeedMore
+        return self._buf[self._pos]
+
+    def _decode_value(self) -> Any:
+        """Decode one complete JSON value at the current position"""
+        try:
+            value, end = _DECODER.raw_decode(self._buf, self._pos)
+        except JSONDecodeError:
+            if self._eof:
+                raise
+            raise _NeedMore
+        # A number or literal ending at the buffer boundary, or stopping short of a fraction or exponent
+        # (e.g. "1." or "2e"), may continue in the next chunk
+        if not self._eof and (end == len(self._buf) or self._buf[end] in _CONTINUATION):
+            raise _NeedMore
+        self._pos = end
+        return value
+
+    def _decode_key(self) -> str:
+        """Decode an object key and its ':' separator"""
+        try:
+            key, end = _DECODER.raw_decode(self._buf, self._pos)
+        except JSONDecodeError:
+            if self._eof:
+                raise
+            raise _NeedMore
+        self._pos = end
+        if self._skip_ws() != ':':
+            raise JSONDecodeError("Expecting ':' delimiter", self._buf, self._pos)
+        self._pos += 1
+        return key
+
+    def _parse(self) -> list[Any]:
+        items: list[Any] = []
+        while self._state != _DONE:
+            checkpoint = (self._pos, self._state, self._depth)
+            try:
+                self._step(items)
+            except _NeedMore:
+                self._pos, self._state, self._depth = checkpoint
+                pending = len(self._buf) - self._pos
+                # Wait for the pending span to double before retrying, keeping re-parsing linear overall
+                self._retry_at = len(self._buf) + max(pending, 1)
+                break
+        self._compact()
+        return items
+
+    def _compact(self) -> None:
+        """Drop consumed text from the buffer"""
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._retry_at = max(self._retry_at - self._pos, 0)
+            self._pos = 0
+
+    def _step(self, items: list[Any]) -> None:
+        state = self._state
+        char = self._skip_ws()
+
+        if state == _VALUE:
+            if self._depth == len(self.path):
+                if char != '[':
+                    self._state = _DONE
+                    return
+                self.found = True
+                self._state = _ARR_FIRST
+            elif char != '{':
+                self._state = _DONE
+                return
+            else:
+                self._state = _OBJ_FIRST
+            self._pos += 1
+
+        elif state in (_OBJ_FIRST, _OBJ_KEY):
+            if char == '}' and state == _OBJ_FIRST:
+                self._state = _DONE
+                return
+            if char != '"':
+                raise JSONDecodeError("Expecting property name enclosed in double quotes", self._buf, self._pos)
+            key = self._decode_key()
+            if key == self.path[self._depth]:
+                self._depth += 1
+                self._state = _VALUE
+            else:
+                self._state = _SKIP
+
+        elif state == _SKIP:
+            self._decode_value()
+            self._state = _OBJ_NEXT
+
+        elif state == _OBJ_NEXT:
+            if char == ',':
+                self._state = _OBJ_KEY
+            elif char == '}':
+                self._state = _DONE
+            else:
+                raise JSONDecodeError("Expecting ',' delimiter", self._buf, self._pos)
+            self._pos += 1
+
+        elif state in (_ARR_FIRST, _ARR_ITEM):
+            if char == ']' and state == _ARR_FIRST:
+                self._pos += 1
+                self._state = _DONE
+                return
+            items.append(self._decode_value())
+            self._state = _ARR_NEXT
+
+        elif state == _ARR_NEXT:
+            if char == ',':
+                self._state = _ARR_ITEM
+            elif char == ']':
+                self._state = _DONE
+            else:
+                raise JSONDecodeError("Expecting ',' delimiter", self._buf, self._pos)
+            self._pos += 1
+
+
+def iter_json_array(chunks: Iterable[bytes], path: Sequence[str] = ()) -> Iterator[Any]:
+    """Yield the elements of the array at ``path`` from an iterable of JSON byte chunks"""
+    parser = JSONArrayStream(path)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.done:
+            return
+    yield from parser.close()
+
+
+async def aiter_json_array(chunks: AsyncIterable[bytes], path: Sequence[str] = ()) -> AsyncIterator[Any]:
+    """Async version of iter_json_array()"""
+    parser = JSONArrayStream(path)
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+        if parser.done:
+            return
+    for item in parser.close():
+        yield item
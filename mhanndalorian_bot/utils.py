@@ -9,6 +9,8 @@ import time
 from functools import wraps
 from typing import Any, Iterable
 
+from mhanndalorian_bot.attrs import EndPoint
+
 logger = logging.getLogger(__name__)
 
 _SENSITIVE_ARG_NAMES = frozenset({"api_key", "apikey", "discord_id", "allycode", "authorization", "token"})
@@ -38,6 +40,14 @@ def _format_redacted_call(func, args: tuple, kwargs: dict[str, Any]) -> str:
         return f"args={args!r}, kwargs={kwargs!r}"
 
 
+def endpoint_name(endpoint: EndPoint | str) -> str:
+    """Normalize an EndPoint member, endpoint name or '/api/<name>' path to the bare endpoint name"""
+    if isinstance(endpoint, EndPoint):
+        return endpoint.value
+    endpoint = endpoint.strip('/')
+    return endpoint[4:] if endpoint.startswith('api/') else endpoint
+
+
 def func_timer(f):
     """Decorator to record total execution time of a function to the configured logger using level DEBUG"""
 
@@ -0,0 +1,42 @@
+import pytest
+
+from mhanndalorian_bot.analytics import RaidTracker
+
+T0 = 1_700_000_000
+EXPIRE = T0 + 10_000
+
+
+def _raid(raid_id, *progress):
+    return {"data": {"raidId": raid_id, "expireTime": str(EXPIRE * 1000), "raidMember": [
+        {"playerId": f"P{n}", "memberProgress": str(value), "memberRank": n} for n, value in enumerate(progress, 1)]}}
+
+
+def test_snapshots_store_only_changes():
+    tracker = RaidTracker(window=600)
+    tracker.add(_raid("R1", 0, 0), key="G1", timestamp=T0)
+    tracker.add(_raid("R1", 100, 0), key="G1", timestamp=T0 + 300)
+    history = tracker.add(_raid("R1", 100, 50), key="G1", timestamp=T0 + 600)
+
+    assert len(history) == 3
+    assert [len(d) for d in history._deltas] == [1, 1]
+    assert history.series("P1") == [(T0 + 300, 100)]
+    assert history.progress("P2") == 50
+
+    projection = tracker.projections()["G1"]
+    assert projection.expire_time == EXPIRE
+    assert projection.rate == pytest.approx(150 / 600)
+    assert projection.projected == 150 + round(150 / 600 * (10_000 - 600))
+
+    p1, p2 = history.member_stats(window=300)
+    assert p1.rate == 0.0 and p2.rate == pytest.approx(50 / 300)
+
+
+def test_new_raid_resets_history_and_order_is_enforced():
+    tracker = RaidTracker()
+    tracker.add_many([("G1", _raid("R1", 10)), ("G2", _raid("R9", 5))], timestamp=T0)
+    assert tracker.add(_raid("R2", 1), key="G1", timestamp=T0 + 60).raid_id == "R2"
+    assert len(tracker.raids["G1"]) == 1
+    with pytest.raises(ValueError):
+        tracker.add(_raid("R2", 2), key="G1", timestamp=T0)
+    tracker.discard("G2")
+    assert list(tracker.raids) == ["G1"]
@@ -0,0 +1,51 @@
+import pytest
+
+from mhanndalorian_bot.analytics import TBAnalytics
+
+TB = {"data": {"id": "TB1", "currentStat": [
+    {"mapStatId": "power_round_1",
+     "playerStat": [{"memberId": "P1", "score": "100"}, {"memberId": "P2", "score": "0"}]},
+    {"mapStatId": "power_round_2", "playerStat": [{"memberId": "P2", "score": "50"}]},
+    {"mapStatId": "strike_attempt_round_1", "playerStat": [{"memberId": "P1", "score": "4"}]},
+    {"mapStatId": "strike_encounter_round_1", "playerStat": [{"memberId": "P1", "score": "3"}]},
+    {"mapStatId": "covert_complete_round_1", "playerStat": [{"memberId": "P2", "score": "1"}]},
+    {"mapStatId": "summary", "playerStat": [{"memberId": "P9", "score": "1"}]},
+], "conflictZoneStatus": [
+    {"zoneStatus": {"zoneId": "z_top", "score": "90"}},
+    {"zoneStatus": {"zoneId": "z_bottom", "score": "10"}},
+], "strikeZoneStatus": [{"zoneStatus": {"zoneId": "z_top_strike01", "score": "5"}}]}}
+LOGS = [{"authorId": "P1", "data": [{"activity": {"zoneData": {"zoneId": "z_top_strike01", "scoreDelta": "5"}}}]},
+        {"authorId": "P1", "data": [{"activity": {"zoneData": {"zoneId": "z_top_strike01", "scoreDelta": 7}}}]}]
+
+
+@pytest.fixture
+def analytics():
+    analytics = TBAnalytics()
+    assert analytics.add(TB, LOGS, guild_id="G1") == "G1"
+    return analytics
+
+
+def test_member_tables_and_rollups(analytics):
+    p1 = analytics.members["G1"]["P1"]
+    assert (p1.deployed, p1.combat_attempts, p1.waves, p1.wave_rate) == (100, 4, 3, 0.75)
+    assert analytics.members["G1"]["P2"].special_completed == 1
+    assert "P9" not in analytics.members["G1"]
+    assert analytics.undeployed("G1", ["P1", "P2", "P3"]) == ["P3"]
+    assert analytics.undeployed("G1", ["P1", "P2"], round_number=1) == ["P2"]
+    assert analytics.guild_wave_rate("G1") == 0.75
+    assert analytics.zones["G1"]["z_top_strike01"].kind == "strike"
+    assert [(r.member_id, r.events, r.score) for r in analytics.zone_activity("G1", "z_top_strike01")] == [
+        ("P1", 2, 12)]
+
+
+def test_star_projection_fills_smallest_gaps_first(analytics):
+    thresholds = {"z_top": (100, 200, 300), "z_bottom": (50, 100, 150)}
+    projection = analytics.project_stars("G1", thresholds, available=60)
+    assert projection["z_top"] == ("z_top", 90, 0, 100, 1)
+    assert projection["z_bottom"] == ("z_bottom", 10, 0, 50, 1)
+
+
+def test_add_replaces_previous_guild_data(analytics):
+    analytics.add({"data": {"currentStat": []}}, guild_id="G1")
+    assert analytics.member_rows("G1") == [] and analytics.zones["G1"] == {}
+    assert analytics.add_many([(TB, None)]) == ["TB1"]
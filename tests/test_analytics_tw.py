@@ -0,0 +1,41 @@
+from mhanndalorian_bot.analytics import TWAnalytics
+
+
+def _side(guild_id, zones):
+    return {"profile": {"id": guild_id}, "conflictStatus": [
+        {"zoneStatus": {"zoneId": zone_id, "score": str(score), "zoneState": "ZONEOPEN"},
+         "warSquad": [{"squadId": f"{guild_id}-{zone_id}-{n}", "playerId": player, "playerName": player.lower(),
+                       "squadStatus": status, "power": "100", "successfulDefends": defends}
+                      for n, (player, status, defends) in enumerate(squads)]}
+        for zone_id, score, squads in zones]}
+
+
+TW = {"data": {"instanceId": "TW1",
+               "homeGuild": _side("G1", [("t1", 100, [("P1", "SQUADAVAILABLE", 2), ("P2", "SQUADDEFEATED", 0)])]),
+               "awayGuild": _side("G2", [("t1", 50, [("X1", "SQUADDEFEATED", 0), ("X2", "SQUADAVAILABLE", 1),
+                                                     ("X3", "SQUADAVAILABLE", 0)])])}}
+LOGS = {"data": [
+    {"authorId": "P1", "authorName": "p1", "data": [{"activity": {"zoneData": {"zoneId": "t1", "scoreDelta": "22"}}}]},
+    {"authorId": "P1", "data": [{"activity": {"zoneData": {"zoneId": "t1", "scoreDelta": 10}}}]},
+    {"authorId": "P3", "authorName": "p3", "data": [{"activity": {"zoneData": {"zoneId": "t1"}}}]},
+]}
+
+
+def test_tw_tables_and_projection():
+    analytics = TWAnalytics(banners_per_squad=20)
+    summary = analytics.add(TW, LOGS)
+
+    assert [(z.guild_id, z.score, z.squads, z.remaining) for z in analytics.zones] == [("G1", 100, 2, 1),
+                                                                                     ("G2", 50, 3, 2)]
+    assert len(analytics.squads) == 5
+    p1 = analytics.members_for("G1")[0]
+    assert (p1.player_id, p1.attacks, p1.banners, p1.squads_placed, p1.defends) == ("P1", 2, 32, 1, 2)
+    assert p1.banner_efficiency == 16.0
+    assert summary == ("G1", "TW1", "G2", 100, 50, 100 + 2 * 16, 50 + 1 * 20)
+
+
+def test_add_many_without_logs_uses_default_efficiency():
+    analytics = TWAnalytics(banners_per_squad=10)
+    summaries = analytics.add_many([(TW, None), (TW["data"], None)])
+    assert [s.projected_score for s in summaries] == [120, 120]
+    assert len(analytics.summaries) == 2
@@ -1,4 +1,7 @@
 # tests/test_api.py
+import asyncio
+import json
+
 import pytest
 from pytest_httpx import HTTPXMock
 
@@ -19,3 +22,77 @@ async def test_mock_fetch_data_async(httpx_mock: HTTPXMock):
     httpx_mock.add_response(json={"success": True}, status_code=200)
     response = await api_instance.fetch_data_async(endpoint=EndPoint.TW)
     assert response == {"success": True}
+
+
+@pytest.mark.asyncio
+async def test_fetch_players_many(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(json={"events": {"name": "player"}}, status_code=200, is_reusable=True)
+    results = [r async for r in api_instance.fetch_players_many(["123456789", "987654321", 123])]
+    by_key = {r.key: r for r in results}
+    assert by_key["123456789"].data == {"name": "player"}
+    assert by_key["987654321"].ok
+    assert isinstance(by_key[123].error, TypeError)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_signed_requests_use_own_signature(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(json={}, status_code=200, is_reusable=True)
+    payloads = [{"payload": {"allyCode": str(n) * 9}} for n in range(1, 6)]
+    await asyncio.gather(*(api_instance.fetch_data_async(EndPoint.TW, payload=p) for p in payloads))
+    for request in httpx_mock.get_requests():
+        body = json.loads(request.content)
+        expected = api_instance.sign("POST", "/api/tw", body, timestamp=request.headers["x-timestamp"])
+        assert request.headers["Authorization"] == expected["Authorization"]
+        assert "api-key" not in request.headers
+
+
+def test_fetch_many_threaded_signs_each_request(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(json={"events": {"name": "player"}}, status_code=200, is_reusable=True)
+    allycodes = [str(n) * 9 for n in range(1, 9)]
+    results = {r.key: r for r in api_instance.fetch_many_threaded("fetch_player", allycodes + [123], max_workers=4,
+                                                                    hmac=True)}
+    assert all(results[code].data == {"name": "player"} for code in allycodes)
+    assert isinstance(results[123].error, TypeError)
+    requests = httpx_mock.get_requests()
+    assert sorted(json.loads(r.content)["payload"]["allyCode"] for r in requests) == allycodes
+    for request in requests:
+        expected = api_instance.sign("POST", request.url.path, request.content,
+                                     timestamp=request.headers["x-timestamp"])
+        assert request.headers["Authorization"] == expected["Authorization"]
+
+
+def test_fetch_guild_members_iter(httpx_mock: HTTPXMock):
+    members = [{"playerId": str(n)} for n in range(5)]
+    httpx_mock.add_response(json={"events": {"guild": {"member": members}}}, status_code=200)
+    assert list(api_instance.fetch_guild_members_iter("G1")) == members
+
+
+@pytest.mark.asyncio
+async def test_fetch_twlogs_iter_async(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(json={"code": 0, "data": [{"id": "a"}, {"id": "b"}]}, status_code=200)
+    assert [entry["id"] async for entry in api_instance.fetch_twlogs_iter_async()] == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_allycode_override_builds_payload_per_call(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(json={}, status_code=200, is_reusable=True)
+    allycodes = ["111-111-111", "222222222", "333-333-333"]
+    await asyncio.gather(*(api_instance.fetch_inventory_async(allycode=code) for code in allycodes))
+    api_instance.fetch_gac(allycode="444444444", enums=True)
+    bodies = [json.loads(r.content)["payload"] for r in httpx_mock.get_requests()]
+    assert sorted(body["allyCode"] for body in bodies) == ["111111111", "222222222", "333333333", "444444444"]
+    assert bodies[-1]["enums"] is True
+    assert api_instance.payload == {"payload": {"allyCode": "123456789"}}
+    with pytest.raises(ValueError):
+        api_instance.fetch_arena(allycode="12345")
+
+
+@pytest.mark.asyncio
+async def test_guild_methods_reject_allycode(httpx_mock: HTTPXMock):
+    with pytest.raises(TypeError, match="allycode"):
+        api_instance.fetch_guild("G1", allycode="111111111")
+    with pytest.raises(TypeError, match="allycode"):
+        await api_instance.fetch_guild_async("G1", allycode="111111111")
+    with pytest.raises(TypeError, match="allycode"):
+        api_instance.fetch_guild_members_iter("G1", allycode="111111111")
+    assert httpx_mock.get_requests() == []
@@ -1,3 +1,6 @@
+import threading
+
+import httpx
 import pytest
 
 from mhanndalorian_bot.base import MBot
@@ -80,3 +83,85 @@ def test_set_api_host_invalid_type():
     """Test setting an invalid API host with a non-string type."""
     with pytest.raises(TypeError, match="api_host"):
         MBot.set_api_host(12345)
+
+
+def test_sign_returns_headers_without_mutating_state():
+    """Signing returns per-request headers and leaves instance headers untouched."""
+    bot = MBot(api_key="12345678abcdefgh", allycode="123456789")
+    before = dict(bot.headers)
+    headers = bot.sign("POST", "/api/tw", {"payload": {"allyCode": "123456789"}}, timestamp="1700000000000")
+    assert headers["x-timestamp"] == "1700000000000"
+    assert len(headers["Authorization"]) == 64
+    assert bot.headers == before
+
+
+def test_request_headers_replace_api_key_when_signed():
+    """HMAC requests carry the signature instead of the raw api-key header."""
+    bot = MBot(api_key="12345678abcdefgh", allycode="123456789")
+    signed = bot._request_headers("POST", "/api/tw", b'{"payload":{}}', hmac=True)
+    unsigned = bot._request_headers("POST", "/api/tw", b'{"payload":{}}', hmac=False)
+    assert "api-key" not in signed and "Authorization" in signed
+    assert unsigned["api-key"] == "12345678abcdefgh" and "Authorization" not in unsigned
+
+
+def test_instances_do_not_share_state():
+    """Each instance owns its own credentials, payload and HTTP clients."""
+    first = MBot(api_key="first_key", allycode="111111111")
+    second = MBot(api_key="second_key", allycode="222222222")
+    assert first.headers["api-key"] == "first_key"
+    assert first.payload["payload"]["allyCode"] == "111111111"
+    assert first.client is not second.client
+    assert first.aclient is not second.aclient
+
+
+def test_clients_created_lazily_with_limits():
+    """HTTP clients are built on first access using the configured options."""
+    limits = httpx.Limits(max_connections=5, max_keepalive_connections=2)
+    bot = MBot(api_key="12345678abcdefgh", allycode="123456789", limits=limits, timeout=10)
+    assert bot._client is None and bot._aclient is None
+    assert bot.client.timeout == httpx.Timeout(10)
+    assert bot._aclient is None
+
+
+def test_shared_client_not_closed():
+    """A caller supplied client is used as-is and left open by close()."""
+    shared = httpx.Client(base_url="https://example.com")
+    bot = MBot(api_key="12345678abcdefgh", allycode="123456789", client=shared)
+    assert bot.client is shared
+    bot.close()
+    assert not shared.is_closed
+    shared.close()
+
+
+def test_lazy_client_created_once_across_threads():
+    """Threads racing for the lazy client all receive the same instance."""
+    bot = MBot(api_key="12345678abcdefgh", allycode="123456789")
+    barrier = threading.Barrier(8)
+    clients = []
+
+    def worker():
+        barrier.wait()
+        clients.append(bot.client)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(client) for client in clients}) == 1
+    bot.close()
+
+
+def test_signer_matches_sign_and_follows_api_key_changes():
+    """The precomputed signer used for requests produces the same signature as sign()."""
+    bot = MBot(api_key="12345678abcdefgh", allycode="123456789")
+    body = b'{"payload":{"allyCode":"123456789"}}'
+    for method, endpoint in (("POST", "/api/tw"), ("post", "/api/player"), ("POST", "/api/tw")):
+        fast = bot._request_headers(method, endpoint, body, hmac=True)
+        assert fast["Authorization"] == bot.sign(method, endpoint, body, timestamp=fast["x-timestamp"])["Authorization"]
+    assert len(bot._signer._parts) == 2
+
+    bot.set_api_key("otherkey87654321")
+    fast = bot._request_headers("POST", "/api/tw", body, hmac=True)
+    assert bot._signer.api_key == "otherkey87654321"
+    assert fast["Authorization"] == bot.sign("POST", "/api/tw", body, timestamp=fast["x-timestamp"])["Authorization"]
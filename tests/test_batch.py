@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from mhanndalorian_bot.batch import BatchResult, run_batch_async, run_batch_threaded
+
+
+async def _collect(agen):
+    return [item async for item in agen]
+
+
+@pytest.mark.asyncio
+async def test_run_batch_async_bounds_concurrency():
+    """No more than `concurrency` calls are awaiting at once."""
+    in_flight = 0
+    peak = 0
+
+    async def work(key):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return key * 2
+
+    results = await _collect(run_batch_async(work, range(20), concurrency=4))
+    assert peak == 4
+    assert sorted(r.data for r in results) == [k * 2 for k in range(20)]
+    assert all(r.ok for r in results)
+
+
+@pytest.mark.asyncio
+async def test_run_batch_async_reports_item_failures():
+    """A failing item is reported in BatchResult.error and does not abort the batch."""
+    async def work(key):
+        if key == 2:
+            raise RuntimeError("boom")
+        return key
+
+    results = {r.key: r for r in await _collect(run_batch_async(work, [1, 2, 3]))}
+    assert results[1] == BatchResult(1, 1)
+    assert not results[2].ok
+    assert isinstance(results[2].error, RuntimeError)
+    assert results[3].data == 3
+
+
+@pytest.mark.asyncio
+async def test_run_batch_async_invalid_concurrency():
+    """Concurrency must be a positive integer."""
+    async def work(key):
+        return key
+
+    with pytest.raises(ValueError, match="concurrency"):
+        await _collect(run_batch_async(work, [1], concurrency=0))
+
+
+def test_run_batch_threaded_bounds_workers():
+    """No more than `max_workers` calls run at once and failures are reported per key."""
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def work(key):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+        if key == 3:
+            raise RuntimeError("boom")
+        return key * 2
+
+    results = {r.key: r for r in run_batch_threaded(work, iter(range(12)), max_workers=3)}
+    assert peak == 3
+    assert isinstance(results[3].error, RuntimeError)
+    assert [results[k].data for k in range(12) if k != 3] == [k * 2 for k in range(12) if k != 3]
@@ -0,0 +1,166 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from mhanndalorian_bot.api import API
+from mhanndalorian_bot.attrs import EndPoint
+from mhanndalorian_bot.cache import ResponseCache, SQLiteCacheBackend
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_expiry_and_per_endpoint_ttls():
+    """Entries expire after the TTL configured for their endpoint."""
+    clock = FakeClock()
+    cache = ResponseCache(ttl=60, ttls={EndPoint.TW: 30}, clock=clock)
+    tw_key = cache.make_key("/api/tw", {"payload": {}})
+    player_key = cache.make_key(EndPoint.PLAYER, {"payload": {}})
+    cache.set(tw_key, "tw", cache.ttl_for("/api/tw"))
+    cache.set(player_key, "player", cache.ttl_for(EndPoint.PLAYER))
+
+    clock.now = 45
+    assert cache.get(tw_key) is None
+    assert cache.get(player_key) == "player"
+
+
+def test_key_is_canonical():
+    """Payload key order does not affect the cache key."""
+    assert ResponseCache.make_key("tw", {"a": 1, "b": 2}) == ResponseCache.make_key(EndPoint.TW, {"b": 2, "a": 1})
+
+
+def test_default_ttls_favour_live_endpoints():
+    """Volatile endpoints expire quickly and user TTLs override the defaults."""
+    cache = ResponseCache(ttl=60, ttls={EndPoint.PLAYER: 30})
+    assert cache.ttl_for(EndPoint.TW) == cache.ttl_for(EndPoint.RAID) == 15
+    assert cache.ttl_for(EndPoint.GUILD) == 300
+    assert cache.ttl_for(EndPoint.PLAYER) == 30
+    assert cache.ttl_for(EndPoint.INVENTORY) == 60
+
+
+def test_shared_cache_is_scoped_to_credentials(httpx_mock: HTTPXMock):
+    """Instances with different credentials sharing a cache do not see each other's responses."""
+    httpx_mock.add_response(json={"owner": "a"}, status_code=200)
+    httpx_mock.add_response(json={"owner": "b"}, status_code=200)
+    cache = ResponseCache()
+    first = API("key_a", "123456789", cache=cache)
+    second = API("key_b", "123456789", cache=cache)
+    assert first.fetch_inventory() == {"owner": "a"}
+    assert second.fetch_inventory() == {"owner": "b"}
+    assert API("key_a", "123456789", cache=cache).fetch_inventory() == {"owner": "a"}
+    assert len(httpx_mock.get_requests()) == 2
+
+
+def test_lru_eviction():
+    """The least recently used entry is evicted once max_entries is exceeded."""
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", 1, 60)
+    cache.set("b", 2, 60)
+    cache.get("a")
+    cache.set("c", 3, 60)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_get_or_fetch_coalesces_threads():
+    """Concurrent threads requesting the same key trigger a single fetch."""
+    cache = ResponseCache()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(1)
+        return {"ok": True}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch("k", fetch, ttl=60)))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for _ in range(1000):
+        if cache.coalesced == 4:
+            break
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"ok": True}] * 5
+    assert cache.stats.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_data_async_single_flight(httpx_mock: HTTPXMock):
+    """N concurrent identical requests become one HTTP call; later calls are cache hits."""
+    httpx_mock.add_response(json={"data": 1}, status_code=200)
+    api = API("mock_api_key", "123456789", cache=ResponseCache(ttl=30))
+    results = await asyncio.gather(*(api.fetch_tw_async() for _ in range(10)))
+    assert results == [{"data": 1}] * 10
+    assert await api.fetch_tw_async() == {"data": 1}
+    assert len(httpx_mock.get_requests()) == 1
+    assert api.cache.stats.hits == 1 and api.cache.stats.coalesced == 9
+
+
+def test_fetch_data_cache_bypass(httpx_mock: HTTPXMock):
+    """cache=False always sends a request."""
+    httpx_mock.add_response(json={"data": 1}, status_code=200, is_reusable=True)
+    api = API("mock_api_key", "123456789", cache=ResponseCache(ttl=30))
+    api.fetch_inventory()
+    api.fetch_inventory(cache=False)
+    assert len(httpx_mock.get_requests()) == 2
+
+
+def test_sqlite_backend_persists_across_instances(tmp_path):
+    """Entries written by one backend are visible to a new backend opened on the same file."""
+    path = tmp_path / "cache" / "responses.db"
+    writer = SQLiteCacheBackend(path)
+    writer.set("player|{}", {"name": "Mar", "rosterUnit": [{"definitionId": "VADER"}] * 100}, 300)
+    writer.close()
+
+    reader = SQLiteCacheBackend(path)
+    assert reader.get("player|{}")["name"] == "Mar"
+    assert reader.stored_at("player|{}") is not None
+    assert len(reader) == 1
+    reader.close()
+
+
+def test_sqlite_backend_expiry_and_invalidate(tmp_path):
+    """Expired rows are not returned and invalidation removes rows by endpoint."""
+    clock = FakeClock()
+    backend = SQLiteCacheBackend(tmp_path / "responses.db", clock=clock)
+    cache = ResponseCache(backend=backend, ttls={EndPoint.TW: 30, EndPoint.GUILD: 600})
+    cache.set(cache.make_key(EndPoint.TW, {}), {"tw": 1}, cache.ttl_for(EndPoint.TW))
+    cache.set(cache.make_key(EndPoint.GUILD, {}), {"guild": 1}, cache.ttl_for(EndPoint.GUILD))
+
+    clock.now = 60
+    assert cache.get(cache.make_key(EndPoint.TW, {})) is None
+    assert backend.purge_expired() == 0
+
+    cache.invalidate(EndPoint.GUILD)
+    assert len(cache) == 0
+    cache.close()
+
+
+def test_fetch_guild_served_from_disk_after_restart(httpx_mock: HTTPXMock, tmp_path):
+    """A new API instance backed by the same database serves the cached response without a request."""
+    httpx_mock.add_response(json={"events": {"guild": {"profile": {"id": "G1"}}}}, status_code=200)
+    path = tmp_path / "responses.db"
+
+    first = API("mock_api_key", "123456789", cache=ResponseCache(backend=SQLiteCacheBackend(path)))
+    assert first.fetch_guild("G1") == {"profile": {"id": "G1"}}
+    first.cache.close()
+
+    second = API("mock_api_key", "123456789", cache=ResponseCache(backend=SQLiteCacheBackend(path)))
+    assert second.fetch_guild("G1") == {"profile": {"id": "G1"}}
+    assert len(httpx_mock.get_requests()) == 1
+    second.cache.close()
@@ -0,0 +1,44 @@
+import copy
+
+from mhanndalorian_bot.diff import Change, Snapshot, SnapshotDiffer, diff
+
+TW = {"data": {"instanceId": "TW1", "homeGuild": {"profile": {"id": "G1"}, "conflictStatus": [
+    {"zoneStatus": {"zoneId": "tw_t1", "score": 10}, "warSquad": [
+        {"squadId": "S1", "playerId": "P1", "squadStatus": 1},
+        {"squadId": "S2", "playerId": "P2", "squadStatus": 1}]},
+    {"zoneStatus": {"zoneId": "tw_t2", "score": 0}, "warSquad": []},
+]}}}
+
+
+def test_identical_snapshots_have_equal_digests():
+    assert Snapshot(TW).digest == Snapshot(copy.deepcopy(TW)).digest
+    assert diff(TW, copy.deepcopy(TW)) == []
+
+
+def test_changes_are_keyed_by_stable_ids():
+    new = copy.deepcopy(TW)
+    zones = new["data"]["homeGuild"]["conflictStatus"]
+    zones.reverse()
+    t1 = zones[1]
+    t1["zoneStatus"]["score"] = 25
+    t1["warSquad"][0]["squadStatus"] = 2
+    del t1["warSquad"][1]
+    t1["warSquad"].append({"squadId": "S3", "playerId": "P3", "squadStatus": 1})
+
+    base = ("data", "homeGuild", "conflictStatus", "tw_t1")
+    assert sorted(diff(TW, new)) == sorted([
+        Change("changed", base + ("zoneStatus", "score"), 10, 25),
+        Change("changed", base + ("warSquad", "S1", "squadStatus"), 1, 2),
+        Change("removed", base + ("warSquad", "S2"), TW["data"]["homeGuild"]["conflictStatus"][0]["warSquad"][1]),
+        Change("added", base + ("warSquad", "S3"), None, {"squadId": "S3", "playerId": "P3", "squadStatus": 1}),
+    ])
+
+
+def test_differ_tracks_previous_snapshot():
+    differ = SnapshotDiffer()
+    assert differ.update({"raidMember": [{"playerId": "P1", "memberProgress": 1}]})[0].op == "added"
+    assert differ.update({"raidMember": [{"playerId": "P1", "memberProgress": 1}]}) == []
+    assert differ.update({"raidMember": [{"playerId": "P1", "memberProgress": 5}]}) == [
+        Change("changed", ("raidMember", "P1", "memberProgress"), 1, 5)]
+    assert diff({"score": -1}, {"score": -2}) == [Change("changed", ("score",), -1, -2)]
+    assert diff({"a": [1, 2]}, {"a": [1, 2, 3]}) == [Change("changed", ("a",), [1, 2], [1, 2, 3])]
@@ -0,0 +1,66 @@
+import pytest
+from pytest_httpx import HTTPXMock
+
+from mhanndalorian_bot.api import API
+from mhanndalorian_bot.logs import LogCursor, LogFollower
+
+api_instance = API("mock_api_key", "123456789")
+
+
+def _entries(*pairs):
+    return [{"id": entry_id, "timestamp": str(ts)} for entry_id, ts in pairs]
+
+
+def test_cursor_tracks_ids_at_newest_timestamp(tmp_path):
+    cursor = LogCursor()
+    first = cursor.new_entries(_entries(("b", 20), ("a", 10), ("c", 20)))
+    assert [e["id"] for e in first] == ["a", "b", "c"]
+    for entry in first:
+        cursor.advance(entry)
+    assert cursor.timestamp == 20 and cursor.seen_ids == {"b", "c"}
+
+    later = _entries(("a", 10), ("b", 20), ("c", 20), ("d", 20), ("e", 30))
+    assert [e["id"] for e in cursor.new_entries(later)] == ["d", "e"]
+
+    cursor.save(tmp_path / "cursor.json")
+    restored = LogCursor.load(tmp_path / "cursor.json")
+    assert restored.to_dict() == cursor.to_dict()
+    assert LogCursor.load(tmp_path / "missing.json").timestamp == 0
+
+
+def test_cursor_digest_for_entries_without_id():
+    cursor = LogCursor()
+    entry = {"timestamp": 5, "data": [1]}
+    cursor.advance(entry)
+    assert not cursor.is_new({"data": [1], "timestamp": 5})
+    assert cursor.is_new({"timestamp": 5, "data": [2]})
+
+
+@pytest.mark.asyncio
+async def test_follow_twlogs_yields_only_new_entries(httpx_mock: HTTPXMock, tmp_path):
+    httpx_mock.add_response(json={"data": _entries(("a", 1), ("b", 2))})
+    httpx_mock.add_response(json={"data": _entries(("a", 1), ("b", 2), ("c", 3))})
+    follower = api_instance.follow_twlogs(interval=0, cursor_path=tmp_path / "tw.cursor")
+
+    seen = []
+    async for entry in follower:
+        seen.append(entry["id"])
+        if len(seen) == 3:
+            break
+    assert seen == ["a", "b", "c"]
+    assert LogCursor.load(tmp_path / "tw.cursor").seen_ids == {"b"}
+
+
+@pytest.mark.asyncio
+async def test_newest_first_stops_at_seen_entry():
+    consumed = []
+
+    async def fetch():
+        for entry in _entries(("c", 3), ("b", 2), ("a", 1)):
+            consumed.append(entry["id"])
+            yield entry
+
+    follower = LogFollower(fetch, cursor=LogCursor(2, ["b"]), newest_first=True)
+    assert [e["id"] for e in await follower.poll()] == ["c"]
+    assert consumed == ["c", "b"]
+    assert follower.cursor.timestamp == 3
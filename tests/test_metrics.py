@@ -0,0 +1,102 @@
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from mhanndalorian_bot import API, Registry
+from mhanndalorian_bot.metrics import EndpointStats, InMemoryMetrics, MetricsCollector, RequestEvent
+from mhanndalorian_bot.retry import RetryPolicy
+
+
+def test_in_memory_metrics_records_attempts_retries_and_decodes(httpx_mock: HTTPXMock):
+    """Every attempt is recorded with its outcome; only the final response is decoded."""
+    metrics = InMemoryMetrics()
+    api = API("mock_api_key", "123456789", retry=RetryPolicy(3, backoff_base=0), metrics=metrics)
+    httpx_mock.add_response(status_code=503, headers={"Retry-After": "0"})
+    httpx_mock.add_response(json={"events": {"name": "player"}})
+    api.fetch_player()
+
+    stats = metrics.stats("player")
+    assert (stats.requests, stats.retries, stats.errors, stats.decodes) == (2, 1, 1, 1)
+    assert stats.outcomes == {"503": 1, "200": 1}
+    assert stats.bytes_out == 2 * len(httpx_mock.get_requests()[0].content)
+    assert stats.bytes_in == len(b'{"events":{"name":"player"}}')
+    assert stats.sign_time > 0 and sum(stats.latency_counts) == 2
+    assert metrics.snapshot()["player"]["retries"] == 1
+    api.close()
+
+
+@pytest.mark.asyncio
+async def test_metrics_cover_async_transport_errors_and_registry(httpx_mock: HTTPXMock):
+    metrics = InMemoryMetrics()
+    api = API("mock_api_key", "123456789", metrics=metrics)
+    httpx_mock.add_exception(httpx.ConnectError("refused"))
+    with pytest.raises(httpx.ConnectError):
+        await api.fetch_data_async("tw")
+    assert metrics.stats("tw").outcomes == {"ConnectError": 1}
+
+    registry = Registry("mock_api_key", "123456789", "123456789987654321", metrics=metrics)
+    httpx_mock.add_response(json=[{"allyCode": "123456789"}])
+    await registry.fetch_player_async(allycode="123456789")
+    assert metrics.stats("database").decodes == 1
+    await api.aclose()
+    await registry.aclose()
+
+
+def test_streamed_requests_are_recorded(httpx_mock: HTTPXMock):
+    """*_iter calls report each attempt, the final one once the body has been read."""
+    metrics = InMemoryMetrics()
+    api = API("mock_api_key", "123456789", retry=RetryPolicy(2, backoff_base=0), metrics=metrics)
+    body = b'{"code":0,"data":[{"id":"a"},{"id":"b"}]}'
+    httpx_mock.add_response(status_code=429, headers={"Retry-After": "0"})
+    httpx_mock.add_response(content=body)
+    assert [entry["id"] for entry in api.fetch_twlogs_iter()] == ["a", "b"]
+
+    stats = metrics.stats("twlogs")
+    assert (stats.requests, stats.retries, stats.decodes) == (2, 1, 0)
+    assert stats.outcomes == {"429": 1, "200": 1}
+    assert stats.bytes_in == len(body)
+    api.close()
+
+
+@pytest.mark.asyncio
+async def test_streamed_requests_are_recorded_async(httpx_mock: HTTPXMock):
+    metrics = InMemoryMetrics()
+    api = API("mock_api_key", "123456789", metrics=metrics)
+    httpx_mock.add_response(json={"code": 0, "data": [{"id": "a"}]})
+    assert [entry async for entry in api.fetch_tblogs_iter_async()] == [{"id": "a"}]
+    assert metrics.stats("tblogs").outcomes == {"200": 1}
+    await api.aclose()
+
+
+def test_failing_hook_does_not_break_requests(httpx_mock: HTTPXMock):
+    class Broken(MetricsCollector):
+        def on_request(self, event):
+            raise RuntimeError("collector down")
+
+    httpx_mock.add_response(json={"ok": True})
+    api = API("mock_api_key", "123456789", metrics=Broken())
+    assert api.fetch_data("tw") == {"ok": True}
+    api.close()
+
+
+def test_latency_quantile_interpolates_within_buckets():
+    metrics = InMemoryMetrics(buckets=(0.1, 0.2))
+    for latency in (0.05, 0.15, 0.15, 0.5):
+        metrics.on_request(RequestEvent("tw", "POST", 200, None, 1, False, latency, 0.0, 0, 0))
+    stats = metrics.stats("tw")
+    assert stats.latency_counts == [1, 2, 1]
+    assert stats.latency_quantile(0.5) == pytest.approx(0.15)
+    assert stats.latency_quantile(1.0) == 0.2
+    assert EndpointStats().latency_quantile(0.5) == 0.0
+
+
+def test_prometheus_metrics_adapter():
+    prometheus_client = pytest.importorskip("prometheus_client")
+    from mhanndalorian_bot.metrics import PrometheusMetrics
+
+    registry = prometheus_client.CollectorRegistry()
+    metrics = PrometheusMetrics(registry=registry)
+    metrics.on_request(RequestEvent("tw", "POST", 429, None, 1, True, 0.2, 0.001, 10, 20))
+    assert registry.get_sample_value("mhanndalorian_bot_requests_total",
+                                     {"endpoint": "tw", "method": "POST", "outcome": "429"}) == 1
+    assert registry.get_sample_value("mhanndalorian_bot_retries_total", {"endpoint": "tw"}) == 1
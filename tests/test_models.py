@@ -0,0 +1,64 @@
+import pytest
+from pytest_httpx import HTTPXMock
+
+from mhanndalorian_bot.api import API
+from mhanndalorian_bot.models import Guild, Inventory, Player, Raid, TerritoryWar, parse_model
+
+PLAYER = {
+    "name": "Mar", "allyCode": "123456789", "playerId": "P1", "guildId": "G1", "guildName": "Guild", "level": 85,
+    "profileStat": [{"nameKey": "STAT_GALACTIC_POWER_ACQUIRED_NAME", "value": "9000000"}],
+    "rosterUnit": [
+        {"definitionId": "VADER:SEVEN_STAR", "currentRarity": 7, "currentLevel": 85, "currentTier": 13,
+         "relic": {"currentTier": 9}},
+        {"definitionId": "HK47:SEVEN_STAR", "currentRarity": 5, "currentLevel": 70, "currentTier": 8},
+    ],
+}
+
+
+def test_player_model_lazy_roster():
+    """The roster is converted on first access and the raw list released."""
+    player = Player.from_dict({"events": PLAYER})
+    assert player.galactic_power == 9_000_000
+    assert player._roster is None
+    vader = player.unit("VADER")
+    assert vader.relic == 7 and vader.gear == 13
+    assert player.unit("HK47").relic == 0
+    assert player._roster_raw is None
+    assert not hasattr(player, "__dict__")
+
+
+def test_guild_tw_raid_inventory_models():
+    guild = Guild.from_dict({"profile": {"id": "G1", "name": "Guild", "memberCount": 2, "guildGalacticPower": "10"},
+                             "member": [{"playerId": "P1", "playerName": "Mar", "galacticPower": "5"}]})
+    assert guild.galactic_power == 10 and guild.members[0].galactic_power == 5
+
+    tw = TerritoryWar.from_dict({"data": {"homeGuild": {"profile": {"id": "G1"}, "conflictStatus": [
+        {"zoneStatus": {"zoneId": "tw_t1", "score": "10"}, "warSquad": [{"squadId": "S1", "power": "100"}]},
+        {"zoneStatus": {"zoneId": "tw_t2", "score": 5}}]}}})
+    assert tw.home_guild.score == 15 and tw.away_guild is None
+    assert tw.home_guild.zones[0].squads[0].power == 100
+
+    raid = parse_model("activeraid", {"code": 0, "data": {"raidId": "naboo", "expireTime": "1744641010000",
+                                                          "raidMember": [{"playerId": "P1", "memberProgress": 10}]}})
+    assert isinstance(raid, Raid) and raid.total_progress == 10
+
+    raw = {"inventory": {"material": [{"id": "m1", "quantity": 3}], "currencyItem": [{"currency": 1, "quantity": 2}]}}
+    inventory = Inventory.from_dict(raw)
+    assert inventory.materials == {"m1": 3} and inventory.currencies == {"1": 2}
+    assert "material" in raw["inventory"]
+
+
+def test_inventory_null_lists():
+    inventory = Inventory.from_dict({"inventory": {"material": None, "currencyItem": None, "equipment": None}})
+    assert inventory.materials == {} and inventory.currencies == {} and inventory.equipment == {}
+
+
+def test_parse_model_unknown_endpoint():
+    with pytest.raises(ValueError, match="No response model"):
+        parse_model("tb", {})
+
+
+def test_fetch_player_model_flag(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(json={"events": PLAYER}, status_code=200)
+    player = API("mock_api_key", "123456789").fetch_player(model=True)
+    assert isinstance(player, Player) and player.name == "Mar"
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from mhanndalorian_bot.api import API
+from mhanndalorian_bot.attrs import EndPoint
+from mhanndalorian_bot.ratelimit import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_reserve_allows_burst_then_paces():
+    """A full bucket allows `burst` immediate requests, after which reservations queue up."""
+    clock = FakeClock()
+    limiter = RateLimiter(2, burst=2, clock=clock)
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == pytest.approx(0.5)
+    assert limiter.reserve() == pytest.approx(1.0)
+
+
+def test_tokens_refill_over_time():
+    """Idle time refills the bucket up to its capacity."""
+    clock = FakeClock()
+    limiter = RateLimiter(10, per=1, burst=1, clock=clock)
+    limiter.reserve()
+    clock.now = 0.1
+    assert limiter.reserve() == 0
+    clock.now = 100
+    limiter.reserve()
+    assert limiter.reserve() == pytest.approx(0.1)
+
+
+def test_invalid_rate():
+    with pytest.raises(ValueError):
+        RateLimiter(0)
+
+
+@pytest.mark.asyncio
+async def test_acquire_async_does_not_block_loop():
+    """Waiting coroutines yield to the event loop."""
+    limiter = RateLimiter(100, burst=1)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    task = asyncio.ensure_future(ticker())
+    await asyncio.gather(*(limiter.acquire_async() for _ in range(5)))
+    task.cancel()
+    assert ticks > 1
+
+
+def test_fetch_data_acquires_instance_and_endpoint_limiters(httpx_mock: HTTPXMock):
+    """Both the instance-wide and per-endpoint limiters are consumed per request."""
+    httpx_mock.add_response(json={}, status_code=200, is_reusable=True)
+    clock = FakeClock()
+    shared = RateLimiter(100, burst=100, clock=clock)
+    tw_only = RateLimiter(100, burst=100, clock=clock)
+    api = API("mock_api_key", "123456789", rate_limit=shared, endpoint_limits={EndPoint.TW: tw_only})
+    api.fetch_tw()
+    api.fetch_inventory()
+    assert shared._tokens == 98
+    assert tw_only._tokens == 99
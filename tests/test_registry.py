@@ -1,6 +1,10 @@
+import json
+
+import httpx
 import pytest
 from pytest_httpx import HTTPXMock
 
+from mhanndalorian_bot.cache import IdentityCache, SQLiteCacheBackend
 from mhanndalorian_bot.registry import Registry
 
 
@@ -52,3 +56,134 @@ def test_verify_player_invalid_data(registry_instance):
     """Test verifying a player with invalid data."""
     with pytest.raises(ValueError, match="Invalid"):
         registry_instance.verify_player(discord_id="", allycode="invalid_allycode", primary=False, hmac=True)
+
+
+def test_fetch_players_chunks_and_maps_identifiers(httpx_mock: HTTPXMock, registry_instance):
+    """Identifiers are packed into chunked 'find' requests and records mapped back to them."""
+    records = [
+        {"allyCode": "111111111", "discordId": "100000000000000001", "primary": False},
+        {"allyCode": "222222222", "discordId": "100000000000000001", "primary": True},
+        {"allyCode": "333333333", "discordId": "100000000000000003"},
+    ]
+    httpx_mock.add_response(json=records[:2])
+    httpx_mock.add_response(json=records[2:])
+    result = registry_instance.fetch_players(allycodes=["111-111-111", "333333333"],
+                                             discord_ids=["100000000000000001", "100000000000000002"],
+                                             chunk_size=2, concurrency=1)
+    assert [json.loads(r.content)["user"] for r in httpx_mock.get_requests()] == [
+        ["111111111", "333333333"], ["100000000000000001", "100000000000000002"]]
+    assert result["111111111"] == records[0]
+    assert result["100000000000000001"]["allyCode"] == "222222222"
+    assert result["333333333"]["discordId"] == "100000000000000003"
+    assert "100000000000000002" not in result
+
+
+@pytest.mark.asyncio
+async def test_fetch_players_async_runs_chunks_concurrently(httpx_mock: HTTPXMock, registry_instance):
+    httpx_mock.add_response(json=[{"allyCode": "111111111"}, {"allyCode": "222222222"}], is_reusable=True)
+    result = await registry_instance.fetch_players_async(allycodes=["111111111", "222222222", "111111111"],
+                                                         chunk_size=1)
+    assert len(httpx_mock.get_requests()) == 2
+    assert set(result) == {"111111111", "222222222"}
+
+
+def test_identity_cache_serves_repeat_lookups(httpx_mock: HTTPXMock, tmp_path):
+    """Records are cached under both identifiers and dropped again on registration."""
+    cache = IdentityCache(backend=SQLiteCacheBackend(tmp_path / "identity.db"))
+    registry = Registry(api_key="test_api_key", allycode="123456789", discord_id="123456789987654321",
+                        identity_cache=cache)
+    record = {"allyCode": "111111111", "discordId": "100000000000000001", "primary": True}
+    httpx_mock.add_response(json=[record])
+
+    assert registry.fetch_player(discord_id="100000000000000001") == record
+    assert registry.fetch_player(allycode="111-111-111") == record
+    assert registry.resolve_allycode("100000000000000001") == "111111111"
+    assert registry.fetch_players(allycodes=["111111111"]) == {"111111111": record}
+    assert len(httpx_mock.get_requests()) == 1
+
+    restored = IdentityCache(backend=SQLiteCacheBackend(tmp_path / "identity.db"))
+    assert restored.discord_id_for("111111111") == "100000000000000001"
+
+    httpx_mock.add_response(json={"unlockedPlayerPortrait": "x"})
+    registry.register_player("100000000000000001", "111111111")
+    assert cache.get_record("111111111") is None and cache.allycode_for("100000000000000001") is None
+
+    httpx_mock.add_response(json={"verified": True})
+    assert registry.verify_player("100000000000000001", "222222222", primary=True)
+    assert cache.allycode_for("100000000000000001") == "222222222"
+    registry.close()
+    cache.close()
+    restored.close()
+
+
+def test_identity_cache_keeps_multi_allycode_shape(httpx_mock: HTTPXMock):
+    """A discord ID with several allycodes returns the same record list from the network and the cache."""
+    registry = Registry(api_key="test_api_key", allycode="123456789", discord_id="123456789987654321",
+                        identity_cache=IdentityCache())
+    records = [{"allyCode": "111111111", "discordId": "100000000000000001", "primary": True},
+               {"allyCode": "222222222", "discordId": "100000000000000001", "primary": False}]
+    httpx_mock.add_response(json=records)
+
+    assert registry.fetch_player(discord_id="100000000000000001") == records
+    assert registry.fetch_player(discord_id="100000000000000001") == records
+    assert registry.fetch_player(allycode="222222222") == records[1]
+    assert registry.resolve_allycode("100000000000000001") == "111111111"
+    assert len(httpx_mock.get_requests()) == 1
+    registry.close()
+
+
+@pytest.mark.asyncio
+async def test_identity_cache_keeps_multi_allycode_shape_async(httpx_mock: HTTPXMock):
+    """The async lookup caches the full record list as well."""
+    registry = Registry(api_key="test_api_key", allycode="123456789", discord_id="123456789987654321",
+                        identity_cache=IdentityCache())
+    records = [{"allyCode": "111111111", "discordId": "100000000000000001", "primary": True},
+               {"allyCode": "222222222", "discordId": "100000000000000001", "primary": False}]
+    httpx_mock.add_response(json=records)
+
+    assert await registry.fetch_player_async(discord_id="100000000000000001") == records
+    assert await registry.fetch_player_async(discord_id="100000000000000001") == records
+    assert len(httpx_mock.get_requests()) == 1
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_onboard_players_async_registers_then_polls(httpx_mock: HTTPXMock, registry_instance):
+    """Players are registered once, then verified in shared rounds until verified or the deadline passes."""
+    attempts: dict[str, int] = {}
+
+    def _respond(request):
+        body = json.loads(request.content)
+        if body["method"] == "registration":
+            return httpx.Response(200, json={"unlockedPlayerPortrait": "P", "unlockedPlayerTitle": "T"})
+        attempts[body["discordId"]] = attempts.get(body["discordId"], 0) + 1
+        verified = body["discordId"] == "100000000000000001" and attempts[body["discordId"]] >= 2
+        return httpx.Response(200, json={"verified": verified})
+
+    httpx_mock.add_callback(_respond, is_reusable=True)
+    players = [("100000000000000001", "111111111"), ("100000000000000002", "222222222"), ("bad", "333333333")]
+    events = [(r.discord_id, r.status) async for r in registry_instance.onboard_players_async(
+        players, poll_interval=0.01, backoff_factor=2, deadline=0.2)]
+
+    assert sorted(events[:3]) == [("100000000000000001", "registered"), ("100000000000000002", "registered"),
+                                  ("bad", "failed")]
+    assert events[3:] == [("100000000000000001", "verified"), ("100000000000000002", "expired")]
+    assert attempts["100000000000000001"] == 2
+
+
+@pytest.mark.asyncio
+async def test_onboard_players_async_tracks_alts_of_one_discord_id(httpx_mock: HTTPXMock, registry_instance):
+    """Several allycodes registered to one discord ID each get their own verification outcome."""
+    def _respond(request):
+        body = json.loads(request.content)
+        if body["method"] == "registration":
+            return httpx.Response(200, json={"unlockedPlayerPortrait": "P"})
+        return httpx.Response(200, json={"verified": body["payload"]["allyCode"] == "111111111"})
+
+    httpx_mock.add_callback(_respond, is_reusable=True)
+    players = [("100000000000000001", "111111111"), ("100000000000000001", "222222222")]
+    events = [(r.allycode, r.status) async for r in registry_instance.onboard_players_async(
+        players, poll_interval=0.01, deadline=0.05)]
+
+    assert sorted(events[:2]) == [("111111111", "registered"), ("222222222", "registered")]
+    assert events[2:] == [("111111111", "verified"), ("222222222", "expired")]
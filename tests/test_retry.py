@@ -0,0 +1,75 @@
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from mhanndalorian_bot.api import API
+from mhanndalorian_bot.retry import RetryPolicy
+
+
+def test_backoff_grows_and_is_capped():
+    """Without jitter the delay grows exponentially up to backoff_max."""
+    policy = RetryPolicy(5, backoff_base=1, backoff_factor=2, backoff_max=3, jitter=0)
+    assert [policy.backoff(n) for n in (1, 2, 3, 4)] == [1, 2, 3, 3]
+
+
+def test_jitter_stays_within_bounds():
+    """Full jitter never exceeds the computed delay."""
+    policy = RetryPolicy(backoff_base=2, jitter=1.0)
+    assert all(0 <= policy.backoff(1) <= 2 for _ in range(100))
+
+
+def test_next_delay_honours_retry_after():
+    """Retry-After replaces the computed backoff, and overly long waits are not retried."""
+    policy = RetryPolicy(max_retry_after=10)
+    assert policy.next_delay(1, response=httpx.Response(429, headers={"Retry-After": "4"})) == 4
+    assert policy.next_delay(1, response=httpx.Response(429, headers={"Retry-After": "120"})) is None
+    assert policy.next_delay(1, response=httpx.Response(404)) is None
+    assert policy.next_delay(3, response=httpx.Response(503)) is None
+
+
+def test_fetch_data_retries_and_resigns(httpx_mock: HTTPXMock):
+    """A 503 followed by a 200 succeeds, signing each attempt."""
+    httpx_mock.add_response(status_code=503, headers={"Retry-After": "0"})
+    httpx_mock.add_response(json={"ok": True}, status_code=200)
+    api = API("mock_api_key", "123456789", retry=RetryPolicy(3, backoff_base=0))
+    assert api.fetch_tw() == {"ok": True}
+    requests = httpx_mock.get_requests()
+    assert len(requests) == 2
+    assert all("Authorization" in request.headers for request in requests)
+
+
+@pytest.mark.asyncio
+async def test_fetch_data_async_gives_up_after_max_attempts(httpx_mock: HTTPXMock):
+    """The final failing response is reported once attempts are exhausted."""
+    httpx_mock.add_response(status_code=500, text="down", is_reusable=True)
+    api = API("mock_api_key", "123456789", retry=RetryPolicy(2, backoff_base=0))
+    with pytest.raises(RuntimeError, match="down"):
+        await api.fetch_tw_async()
+    assert len(httpx_mock.get_requests()) == 2
+
+
+def test_transport_errors_are_retried(httpx_mock: HTTPXMock):
+    """Connection errors are retried when enabled."""
+    httpx_mock.add_exception(httpx.ConnectError("refused"))
+    httpx_mock.add_response(json={"ok": True}, status_code=200)
+    api = API("mock_api_key", "123456789", retry=RetryPolicy(2, backoff_base=0))
+    assert api.fetch_inventory() == {"ok": True}
+
+
+def test_stream_open_is_retried(httpx_mock: HTTPXMock):
+    """A throttled *_iter request is retried before the body is streamed."""
+    httpx_mock.add_response(status_code=429, headers={"Retry-After": "0"})
+    httpx_mock.add_response(json={"code": 0, "data": [{"id": "a"}]}, status_code=200)
+    api = API("mock_api_key", "123456789", retry=RetryPolicy(2, backoff_base=0))
+    assert list(api.fetch_twlogs_iter()) == [{"id": "a"}]
+    assert len(httpx_mock.get_requests()) == 2
+
+
+@pytest.mark.asyncio
+async def test_stream_open_async_is_retried(httpx_mock: HTTPXMock):
+    """The async *_iter variants retry opening the stream too."""
+    httpx_mock.add_response(status_code=503, headers={"Retry-After": "0"})
+    httpx_mock.add_response(json={"code": 0, "data": [{"id": "b"}]}, status_code=200)
+    api = API("mock_api_key", "123456789", retry=RetryPolicy(2, backoff_base=0))
+    assert [entry async for entry in api.fetch_twlogs_iter_async()] == [{"id": "b"}]
+    assert len(httpx_mock.get_requests()) == 2
@@ -0,0 +1,79 @@
+import pytest
+
+from mhanndalorian_bot import roster
+from mhanndalorian_bot.models import Player
+from mhanndalorian_bot.roster import RosterIndex
+
+
+def _player(player_id, *units):
+    return {"playerId": player_id, "name": player_id.lower(), "allyCode": "1",
+            "rosterUnit": [{"definitionId": f"{base_id}:SEVEN_STAR", "currentRarity": rarity, "currentTier": gear,
+                            "relic": {"currentTier": relic + 2}, "gp": gp}
+                           for base_id, rarity, gear, relic, gp in units]}
+
+
+PLAYERS = [
+    _player("P1", ("VADER", 7, 13, 7, 40000), ("HK47", 7, 12, 0, 20000)),
+    _player("P2", ("VADER", 7, 13, 3, 30000)),
+    _player("P3", ("HK47", 5, 8, 0, 9000)),
+]
+
+
+@pytest.fixture(params=["numpy", "array"])
+def index(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(roster, "np", None)
+    return RosterIndex.from_players(PLAYERS)
+
+
+def test_filter_by_unit_thresholds(index):
+    assert len(index) == 4
+    assert index.filter("VADER", min_relic=5) == ["P1"]
+    assert index.filter("VADER:SEVEN_STAR", min_gp=30000) == ["P1", "P2"]
+    assert index.filter("UNKNOWN") == []
+    assert index.member_names["P2"] == "p2"
+
+
+def test_count_and_group_by_unit(index):
+    assert index.count_by_unit(min_gear=12) == {"VADER": 2, "HK47": 1}
+    assert index.group_by_unit(min_rarity=7) == {"VADER": ["P1", "P2"], "HK47": ["P1"]}
+    assert index.total_gp() == {"P1": 60000, "P2": 30000, "P3": 9000}
+    assert index.total_gp("HK47") == {"P1": 20000, "P3": 9000}
+
+
+def test_guild_and_player_model_sources():
+    guild = {"events": {"guild": {"member": [PLAYERS[0], {"playerId": "P9", "playerName": "no roster"}]}}}
+    index = RosterIndex.from_guild(guild)
+    index.add_player(Player.from_dict(PLAYERS[1]))
+    assert index.member_ids == ["P1", "P2"]
+    assert index.filter("VADER", min_relic=3) == ["P1", "P2"]
+
+
+def test_columns_snapshot_does_not_block_growth(index):
+    cols = index.columns()
+    index.add_player(_player("P4", ("VADER", 7, 13, 9, 45000)))
+    assert len(cols["unit"]) == 4
+    assert len(index) == 5 and len(index.columns()["gp"]) == 5
+    assert index.filter("VADER", min_relic=8) == ["P4"]
+
+
+def test_rejected_row_leaves_index_unchanged(index):
+    with pytest.raises(OverflowError):
+        index.add_player(_player("P5", ("NEWUNIT", 7, 13, 0, 2 ** 70)))
+    assert len(index) == 4
+    assert {len(col) for col in index.columns().values()} == {4}
+    assert "NEWUNIT" not in index.unit_ids and index.filter("NEWUNIT") == []
+
+
+def test_numpy_columns_are_cached_until_growth():
+    pytest.importorskip("numpy")
+    index = RosterIndex.from_players(PLAYERS)
+    index.count_by_unit()
+    cached = index._numpy_columns()
+    index.group_by_unit(min_gear=12)
+    assert index._numpy_columns() is cached
+    index.add_player(_player("P4", ("HK47", 7, 13, 0, 21000)))
+    assert index._numpy_columns() is not cached
+    assert index.count_by_unit(min_gear=12) == {"VADER": 2, "HK47": 2}
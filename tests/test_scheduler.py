@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from mhanndalorian_bot.scheduler import PollScheduler, raid_interval_hint, tw_interval_hint
+
+
+@pytest.mark.asyncio
+async def test_callbacks_fire_only_on_change():
+    responses = iter([{"v": 1}, {"v": 1}, {"v": 2}, {"v": 2}, {"v": 2}])
+    calls = []
+    scheduler = PollScheduler(stagger=False, jitter=0.0)
+
+    async def fetch():
+        try:
+            return next(responses)
+        except StopIteration:
+            scheduler.stop()
+            return {"v": 2}
+
+    def callback(key, data, previous):
+        calls.append((key, data, previous))
+
+    job = scheduler.add(("G1", "tw"), fetch, callback, interval=0.01, min_interval=0.001, max_interval=0.02)
+    await asyncio.wait_for(scheduler.run(), 2)
+
+    assert calls == [(("G1", "tw"), {"v": 1}, None), (("G1", "tw"), {"v": 2}, {"v": 1})]
+    assert job.changes == 2 and job.runs >= 5
+
+
+@pytest.mark.asyncio
+async def test_failing_job_backs_off_and_others_continue():
+    scheduler = PollScheduler(stagger=False)
+    seen = []
+
+    async def broken():
+        raise RuntimeError("boom")
+
+    async def ok():
+        return {"ok": True}
+
+    async def callback(key, data, previous):
+        seen.append(key)
+        scheduler.stop()
+
+    bad = scheduler.add("bad", broken, callback, interval=0.01, max_interval=1.0)
+    scheduler.add("good", ok, callback, interval=0.01)
+    await asyncio.wait_for(scheduler.run(), 2)
+
+    assert seen == ["good"]
+    assert bad.errors >= 1 and bad.interval >= 0.02
+
+
+def test_interval_hints():
+    assert raid_interval_hint({"data": {"expireTime": "1000000"}}, now=999_990) == pytest.approx(15.0)
+    assert raid_interval_hint({"expireTime": 1_000_000_000_000}, now=1_000_000_000 - 60, margin=0) == 60.0
+    assert raid_interval_hint({"data": {}}) is None
+    assert tw_interval_hint({"data": {}}) == float("inf")
+    assert tw_interval_hint({"data": {"homeGuild": {"conflictStatus": [{}]}}}) is None
+
+
+def test_add_validates_intervals():
+    scheduler = PollScheduler()
+    with pytest.raises(ValueError):
+        scheduler.add("x", None, None, interval=10, min_interval=20)
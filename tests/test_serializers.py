@@ -0,0 +1,35 @@
+import pytest
+from pytest_httpx import HTTPXMock
+
+from mhanndalorian_bot.api import API
+from mhanndalorian_bot.serializers import JSONSerializer, get_serializer
+
+PAYLOAD = {"payload": {"allyCode": "123456789", "name": "Mé", "enums": False}}
+
+
+def test_json_serializer_is_compact_utf8():
+    assert JSONSerializer().dumps(PAYLOAD) == '{"payload":{"allyCode":"123456789","name":"Mé","enums":false}}'.encode()
+
+
+@pytest.mark.parametrize("name", ["orjson", "msgspec"])
+def test_optional_serializers_match_stdlib(name):
+    """Optional serializers produce the same bytes as the stdlib, so signatures are unaffected."""
+    pytest.importorskip(name)
+    serializer = get_serializer(name)
+    assert serializer.dumps(PAYLOAD) == JSONSerializer().dumps(PAYLOAD)
+    assert serializer.loads(serializer.dumps(PAYLOAD)) == PAYLOAD
+
+
+def test_unknown_serializer():
+    with pytest.raises(ValueError, match="Unknown serializer"):
+        get_serializer("yaml")
+
+
+def test_signature_hashes_sent_body(httpx_mock: HTTPXMock):
+    """The payload is encoded once and the same bytes are hashed and sent."""
+    httpx_mock.add_response(json={"ok": True}, status_code=200)
+    api = API("mock_api_key", "123456789", serializer="json")
+    assert api.fetch_data("tw", payload={"payload": {"name": "Mé"}}) == {"ok": True}
+    request = httpx_mock.get_requests()[0]
+    expected = api.sign("POST", "/api/tw", request.content, timestamp=request.headers["x-timestamp"])
+    assert request.headers["Authorization"] == expected["Authorization"]
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from mhanndalorian_bot.stream import JSONArrayStream, iter_json_array
+
+DOC = {
+    "code": 0,
+    "meta": {"nested": [1, {"tricky": "]}\",{"}]},
+    "events": {"guild": {"profile": {"id": "G1"},
+                         "member": [{"playerId": str(i), "gp": i * 1.5, "name": "Mé"} for i in range(50)]}},
+}
+RAW = json.dumps(DOC, ensure_ascii=False).encode()
+
+
+@pytest.mark.parametrize("size", [1, 7, 100, len(RAW)])
+def test_iter_json_array_any_chunk_size(size):
+    """Elements are decoded correctly regardless of how the body is split."""
+    chunks = [RAW[i:i + size] for i in range(0, len(RAW), size)]
+    assert list(iter_json_array(chunks, ("events", "guild", "member"))) == DOC["events"]["guild"]["member"]
+
+
+def test_missing_path_yields_nothing():
+    """A path that does not exist yields no items."""
+    parser = JSONArrayStream(("data",))
+    assert parser.feed(b'{"code": 0, "message": "no event"}') == []
+    assert parser.done and not parser.found
+
+
+def test_truncated_document_raises():
+    """A body that ends inside the target array is reported."""
+    with pytest.raises(ValueError, match="Truncated"):
+        list(iter_json_array([b'{"data": [{"id": 1}, '], ("data",)))
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'{"data": [{"id": 1}, {"id"'], ("data",)))
+
+
+@pytest.mark.parametrize("chunks", [
+    [b'{"data":[1.', b'5]}'],
+    [b'{"data":[1', b'.5]}'],
+    [b'{"data":[2e', b'3]}'],
+    [b'{"data":[2E+', b'3]}'],
+    [b'{"data":[-0.5e', b'-2, 7]}'],
+])
+def test_number_split_inside_fraction_or_exponent(chunks):
+    """Floats and exponents split at the '.' or the 'e' are decoded whole."""
+    expected = json.loads(b"".join(chunks))["data"]
+    assert list(iter_json_array(chunks, ("data",))) == expected
+
+
+def test_skipped_number_split_inside_fraction():
+    """A skipped value split inside its fraction does not break the parse."""
+    assert list(iter_json_array([b'{"x":1.', b'5,"data":[1]}'], ("data",))) == [1]